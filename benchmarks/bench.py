@@ -0,0 +1,621 @@
+"""
+Бенчмарки горячих путей движка и отрисовки.
+
+Каждый бенчмарк — функция-подготовка, которая возвращает операцию без
+аргументов. Операция сначала прогревается, затем число повторов подбирается
+так, чтобы одна серия шла не меньше MIN_BATCH секунд, и снимается несколько
+серий. В отчёт идут медиана и минимум времени одной операции.
+
+Базовая линия хранится в JSON; сравнение с ней падает с кодом 1, если
+какая-то медиана выросла больше порога — так сборка ловит регрессии.
+
+Использование:
+    python -m benchmarks.bench                       # прогнать всё
+    python -m benchmarks.bench -k engine.move        # только подходящие по имени
+    python -m benchmarks.bench --save                # записать базовую линию
+    python -m benchmarks.bench --compare --threshold 0.15 --threshold-for render.=0.3
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from game_core.board import Board
+from game_core.cards import CardLibrary, Deck
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+from game_core.simulation import play_match
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+MIN_BATCH = 0.05  # Секунд на одну серию
+WARMUP = 0.1  # Секунд прогрева
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], None]]] = {}
+
+
+def benchmark(name: str):
+    """Регистрирует функцию-подготовку бенчмарка под именем name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# === ИЗМЕРЕНИЕ ===
+
+def measure(op: Callable[[], None], repeat: int = 7, min_batch: float = MIN_BATCH,
+            warmup: float = WARMUP) -> Dict:
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        op()
+
+    loops = 1
+    while True:
+        if _run_batch(op, loops) >= min_batch:
+            break
+        loops *= 2
+
+    per_op = [_run_batch(op, loops) / loops for _ in range(repeat)]
+    return {
+        "median": statistics.median(per_op),
+        "min": min(per_op),
+        "max": max(per_op),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def _run_batch(op: Callable[[], None], loops: int) -> float:
+    # Как в timeit: сборщик мусора не должен попадать в замер случайным образом
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            op()
+        return time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+# === ПОДГОТОВКА ДВИЖКА ===
+
+class _EngineFixture:
+    """
+    Движок в фиксированном состоянии. reset() возвращает игроков, правила и
+    колоды в исходное состояние после операции, чтобы каждая итерация делала
+    одну и ту же работу и колоды не истощались.
+    """
+
+    def __init__(self, rules: tuple = (), hands: tuple = ()):
+        self.engine = GameEngine(GameLogger(echo=False, keep_history=False), player_count=2, seed=0)
+        state = self.engine.state
+        # Карты рук и правила берём из отдельных колод, чтобы не путать их с картами матча
+        shop = {c.uid: c for c in CardLibrary.create_shop_deck().draw_pile}
+        tadam = {c.uid: c for c in CardLibrary.create_tadam_deck().draw_pile}
+        self.rules = [tadam[uid] for uid in rules]
+        self.hands = [[shop[uid] for uid in hand] for hand in hands] + [[]] * (2 - len(hands))
+        self._foreign = {id(c) for c in shop.values()} | {id(c) for c in tadam.values()}
+        self.players = [(30, 20), (40, 20)]  # (позиция, монеты)
+        self._decks = {"shop": state.deck_shop, "events": state.deck_events, "tadam": state.deck_tadam}
+        self.reset()
+
+    def reset(self):
+        engine = self.engine
+        state = engine.state
+        for ev in engine.pending_events:
+            if ev.type in ("SHOP", "SHOP_FREE"):
+                for card in ev.data["cards"]:
+                    state.deck_shop.discard(card)
+            elif ev.type == "EVENT_CARD":
+                state.deck_events.discard(ev.data["card"])
+            elif ev.type == "TADAM_SHOW":
+                state.deck_tadam.discard(ev.data["rule"])
+        engine.pending_events.clear()
+
+        for rule in state.active_rules:
+            if id(rule) not in self._foreign:
+                state.deck_tadam.discard(rule)
+        state.active_rules.clear()
+        state.active_rules.extend(self.rules)
+
+        for p, (pos, coins), hand in zip(state.players, self.players, self.hands):
+            for card in p.hand:
+                if id(card) not in self._foreign:
+                    state.deck_shop.discard(card)
+            p.hand[:] = hand
+            p.position, p.coins = pos, coins
+            p.is_finished = False
+            p.skip_next_turn = False
+            p.reset_turn_flags()
+        for deck in self._decks.values():
+            deck.discard_pile[:] = [c for c in deck.discard_pile if id(c) not in self._foreign]
+
+        engine.placed_mines.clear()
+        engine.is_game_over = False
+        engine.winner = None
+
+
+def _move_inputs(n: int = 200) -> List[tuple]:
+    rng = random.Random(0)
+    return [(rng.randrange(0, 90), rng.randint(1, 6)) for _ in range(n)]
+
+
+# === ДВИЖОК ===
+
+@benchmark("engine.fixture.reset")
+def _bench_fixture_reset():
+    # Накладные расходы сброса, которые входят в бенчмарки move_player и apply_effect
+    fixture = _EngineFixture()
+
+    def op():
+        for _ in range(50):
+            fixture.reset()
+    return op
+
+
+@benchmark("board.resolve_move")
+def _bench_resolve_move():
+    board = Board()
+    moves = [(start, steps if i % 4 else -steps) for i, (start, steps) in enumerate(_move_inputs(1000))]
+
+    def op():
+        for start, steps in moves:
+            board.resolve_move(start, steps)
+    return op
+
+
+def _move_player_op(fixture: _EngineFixture):
+    engine = fixture.engine
+    player = engine.state.players[0]
+    moves = _move_inputs()
+
+    def op():
+        for start, steps in moves:
+            player.position = start
+            engine.move_player(player, steps, is_own_move=True)
+            fixture.reset()
+    return op
+
+
+@benchmark("engine.move_player")
+def _bench_move_player():
+    return _move_player_op(_EngineFixture())
+
+
+@benchmark("engine.move_player.tadam")
+def _bench_move_player_tadam():
+    # Обгон, налог на красной и рывок на зелёной: проверки при движении и рекурсия
+    return _move_player_op(_EngineFixture(rules=("rule_overtake_steal", "rule_red_tax_all", "rule_green_turbo")))
+
+
+def _register_effect_benchmarks():
+    effects = {}
+    for card in CardLibrary.create_event_deck().draw_pile:
+        for side in (card.good_side, card.bad_side):
+            effects.setdefault(side.effect_id, side.value)
+
+    for effect_id, value in sorted(effects.items()):
+        def setup(effect_id=effect_id, value=value):
+            fixture = _EngineFixture(hands=(("shop_hook", "shop_magnet"), ("shop_rocket", "shop_grenade")))
+            engine = fixture.engine
+            source, target = engine.state.players
+
+            def op():
+                for _ in range(50):
+                    engine.apply_effect(effect_id, source, value, target)
+                    fixture.reset()
+            return op
+        BENCHMARKS[f"engine.apply_effect.{effect_id}"] = setup
+
+
+_register_effect_benchmarks()
+
+
+@benchmark("deck.draw")
+def _bench_deck_draw():
+    deck = Deck(CardLibrary.create_shop_deck().draw_pile, rng=random.Random(0))
+
+    def op():
+        # Тянем и сразу сбрасываем: колода каждые len(deck) карт перетасовывается
+        for _ in range(200):
+            deck.discard(deck.draw(1)[0])
+    return op
+
+
+@benchmark("engine.can_player_do_actions")
+def _bench_can_do_actions():
+    fixture = _EngineFixture(hands=(("shop_hook", "shop_grenade", "shop_magnet"),))
+    engine = fixture.engine
+    player = engine.state.players[0]
+
+    def op():
+        for _ in range(200):
+            engine.can_player_do_actions(player)
+    return op
+
+
+@benchmark("game.headless")
+def _bench_headless_game():
+    def op():
+        for seed in range(5):
+            play_match(seed, max_turns=300, logger=GameLogger(echo=False, keep_history=False))
+    return op
+
+
+# === ОТРИСОВКА ===
+
+def _render_setup():
+    """Окно под dummy-драйвером SDL и движок в середине матча"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from ui.renderer import Renderer
+    from ui.view_config import ViewConfig
+    from main import WINDOW_SIZE
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_SIZE + 300, WINDOW_SIZE))
+    view_cfg = ViewConfig("ui/coords.json", target_size=WINDOW_SIZE)
+    if os.path.exists("assets/field_corrected.png"):
+        raw_board = pygame.image.load("assets/field_corrected.png").convert()
+        board_img = pygame.transform.smoothscale(raw_board, (WINDOW_SIZE, WINDOW_SIZE))
+    else:
+        board_img = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE)).convert()
+    renderer = Renderer(screen, view_cfg, board_img)
+    engine = play_match(3, max_turns=25, logger=GameLogger(echo=False, keep_history=False))
+    return pygame, screen, renderer, engine
+
+
+def _render_frame_op(with_dialog: bool):
+    pygame, screen, renderer, engine = _render_setup()
+    from ui.components import Dialog
+    dialog = Dialog("Выбери ход", ["Идти на 3", "Идти на 5"]) if with_dialog else None
+    mouse_pos = renderer.view_cfg.get_screen_coords(engine.state.players[0].position)
+
+    def op():
+        # Тот же порядок слоёв, что и в главном цикле main.py
+        snapshot = engine.publish_snapshot()
+        screen.fill((30, 30, 30))
+        renderer.draw_background(snapshot.active_rules, snapshot.placed_mines)
+        renderer.draw_players(snapshot)
+        renderer.draw_hover(mouse_pos)
+        if dialog:
+            dialog.draw(screen)
+        renderer.draw_sidebar(snapshot, engine.logger.current_turn, 125, True, with_dialog)
+        pygame.display.flip()
+    return op
+
+
+@benchmark("render.frame")
+def _bench_render_frame():
+    return _render_frame_op(with_dialog=False)
+
+
+@benchmark("render.frame.dialog")
+def _bench_render_frame_dialog():
+    return _render_frame_op(with_dialog=True)
+
+
+@benchmark("ui.font.sysfont")
+def _bench_sysfont():
+    # Поиск и загрузка шрифта, как раньше делала отрисовка боковой панели каждый кадр
+    pygame, *_ = _render_setup()
+
+    def op():
+        pygame.font.SysFont("Arial", 15, bold=True)
+    return op
+
+
+@benchmark("ui.font.get_font")
+def _bench_get_font():
+    _render_setup()
+    from ui.fonts import get_font
+
+    def op():
+        get_font(15, bold=True)
+    return op
+
+
+@benchmark("ui.text.render")
+def _bench_text_render():
+    # Подписи боковой панели без кеша: растеризация глифов на каждый вызов
+    _render_setup()
+    from ui.fonts import get_font
+    font = get_font(15, bold=True)
+
+    def op():
+        for label in ("Монеты:", "ХОД: 12", "ГАРПУН", "ВОЛШЕБНЫЙ КУБ", "Завершить ход"):
+            font.render(label, True, (255, 255, 255))
+    return op
+
+
+@benchmark("ui.text.cached")
+def _bench_text_cached():
+    _render_setup()
+    from ui.fonts import get_font
+    from ui.text_cache import render_text
+    font = get_font(15, bold=True)
+
+    def op():
+        for label in ("Монеты:", "ХОД: 12", "ГАРПУН", "ВОЛШЕБНЫЙ КУБ", "Завершить ход"):
+            render_text(font, label, (255, 255, 255))
+    return op
+
+
+@benchmark("ui.overlay.alloc")
+def _bench_overlay_alloc():
+    # Как раньше делали диалоги: новая полноэкранная SRCALPHA-поверхность на каждый кадр
+    pygame, screen, *_ = _render_setup()
+
+    def op():
+        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))
+        screen.blit(overlay, (0, 0))
+    return op
+
+
+@benchmark("ui.overlay.cached")
+def _bench_overlay_cached():
+    pygame, screen, *_ = _render_setup()
+    from ui.overlays import dim_overlay
+
+    def op():
+        screen.blit(dim_overlay(screen.get_size(), 150), (0, 0))
+    return op
+
+
+@benchmark("render.background.layers")
+def _bench_background_layers():
+    pygame, screen, renderer, engine = _render_setup()
+
+    def op():
+        # Как раньше: поле, правила и мины отдельными блитами каждый кадр
+        renderer.draw_board()
+        renderer.draw_active_rules(engine.state.active_rules)
+        renderer.draw_mines(engine.placed_mines)
+    return op
+
+
+@benchmark("render.background.cached")
+def _bench_background_cached():
+    pygame, screen, renderer, engine = _render_setup()
+
+    def op():
+        renderer.draw_background(engine.state.active_rules, engine.placed_mines)
+    return op
+
+
+@benchmark("ui.view.cell_under_mouse")
+def _bench_cell_under_mouse():
+    from ui.view_config import ViewConfig
+    view_cfg = ViewConfig("ui/coords.json", target_size=1000)
+    # Попадания в клетки и промахи мимо поля
+    points = [view_cfg.get_screen_coords(cid) for cid in range(0, 98, 7)] + [(5, 5), (500, 500), (990, 20)]
+
+    def op():
+        for pos in points:
+            view_cfg.get_cell_under_mouse(pos)
+    return op
+
+
+@benchmark("ui.view.screen_coords")
+def _bench_screen_coords():
+    from ui.view_config import ViewConfig
+    view_cfg = ViewConfig("ui/coords.json", target_size=1000)
+
+    def op():
+        for cid in range(98):
+            view_cfg.get_screen_coords(cid)
+    return op
+
+
+def _startup_op(warm: bool):
+    """Загрузка спрайтов рендерера и поля, как при старте игры, с кешем во временной папке"""
+    import shutil
+    import tempfile
+    pygame, screen, renderer, engine = _render_setup()
+    from ui.renderer import Renderer
+    from ui.sprite_cache import SpriteCache
+    from main import WINDOW_SIZE
+
+    cache = SpriteCache(tempfile.mkdtemp(prefix="sprite_cache_"))
+
+    def op():
+        if not warm:
+            shutil.rmtree(cache.cache_dir, ignore_errors=True)
+        cache._hashes.clear()  # Новый запуск заново хеширует исходники
+        board = screen
+        if os.path.exists("assets/field_corrected.png"):
+            board = cache.load_scaled("assets/field_corrected.png", (WINDOW_SIZE, WINDOW_SIZE), alpha=False)
+        Renderer(screen, renderer.view_cfg, board, sprites=cache)
+    return op
+
+
+@benchmark("startup.sprites.cold")
+def _bench_startup_cold():
+    return _startup_op(warm=False)
+
+
+@benchmark("startup.sprites.warm")
+def _bench_startup_warm():
+    return _startup_op(warm=True)
+
+
+@benchmark("render.coins_bar")
+def _bench_coins_bar():
+    pygame, screen, renderer, engine = _render_setup()
+
+    def op():
+        # Типичная партия и щедрые стартовые деньги
+        for coins in (3, 12, 40, 150):
+            renderer.draw_coins_bar(1015, 100, coins)
+    return op
+
+
+@benchmark("render.players")
+def _bench_render_players():
+    pygame, screen, renderer, engine = _render_setup()
+    snapshot = engine.publish_snapshot()
+
+    def op():
+        renderer.draw_players(snapshot)
+    return op
+
+
+@benchmark("render.sidebar")
+def _bench_render_sidebar():
+    pygame, screen, renderer, engine = _render_setup()
+    snapshot = engine.publish_snapshot()
+
+    def op():
+        renderer.draw_sidebar(snapshot, engine.logger.current_turn, 125, True, False)
+    return op
+
+
+@benchmark("engine.snapshot")
+def _bench_snapshot():
+    # Типичная пачка изменений: у одного игрока сменились монеты, остальные снимки переиспользуются
+    engine = play_match(4, player_count=4, max_turns=30)
+    player = engine.state.players[0]
+
+    def op():
+        player.coins += 1
+        engine.publish_snapshot()
+    return op
+
+
+# === БАЗОВАЯ ЛИНИЯ ===
+
+def environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(names: List[str], repeat: int = 7, verbose: bool = True) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        op = BENCHMARKS[name]()
+        results[name] = measure(op, repeat)
+        if verbose:
+            print(f"  {name:48s} {_fmt(results[name]['median'])}", flush=True)
+    return results
+
+
+def save_baseline(path: str, results: Dict[str, Dict], merge: bool = True):
+    """Записывает результаты; при merge сохраняет старые записи бенчмарков, которые не гонялись"""
+    data = {"environment": environment(), "results": {}}
+    if merge and os.path.exists(path):
+        data["results"] = load_baseline(path)["results"]
+    data["results"].update(results)
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def threshold_for(name: str, default: float, overrides: Dict[str, float]) -> float:
+    """Порог из overrides по самому длинному подходящему префиксу имени"""
+    matches = [prefix for prefix in overrides if name.startswith(prefix)]
+    return overrides[max(matches, key=len)] if matches else default
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, threshold: float,
+            overrides: Optional[Dict[str, float]] = None) -> List[str]:
+    """Печатает сравнение медиан и возвращает имена бенчмарков с регрессией"""
+    overrides = overrides or {}
+    base = baseline["results"]
+    regressions = []
+    print(f"\n{'бенчмарк':48s} {'база':>10s} {'сейчас':>10s} {'изм.':>8s}")
+    for name, res in results.items():
+        if name not in base:
+            print(f"{name:48s} {'—':>10s} {_fmt(res['median']):>10s}   новый")
+            continue
+        ratio = res["median"] / base[name]["median"]
+        limit = threshold_for(name, threshold, overrides)
+        mark = ""
+        if ratio > 1 + limit:
+            mark = "  РЕГРЕССИЯ"
+            regressions.append(name)
+        elif ratio < 1 - limit:
+            mark = "  быстрее"
+        print(f"{name:48s} {_fmt(base[name]['median']):>10s} {_fmt(res['median']):>10s} "
+              f"{ratio - 1:+8.1%}{mark}")
+
+    if baseline.get("environment") != environment():
+        print("\nВнимание: базовая линия снята на другом окружении:", baseline.get("environment"))
+    return regressions
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("с", 1), ("мс", 1e-3), ("мкс", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} нс"
+
+
+def _parse_overrides(items: List[str]) -> Dict[str, float]:
+    overrides = {}
+    for item in items:
+        prefix, _, value = item.partition("=")
+        overrides[prefix] = float(value)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки движка и отрисовки")
+    parser.add_argument("-k", dest="pattern", help="только бенчмарки, в имени которых есть подстрока")
+    parser.add_argument("--list", action="store_true", help="показать имена и выйти")
+    parser.add_argument("--repeat", type=int, default=7, help="серий на бенчмарк")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="записать результаты в базовую линию")
+    parser.add_argument("--compare", action="store_true", help="сравнить с базовой линией")
+    parser.add_argument("--threshold", type=float, default=0.10, help="допустимый рост медианы (0.1 = 10%%)")
+    parser.add_argument("--threshold-for", nargs="*", default=[],
+                        help="префикс=порог для отдельных групп, например render.=0.3")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    if args.list:
+        print("\n".join(names))
+        return
+
+    print(f"Бенчмарков: {len(names)}")
+    results = run(names, args.repeat)
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"Нет базовой линии {args.baseline}, сначала запустите с --save")
+            exit_code = 2
+        else:
+            regressions = compare(results, load_baseline(args.baseline), args.threshold,
+                                  _parse_overrides(args.threshold_for))
+            if regressions:
+                print(f"\nРегрессии: {', '.join(regressions)}")
+                exit_code = 1
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Базовая линия сохранена в {args.baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Загрузка процессора игрой, которая ждёт ввода.
+
+Запускает main.main() под dummy-драйвером SDL без какого-либо ввода на
+заданное время и меряет процессорное время главного цикла (без загрузки
+картинок). Каждый режим — отдельный процесс, чтобы pygame стартовал с нуля.
+
+Использование:
+    python -m benchmarks.idle_cpu --seconds 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = {
+    "idle-wait": {},
+    "no-idle-wait": {"idle_wait": False},
+    "full-redraw": {"dirty_rects": False},
+}
+
+
+def _child(mode: str, seconds: float):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    import main
+    from game_core.logger import GameLogger
+
+    GameLogger.save = lambda self, filename=None: None  # Замер не должен оставлять логи матчей
+    marks = {}
+    original_init = main.init_window
+
+    def init_window(caption):
+        result = original_init(caption)
+        marks["cpu"], marks["wall"] = time.process_time(), time.perf_counter()
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops=1)
+        return result
+
+    main.init_window = init_window
+    try:
+        main.main(seed=1, **MODES[mode])
+    except SystemExit:
+        pass
+    cpu, wall = time.process_time() - marks["cpu"], time.perf_counter() - marks["wall"]
+    print(json.dumps({"mode": mode, "cpu": cpu, "wall": wall}))
+
+
+def measure(mode: str, seconds: float) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.idle_cpu", "--child", mode, "--seconds", str(seconds)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Загрузка CPU в простое")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.seconds)
+    else:
+        for name in MODES:
+            result = measure(name, args.seconds)
+            print(f"  {name:16s} CPU {result['cpu']:.2f} с за {result['wall']:.2f} с  ({result['cpu'] / result['wall']:.1%})")
@@ -0,0 +1,96 @@
+"""
+Сквозной замер UI по записанному вводу.
+
+Запись делается в обычной игре: python main.py --record-input FILE. Здесь
+main.main() получает этот ввод вместо настоящего, работает под dummy-
+драйвером SDL без ограничения FPS и без сна в простое, а в конце итоговое
+состояние движка сверяется с записанным. Разошлось — код возврата 1: значит,
+изменение поменяло поведение, и время кадров уже не сравнить.
+
+Время кадра — от начала одной итерации главного цикла до начала следующей,
+загрузка картинок в замер не входит. Каждый прогон — отдельный процесс,
+чтобы pygame и кеши стартовали с нуля.
+
+Использование:
+    python -m benchmarks.ui_replay match_logs/input_X.json --runs 3
+    python -m benchmarks.ui_replay match_logs/input_X.json --full-redraw --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+def _child(path: str, full_redraw: bool):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import main
+    from ui.input_record import InputPlayback
+
+    playback = InputPlayback.from_file(path)
+    dirty_rects = playback.dirty_rects and not full_redraw
+    engine = main.main(seed=playback.seed, dirty_rects=dirty_rects, fps=0, idle_wait=False, playback=playback)
+    print(json.dumps({"frames": playback.frame + 1, "frame_ms": playback.frame_times_ms,
+                      "mismatches": playback.mismatches(engine)}))
+
+
+def run_once(path: str, full_redraw: bool = False) -> dict:
+    args = [sys.executable, "-m", "benchmarks.ui_replay", path, "--child"]
+    if full_redraw:
+        args.append("--full-redraw")
+    out = subprocess.run(args, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def frame_stats(times_ms: list) -> dict:
+    values = sorted(times_ms)
+    if not values:
+        return {}
+
+    def pct(q):
+        return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+    total = sum(values)
+    return {
+        "frames": len(values),
+        "total_s": total / 1000,
+        "fps": len(values) / total * 1000 if total else 0.0,
+        "mean_ms": statistics.fmean(values),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": values[-1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Воспроизведение записанного ввода и время кадров")
+    parser.add_argument("recording", help="файл из main.py --record-input")
+    parser.add_argument("--runs", type=int, default=1, help="прогонов; в отчёт идёт лучший по медиане")
+    parser.add_argument("--full-redraw", action="store_true", help="перерисовывать весь экран каждый кадр")
+    parser.add_argument("--json", action="store_true", help="вывести статистику в JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.recording, args.full_redraw)
+        sys.exit()
+
+    runs = []
+    for _ in range(args.runs):
+        result = run_once(args.recording, args.full_redraw)
+        if result["mismatches"]:
+            print("Итоговое состояние разошлось с записью:")
+            for line in result["mismatches"]:
+                print(f"  {line}")
+            sys.exit(1)
+        runs.append(frame_stats(result["frame_ms"]))
+
+    best = min(runs, key=lambda stats: stats["p50_ms"])
+    if args.json:
+        print(json.dumps(best))
+    else:
+        print(f"{best['frames']} кадров за {best['total_s']:.2f} с ({best['fps']:.0f} кадр/с), состояние совпало")
+        print(f"  кадр, мс: среднее {best['mean_ms']:.2f}  p50 {best['p50_ms']:.2f}  p95 {best['p95_ms']:.2f}  "
+              f"p99 {best['p99_ms']:.2f}  макс {best['max_ms']:.2f}")
@@ -0,0 +1,255 @@
+"""
+Потоковая аналитика по симуляциям.
+
+GameObserver подписывается на логгер матча и сразу складывает события в
+заранее выделенные NumPy-массивы StreamingStats — история матчей не хранится,
+так что память не растёт с числом игр. Частичные агрегаты из процессов пула
+складываются через merge() и выгружаются в .npz плюс текстовый отчёт.
+
+Использование:
+    python -m game_core.analytics --games 100000 --workers 8 --out stats.npz
+"""
+import argparse
+import multiprocessing
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from game_core.cards import CardLibrary
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+from game_core.simulation import make_bots, run_match
+
+MAX_PLAYERS = 4
+N_CELLS = 98
+
+# Счётчики исходов схваток, смерча и дани
+OUTCOMES = (
+    "duel_attacker_won",
+    "duel_defender_won",
+    "duel_draw",
+    "tornado_paid",
+    "tornado_flew",
+    "tribute_count",
+    "tribute_coins",
+)
+
+
+def _unique_uids(cards) -> List[str]:
+    return sorted({c.uid for c in cards})  # Колода перетасована — порядок фиксируем сортировкой
+
+
+class StreamingStats:
+    """Накопители по множеству матчей. Все массивы фиксированного размера."""
+
+    ARRAYS = ("landings", "coins_sum", "coins_games", "card_bought", "card_used",
+              "rule_dwell", "outcomes", "game_length", "wins_by_seat", "unfinished")
+
+    def __init__(self, max_turns: int = 300):
+        self.max_turns = max_turns
+        self.shop_uids = _unique_uids(CardLibrary.create_shop_deck().draw_pile)
+        self.rule_uids = _unique_uids(CardLibrary.create_tadam_deck().draw_pile)
+        self._shop_idx = {uid: i for i, uid in enumerate(self.shop_uids)}
+        self._rule_idx = {uid: i for i, uid in enumerate(self.rule_uids)}
+        self._outcome_idx = {name: i for i, name in enumerate(OUTCOMES)}
+
+        self.landings = np.zeros(N_CELLS, dtype=np.int64)
+        # Сумма монет по ходу и месту за столом + сколько игр дожило до хода
+        self.coins_sum = np.zeros((max_turns, MAX_PLAYERS), dtype=np.int64)
+        self.coins_games = np.zeros(max_turns, dtype=np.int64)
+        self.card_bought = np.zeros(len(self.shop_uids), dtype=np.int64)
+        self.card_used = np.zeros(len(self.shop_uids), dtype=np.int64)
+        self.rule_dwell = np.zeros(len(self.rule_uids), dtype=np.int64)  # Ходов в очереди Та-Дам
+        self.outcomes = np.zeros(len(OUTCOMES), dtype=np.int64)
+        self.game_length = np.zeros(max_turns + 1, dtype=np.int64)  # Последняя ячейка — max_turns и дольше
+        self.wins_by_seat = np.zeros(MAX_PLAYERS, dtype=np.int64)
+        self.unfinished = np.zeros(1, dtype=np.int64)  # Упёрлись в лимит ходов
+
+    @property
+    def games(self) -> int:
+        return int(self.game_length.sum())
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        if other.max_turns != self.max_turns or other.shop_uids != self.shop_uids \
+                or other.rule_uids != self.rule_uids:
+            raise ValueError("Нельзя сложить агрегаты с разной разметкой")
+        for name in self.ARRAYS:
+            getattr(self, name).__iadd__(getattr(other, name))
+        return self
+
+    def count(self, outcome: str, amount: int = 1):
+        self.outcomes[self._outcome_idx[outcome]] += amount
+
+    # === ВЫГРУЗКА ===
+
+    def save_npz(self, path: str):
+        np.savez_compressed(
+            path,
+            shop_uids=np.array(self.shop_uids),
+            rule_uids=np.array(self.rule_uids),
+            outcome_names=np.array(OUTCOMES),
+            **{name: getattr(self, name) for name in self.ARRAYS}
+        )
+
+    @classmethod
+    def load_npz(cls, path: str) -> "StreamingStats":
+        data = np.load(path)
+        stats = cls(max_turns=data["coins_games"].shape[0])
+        if list(data["shop_uids"]) != stats.shop_uids or list(data["rule_uids"]) != stats.rule_uids:
+            raise ValueError(f"{path}: состав колод не совпадает с текущим")
+        for name in cls.ARRAYS:
+            getattr(stats, name)[...] = data[name]
+        return stats
+
+    def summary(self) -> str:
+        games = self.games
+        if not games:
+            return "Нет сыгранных матчей"
+        lengths = np.arange(self.max_turns + 1)
+        lines = [
+            f"Матчей: {games} (не доиграно до лимита: {int(self.unfinished[0])})",
+            f"Средняя длина: {(lengths * self.game_length).sum() / games:.1f} ходов",
+            "Победы по местам: " + ", ".join(
+                f"#{i + 1}: {w / games:.1%}" for i, w in enumerate(self.wins_by_seat) if w),
+            "",
+            "Самые посещаемые клетки:",
+        ]
+        for cell in np.argsort(self.landings)[::-1][:10]:
+            lines.append(f"  {int(cell):3d}: {int(self.landings[cell])}")
+
+        lines.append("")
+        lines.append("Средние монеты по ходам (место 1 / 2 / ...):")
+        seats = int(self.coins_sum.any(axis=0).sum())
+        for turn in (1, 10, 25, 50, 100):
+            if turn <= self.max_turns and self.coins_games[turn - 1]:
+                avg = self.coins_sum[turn - 1, :seats] / self.coins_games[turn - 1]
+                lines.append(f"  ход {turn:3d}: " + " / ".join(f"{v:.1f}" for v in avg))
+
+        lines.append("")
+        lines.append("Карты Лавки (куплено / применено):")
+        for i, uid in enumerate(self.shop_uids):
+            lines.append(f"  {uid:20s} {int(self.card_bought[i]):8d} {int(self.card_used[i]):8d}")
+
+        lines.append("")
+        lines.append("Та-Дам, ходов в очереди на матч:")
+        for i, uid in enumerate(self.rule_uids):
+            lines.append(f"  {uid:24s} {self.rule_dwell[i] / games:.2f}")
+
+        lines.append("")
+        lines.append("Исходы:")
+        for i, name in enumerate(OUTCOMES):
+            lines.append(f"  {name:20s} {int(self.outcomes[i])}")
+        return "\n".join(lines)
+
+
+class GameObserver:
+    """Слушатель одного матча: переводит события логгера в приращения StreamingStats"""
+
+    def __init__(self, stats: StreamingStats, engine: GameEngine):
+        self.stats = stats
+        self.engine = engine
+        self._sampled_turn = 0
+        engine.logger.add_listener(self.on_event)
+
+    def on_event(self, entry: dict):
+        self._sample_until(entry["turn"])
+        stats = self.stats
+        etype = entry["type"]
+
+        if etype == "MOVE":
+            stats.landings[entry["to"]] += 1
+        elif etype == "SHOP_BUY":
+            stats.card_bought[stats._shop_idx[entry["card_uid"]]] += 1
+        elif etype == "CARD_USE":
+            stats.card_used[stats._shop_idx[entry["card_uid"]]] += 1
+        elif etype == "DUEL_WON":
+            stats.count("duel_attacker_won" if entry["attacker_won"] else "duel_defender_won")
+        elif etype == "DUEL_DRAW":
+            stats.count("duel_draw")
+        elif etype == "TORNADO_CHOICE":
+            stats.count("tornado_paid" if entry["paid"] else "tornado_flew")
+        elif etype == "TRIBUTE":
+            stats.count("tribute_count")
+            stats.count("tribute_coins", entry["collected"])
+
+    def _sample_until(self, turn: int):
+        """Снимает монеты и очередь Та-Дам за все ходы, которые ещё не учтены"""
+        if turn <= self._sampled_turn:
+            return
+        stats = self.stats
+        state = self.engine.state
+        first, self._sampled_turn = self._sampled_turn + 1, turn
+
+        for rule in state.active_rules:
+            stats.rule_dwell[stats._rule_idx[rule.uid]] += turn - first + 1
+
+        last = min(turn, stats.max_turns)
+        if first <= last:
+            coins = [p.coins for p in state.players]
+            stats.coins_sum[first - 1:last, :len(coins)] += coins
+            stats.coins_games[first - 1:last] += 1
+
+    def finish(self):
+        self._sample_until(self.engine.logger.current_turn)
+        stats = self.stats
+        stats.game_length[min(self.engine.logger.current_turn, stats.max_turns)] += 1
+        if self.engine.winner is not None:
+            stats.wins_by_seat[self.engine.winner.uid] += 1
+        else:
+            stats.unfinished[0] += 1
+
+
+def simulate(seeds, player_count: int = 2, max_turns: int = 300,
+             stats: Optional[StreamingStats] = None) -> StreamingStats:
+    """Играет матчи с заданными сидами и копит статистику"""
+    stats = stats or StreamingStats(max_turns)
+    for seed in seeds:
+        engine = GameEngine(GameLogger(echo=False, keep_history=False), player_count=player_count, seed=seed)
+        observer = GameObserver(stats, engine)
+        run_match(engine, make_bots(seed, player_count), max_turns)
+        observer.finish()
+    return stats
+
+
+def _simulate_chunk(job: Dict) -> StreamingStats:
+    return simulate(range(job["start"], job["stop"]), job["player_count"], job["max_turns"])
+
+
+def run_parallel(games: int, workers: Optional[int] = None, player_count: int = 2,
+                 max_turns: int = 300, base_seed: int = 0, chunk: int = 500) -> StreamingStats:
+    """Раскидывает матчи по пулу процессов и складывает частичные агрегаты"""
+    jobs = [{"start": start, "stop": min(start + chunk, base_seed + games),
+             "player_count": player_count, "max_turns": max_turns}
+            for start in range(base_seed, base_seed + games, chunk)]
+    total = StreamingStats(max_turns)
+    with multiprocessing.Pool(workers) as pool:
+        for part in pool.imap_unordered(_simulate_chunk, jobs):
+            total.merge(part)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Потоковая статистика по симуляциям")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None, help="по умолчанию — все ядра")
+    parser.add_argument("--max-turns", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0, help="сид первого матча")
+    parser.add_argument("--out", default="match_logs/stats.npz")
+    parser.add_argument("--merge", nargs="*", default=[], help="досложить ранее сохранённые .npz")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = run_parallel(args.games, args.workers, args.players, args.max_turns, args.seed)
+    for path in args.merge:
+        stats.merge(StreamingStats.load_npz(path))
+    elapsed = time.perf_counter() - started
+
+    stats.save_npz(args.out)
+    print(stats.summary())
+    print(f"\n{args.games} матчей за {elapsed:.1f} с, агрегаты сохранены в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Индексированный архив логов матчей.
+
+Логи из match_logs/ один раз загружаются в локальную SQLite-базу, дальше все
+агрегаты (винрейт с картой, частота срабатывания правил и т.д.) считаются
+SQL-запросами по индексам, без повторного парсинга JSON.
+
+Использование:
+    python -m game_core.archive ingest [match_logs]
+    python -m game_core.archive winrate shop_magic_cube
+    python -m game_core.archive count --rule rule_six_skip
+    python -m game_core.archive top --by card
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from game_core.cards import CardLibrary
+
+DEFAULT_DB_PATH = "match_logs/archive.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id        INTEGER PRIMARY KEY,
+    path      TEXT UNIQUE NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime     REAL NOT NULL,
+    timestamp TEXT,
+    turns     INTEGER NOT NULL,
+    winner    INTEGER
+);
+CREATE TABLE IF NOT EXISTS events (
+    match_id  INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    seq       INTEGER NOT NULL,
+    turn      INTEGER NOT NULL,
+    player    INTEGER NOT NULL,
+    type      TEXT NOT NULL,
+    card      TEXT,
+    rule      TEXT,
+    details   TEXT
+);
+-- Карты, которые игрок получал за матч (для запросов «винрейт с картой»)
+CREATE TABLE IF NOT EXISTS holdings (
+    match_id  INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    player    INTEGER NOT NULL,
+    card      TEXT NOT NULL,
+    PRIMARY KEY (match_id, player, card)
+);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events(type);
+CREATE INDEX IF NOT EXISTS idx_events_card ON events(card);
+CREATE INDEX IF NOT EXISTS idx_events_rule ON events(rule);
+CREATE INDEX IF NOT EXISTS idx_events_player ON events(player);
+CREATE INDEX IF NOT EXISTS idx_events_turn ON events(turn);
+CREATE INDEX IF NOT EXISTS idx_holdings_card ON holdings(card);
+"""
+
+# События, в которых игрок получает карту Лавки в руку
+ACQUIRE_EVENTS = ("SHOP_BUY", "SHOP_FREE", "EFFECT_STEAL_CARD")
+
+# События, у которых правило Та-Дам не указано в деталях, но однозначно следует из типа
+RULE_BY_EVENT = {
+    "RULE_SIX_SKIP": "rule_six_skip",
+    "RULE_GREEN_EXTRA": "rule_green_reroll",
+    "RULE_OVERTAKE": "rule_overtake_steal",
+}
+
+
+def _build_name_index() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Сопоставление имён карт (как их пишет логгер) с uid"""
+    shop = {c.name: c.uid for c in CardLibrary.create_shop_deck().draw_pile}
+    rules = {c.name: c.uid for c in CardLibrary.create_tadam_deck().draw_pile}
+    return shop, rules
+
+
+class MatchArchive:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        self._shop_uids, self._rule_uids = _build_name_index()
+
+    def close(self):
+        self.conn.close()
+
+    # === ЗАГРУЗКА ===
+
+    def ingest_dir(self, folder: str = "match_logs") -> int:
+        """Загружает только новые или изменившиеся логи. Возвращает количество загруженных файлов."""
+        paths = sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(".json"))
+        return self.ingest_files(paths)
+
+    def ingest_files(self, paths: Iterable[str]) -> int:
+        known = {row[0]: (row[1], row[2]) for row in
+                 self.conn.execute("SELECT path, size, mtime FROM matches")}
+        ingested = 0
+        with self.conn:
+            for path in paths:
+                st = os.stat(path)
+                key = os.path.abspath(path)
+                if known.get(key) == (st.st_size, st.st_mtime):
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Пропускаю {path}: {e}")
+                    continue
+                if "history" not in data:
+                    continue
+                # Файл перезаписан — старую версию выкидываем целиком
+                self.conn.execute("DELETE FROM matches WHERE path = ?", (key,))
+                self._ingest_match(key, st.st_size, st.st_mtime, data)
+                ingested += 1
+        return ingested
+
+    def _ingest_match(self, path: str, size: int, mtime: float, data: dict):
+        history = data["history"]
+        winner = self._find_winner(history)
+        turns = max((e.get("turn", 0) for e in history), default=0)
+        cur = self.conn.execute(
+            "INSERT INTO matches (path, size, mtime, timestamp, turns, winner) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, size, mtime, data.get("timestamp"), turns, winner)
+        )
+        match_id = cur.lastrowid
+
+        rows = []
+        holdings = set()
+        for seq, entry in enumerate(history):
+            event_type, card, rule, details = self._normalize(entry)
+            player = entry.get("player", -1)
+            rows.append((match_id, seq, entry.get("turn", 0), player, event_type, card, rule,
+                         json.dumps(details, ensure_ascii=False)))
+            if event_type in ACQUIRE_EVENTS and card:
+                holdings.add((match_id, player, card))
+            elif event_type == "RULE_TRIGGER" and card:  # «помощь отстающим» выдаёт карту
+                holdings.add((match_id, player, card))
+
+        self.conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.conn.executemany("INSERT OR IGNORE INTO holdings VALUES (?, ?, ?)", holdings)
+
+    def _normalize(self, entry: dict) -> Tuple[str, Optional[str], Optional[str], dict]:
+        """Достаёт из записи лога тип события и uid карты/правила"""
+        details = {k: v for k, v in entry.items() if k not in ("turn", "player", "type")}
+        event_type = entry.get("type", "")
+        # Старые логи: поле "type" карты сундучка перетирало тип события
+        if event_type in ("Хорошо", "Плохо") and "effect" in details:
+            details["side"] = event_type
+            event_type = "EVENT_CARD"
+
+        card = details.get("card_uid") or self._shop_uids.get(details.get("card"))
+        rule = details.get("rule_uid") or self._rule_uids.get(details.get("rule")) \
+            or RULE_BY_EVENT.get(event_type)
+        return event_type, card, rule, details
+
+    @staticmethod
+    def _find_winner(history: List[dict]) -> Optional[int]:
+        for entry in reversed(history):
+            if entry.get("type") == "FINISH_ROLL" and entry.get("success"):
+                return entry.get("player")
+            if entry.get("type") == "MINE_ROLL" and entry.get("roll") == 6:
+                return entry.get("player")
+        return None
+
+    # === ЗАПРОСЫ ===
+
+    def match_count(self, finished_only: bool = False) -> int:
+        sql = "SELECT COUNT(*) FROM matches"
+        if finished_only:
+            sql += " WHERE winner IS NOT NULL"
+        return self.conn.execute(sql).fetchone()[0]
+
+    def count_events(self, event_type: Optional[str] = None, card: Optional[str] = None,
+                     rule: Optional[str] = None, player: Optional[int] = None,
+                     turn_from: Optional[int] = None, turn_to: Optional[int] = None) -> int:
+        """Количество событий, подходящих под все заданные фильтры"""
+        where, params = [], []
+        for column, value in (("type", event_type), ("card", card), ("rule", rule), ("player", player)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if turn_from is not None:
+            where.append("turn >= ?")
+            params.append(turn_from)
+        if turn_to is not None:
+            where.append("turn <= ?")
+            params.append(turn_to)
+        sql = "SELECT COUNT(*) FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def rule_trigger_rate(self, rule: str) -> Tuple[int, int]:
+        """(срабатываний правила, матчей, где оно срабатывало хотя бы раз)"""
+        row = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT match_id) FROM events WHERE rule = ?", (rule,)
+        ).fetchone()
+        return row[0], row[1]
+
+    def win_rate_holding(self, card: str) -> Tuple[float, int]:
+        """
+        Доля побед среди игроков, получавших карту за матч.
+        Учитываются только доигранные матчи. Возвращает (винрейт, размер выборки).
+        """
+        row = self.conn.execute(
+            """
+            SELECT COUNT(*), SUM(CASE WHEN m.winner = h.player THEN 1 ELSE 0 END)
+            FROM holdings h JOIN matches m ON m.id = h.match_id
+            WHERE h.card = ? AND m.winner IS NOT NULL
+            """, (card,)
+        ).fetchone()
+        total, wins = row[0], row[1] or 0
+        return (wins / total if total else 0.0), total
+
+    def top(self, by: str = "type", limit: int = 20) -> List[Tuple[str, int]]:
+        """Самые частые значения колонки type / card / rule"""
+        if by not in ("type", "card", "rule"):
+            raise ValueError(f"Нельзя группировать по {by}")
+        return self.conn.execute(
+            f"SELECT {by}, COUNT(*) AS n FROM events WHERE {by} IS NOT NULL "
+            f"GROUP BY {by} ORDER BY n DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Архив логов матчей")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="загрузить новые логи")
+    p_ingest.add_argument("folder", nargs="?", default="match_logs")
+
+    p_win = sub.add_parser("winrate", help="винрейт игроков, получавших карту")
+    p_win.add_argument("card")
+
+    p_count = sub.add_parser("count", help="количество событий по фильтрам")
+    p_count.add_argument("--type")
+    p_count.add_argument("--card")
+    p_count.add_argument("--rule")
+    p_count.add_argument("--player", type=int)
+    p_count.add_argument("--turn-from", type=int)
+    p_count.add_argument("--turn-to", type=int)
+
+    p_top = sub.add_parser("top", help="самые частые события / карты / правила")
+    p_top.add_argument("--by", default="type", choices=["type", "card", "rule"])
+    p_top.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    archive = MatchArchive(args.db)
+    started = time.perf_counter()
+
+    if args.command == "ingest":
+        n = archive.ingest_dir(args.folder)
+        print(f"Загружено новых логов: {n} (всего матчей: {archive.match_count()})")
+    elif args.command == "winrate":
+        rate, sample = archive.win_rate_holding(args.card)
+        print(f"{args.card}: винрейт {rate:.1%} (выборка {sample})")
+    elif args.command == "count":
+        n = archive.count_events(args.type, args.card, args.rule, args.player, args.turn_from, args.turn_to)
+        print(n)
+    elif args.command == "top":
+        for value, n in archive.top(args.by, args.limit):
+            print(f"{n:8d}  {value}")
+
+    print(f"({(time.perf_counter() - started) * 1000:.1f} мс)")
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import random
-from typing import List, Union
+from typing import Dict, List, Union
 from dataclasses import dataclass
 from game_core.config import CardType
 
@@ -51,14 +51,15 @@ class EventCard(Card):
         self.bad_side = bad
 
 class Deck:
-    def __init__(self, cards: List[Card], name: str = "Deck"):
+    def __init__(self, cards: List[Card], name: str = "Deck", rng: random.Random = None):
         self.name = name
+        self.rng = rng or random.Random()  # ГСЧ матча: от него зависит порядок карт при реплее
         self.draw_pile: List[Card] = cards[:]
         self.discard_pile: List[Card] = []
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.draw_pile)
+        self.rng.shuffle(self.draw_pile)
 
     def draw(self, count: int = 1) -> List[Card]:
         drawn = []
@@ -80,7 +81,7 @@ class Deck:
 
 class CardLibrary:
     @staticmethod
-    def create_shop_deck() -> Deck:
+    def create_shop_deck(rng: random.Random = None, overrides: Dict[str, Dict[str, int]] = None) -> Deck:
         """Колода Лавки Джо"""
         cards = [
             # Активные
@@ -128,14 +129,19 @@ class CardLibrary:
                  description="Если остановился на пустой клетке, получи 4 монеты.",
                  effect_id="passive_empty_income", sprite_id=6),
         ]
+        # Балансовые правки из Ruleset: {uid: {"use_cost": ..., "value": ...}}
+        for c in cards:
+            for attr, value in (overrides or {}).get(c.uid, {}).items():
+                setattr(c, attr, value)
+
         # Для баланса множим карты (в реальной колоде их по несколько штук)
         full_deck = []
         for c in cards:
             full_deck.extend([c] * 2)
-        return Deck(full_deck, name="Лавка Джо")
+        return Deck(full_deck, name="Лавка Джо", rng=rng)
 
     @staticmethod
-    def create_tadam_deck() -> Deck:
+    def create_tadam_deck(rng: random.Random = None) -> Deck:
         """Колода Та-Дам (Глобальные правила)"""
         cards = [
             RuleCard("rule_red_penalty", "красная западня",
@@ -211,10 +217,10 @@ class CardLibrary:
                                             "с эффектом, то она будет действовать на него по обычным правилам.",
                  effect_id="rule_last_move_5", sprite_id=10),
         ]
-        return Deck(cards, name="Та-Дам")
+        return Deck(cards, name="Та-Дам", rng=rng)
 
     @staticmethod
-    def create_event_deck() -> Deck:
+    def create_event_deck(rng: random.Random = None) -> Deck:
         """Создает колоду двусторонних карт событий"""
 
         # Данные пар (Good Side / Bad Side)
@@ -319,4 +325,4 @@ class CardLibrary:
         deck_cards = []
         for i, (good, bad) in enumerate(pairs_data):
             deck_cards.append(EventCard(f"event_{i}", good, bad))
-        return Deck(deck_cards, name="События")
+        return Deck(deck_cards, name="События", rng=rng)
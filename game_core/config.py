@@ -1,10 +1,62 @@
+import hashlib
+import json
+from dataclasses import dataclass, field, asdict, fields
 from enum import Enum, auto
+from typing import Dict
 
 # === КОНСТАНТЫ ===
 START_MONEY = 10
 MAX_HAND_SIZE = 3
 WINNING_ROLL = 6
 TA_DAM_QUEUE_SIZE = 3
+SHOP_PRICE = 5
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """
+    Балансовые параметры одного матча. Движок читает их отсюда, а не из констант,
+    чтобы разные матчи (например, в подборе баланса) могли идти с разными правилами.
+    """
+    start_money: int = START_MONEY
+    max_hand_size: int = MAX_HAND_SIZE
+    winning_roll: int = WINNING_ROLL
+    ta_dam_queue_size: int = TA_DAM_QUEUE_SIZE
+    shop_price: int = SHOP_PRICE
+    # Переопределения карт Лавки: {uid: {"use_cost": 2, "value": 6}}
+    card_overrides: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Ruleset":
+        return cls(**data)
+
+    @classmethod
+    def from_params(cls, params: Dict[str, int]) -> "Ruleset":
+        """Из плоского словаря: поля Ruleset + ключи вида "shop_rocket.value" для карт"""
+        names = {f.name for f in fields(cls)}
+        base, overrides = {}, {}
+        for key, value in params.items():
+            if "." in key:
+                uid, attr = key.split(".", 1)
+                if attr not in ("use_cost", "value"):
+                    raise ValueError(f"Карте можно менять только use_cost и value, а не {attr}")
+                overrides.setdefault(uid, {})[attr] = value
+            elif key in names and key != "card_overrides":
+                base[key] = value
+            else:
+                raise ValueError(f"Неизвестный параметр правил: {key}")
+        return cls(card_overrides=overrides, **base)
+
+    def key(self) -> str:
+        """Стабильный хеш параметров (для кеша результатов)"""
+        raw = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+DEFAULT_RULESET = Ruleset()
 
 # === ТИПЫ ДАННЫХ ===
 
@@ -1,12 +1,18 @@
+import functools
 import random
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict
-from game_core.config import CellType, WINNING_ROLL
+from game_core.config import CellType, Ruleset, DEFAULT_RULESET
 from game_core.board import Board
 from game_core.logger import GameLogger
+from game_core.snapshot import GameSnapshot, take_snapshot
 from game_core.state import GameState, Player
 from game_core.cards import Card, ShopCard, EventCard, RuleCard
 
+# Активные карты Лавки, которым нужна цель
+TARGETED_CARD_EFFECTS = ("attack_hook", "move_harpoon", "attack_grenade", "attack_hand_fate", "attack_voodoo")
+
+
 @dataclass
 class GameEvent:
     """События, которые должен обработать UI или AI"""
@@ -14,20 +20,91 @@ class GameEvent:
     player: Player
     data: dict = None
 
+def command(method):
+    """
+    Помечает метод движка как действие, меняющее состояние игры.
+    Внешние вызовы (не изнутри другой команды) пишутся в журнал логгера:
+    сид + журнал полностью воспроизводят матч (см. game_core/replay.py).
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._command_depth:
+            return method(self, *args, **kwargs)
+        self.logger.log_command(name, self.encode_args(list(args)), self.encode_args(kwargs))
+        self._command_depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._command_depth -= 1
+    return wrapper
+
+
 class GameEngine:
-    def __init__(self, logger: GameLogger, player_count: int = 2):
-        self.board = Board()
-        self.state = GameState(player_count)
+    def __init__(self, logger: GameLogger, player_count: int = 2, seed: Optional[int] = None,
+                 ruleset: Ruleset = DEFAULT_RULESET, board: Optional[Board] = None):
+        # Весь рандом матча (кубики, тасовка колод) идёт через один ГСЧ
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        self.ruleset = ruleset
+        self.board = board or Board()  # Поле движок не меняет, поэтому его можно делить между партиями
+        self.state = GameState(player_count, rng=self.rng, ruleset=ruleset)
         self.logger = logger  # Внедряем логгер
         self.is_game_over = False
         self.winner: Optional[Player] = None
         self.placed_mines: Dict[int, int] = {} # Для хранения мин (карта Хорошо): {cell_id: owner_uid}
+        self.mines_version = 0  # Растёт при установке и срабатывании мин
         self.pending_events: List[GameEvent] = []
 
+        # Производные запросы (можно ли действовать, кто последний) кешируются до смены state.version
+        self._memo: Dict[tuple, object] = {}
+        self._memo_version = -1
+        self.snapshot: Optional[GameSnapshot] = None  # Последний опубликованный снимок для отрисовки
+
+        self._command_depth = 0
+        self._cards_by_uid: Dict[str, Card] = {
+            c.uid: c for deck in (self.state.deck_shop, self.state.deck_events, self.state.deck_tadam)
+            for c in deck.draw_pile
+        }
+        self.logger.set_match_info(seed=self.seed, player_count=player_count, ruleset=ruleset.to_dict())
+
+    # === ЖУРНАЛ КОМАНД ===
+
+    def encode_args(self, value):
+        """Игроки и карты в журнале хранятся по uid"""
+        if isinstance(value, Player):
+            return {"$player": value.uid}
+        if isinstance(value, Card):
+            return {"$card": value.uid}
+        if isinstance(value, (list, tuple)):
+            return [self.encode_args(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.encode_args(v) for k, v in value.items()}
+        return value
+
+    def decode_args(self, value):
+        if isinstance(value, list):
+            return [self.decode_args(v) for v in value]
+        if isinstance(value, dict):
+            if "$player" in value:
+                return self.state.players[value["$player"]]
+            if "$card" in value:
+                return self._cards_by_uid[value["$card"]]
+            return {k: self.decode_args(v) for k, v in value.items()}
+        return value
+
+    def apply_command(self, entry: dict):
+        """Повторяет команду из журнала"""
+        method = getattr(self, entry["cmd"])
+        return method(*self.decode_args(entry["args"]), **self.decode_args(entry["kwargs"]))
+
+    @command
     def get_roll(self, player: Player) -> List[int]:
         pos = player.position
         count = 2 if 24 <= pos <= 97 else 1
-        rolls = [random.randint(1, 6) for _ in range(count)]
+        rolls = [self.rng.randint(1, 6) for _ in range(count)]
 
         # Та-Дам "дубль-ход"
         if count == 2 and rolls[0] == rolls[1]:
@@ -46,14 +123,37 @@ class GameEngine:
                     self.logger.log_event(player.uid, "RULE_SIX_SKIP", {})
         return rolls
 
+    @property
+    def version(self) -> int:
+        """Растёт при любом изменении состояния партии, включая мины"""
+        return self.state.version + self.mines_version
+
+    def publish_snapshot(self) -> GameSnapshot:
+        """
+        Снимок после пачки изменений. Ссылка подменяется одним присваиванием,
+        так что другой поток читает engine.snapshot без блокировок.
+        """
+        self.snapshot = take_snapshot(self, self.snapshot)
+        return self.snapshot
+
+    def _memoized(self, key: tuple, compute):
+        """Результат compute() для key, пока state.version не изменилась"""
+        version = self.state.version
+        if version != self._memo_version:
+            self._memo.clear()
+            self._memo_version = version
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
     def get_move_options(self, player: Player, rolls: List[int]) -> List[int]:
         """
         Принимает «сырые» броски и возвращает список доступных вариантов перемещения.
         Учитывает зоны, Кубик удачи и пассивку Волшебный куб.
         """
         pos = player.position
-        cell = self.board.get_cell(pos)
-        has_cube = any(c.effect_id == "passive_roll_plus_1" for c in player.hand)
+        has_cube = self._memoized(("has_cube", player.uid), lambda: any(
+            c.effect_id == "passive_roll_plus_1" for c in player.hand))
 
         options = []
 
@@ -73,6 +173,9 @@ class GameEngine:
 
     def can_player_do_actions(self, player: Player) -> bool:
         """Проверка, есть ли у игрока доступные активные карты, которые он может оплатить"""
+        return self._memoized(("can_act", player.uid), lambda: self._can_player_do_actions(player))
+
+    def _can_player_do_actions(self, player: Player) -> bool:
         opponents = [o for o in self.state.players if o.uid != player.uid and not o.is_finished]
         for i, card in enumerate(player.hand):
             if card.is_passive or i in player.used_cards_indices:
@@ -80,23 +183,29 @@ class GameEngine:
             if not player.can_afford(card.use_cost):
                 continue
 
-            eid = card.effect_id
-            if eid in ["attack_hook", "move_harpoon"]:
-                if any(not o.is_finished and 0 < (o.position - player.position) <= 10 for o in opponents):
-                    return True
-            elif eid == "attack_grenade":
-                if any(not o.is_finished and o.position > player.position for o in opponents):
-                    return True
-            elif eid == "attack_hand_fate":
-                if any(not o.is_finished and o.position > 0 for o in opponents):
-                    return True
-            elif eid == "attack_voodoo":
-                if any(not o.is_finished for o in opponents):
-                    return True
-            else:
+            if card.effect_id not in TARGETED_CARD_EFFECTS:
+                return True
+            if any(self.can_use_card(player, card, o) for o in opponents):
                 return True
         return False
 
+    @staticmethod
+    def can_use_card(player: Player, card: ShopCard, target: Optional[Player]) -> bool:
+        """Подходит ли цель для активной карты (без учёта оплаты и использованности)"""
+        eid = card.effect_id
+        if eid not in TARGETED_CARD_EFFECTS:
+            return True
+        if not target or target.is_finished:
+            return False
+        if eid in ["attack_hook", "move_harpoon"]:
+            return 0 < (target.position - player.position) <= 10
+        elif eid == "attack_grenade":
+            return target.position > player.position
+        elif eid == "attack_hand_fate":
+            return target.position > 0
+        return True  # attack_voodoo
+
+    @command
     def move_player(self, player: Player, steps: int, is_forward: bool = True,
                     is_own_move: bool = False, apply_effects: bool = True):
         """
@@ -146,6 +255,7 @@ class GameEngine:
         # 1. Проверка мин (подрывается даже владелец)
         if player.position in self.placed_mines:
             self.placed_mines.pop(player.position)
+            self.mines_version += 1
             player.skip_next_turn = True
             self.logger.log_event(player.uid, "MINE_TRIGGERED", {
                 "position": player.position
@@ -176,6 +286,7 @@ class GameEngine:
             elif card.effect_id == "passive_roll_plus_1":
                 pass  # Обрабатывается в логике броска (в UI или Engine до вызова move)
 
+    @command
     def start_turn_checks(self, player: Player):
         """Для правил, действующих в начале хода (бонусы отстающим и т.д.)"""
         player.turn_checks_done = True
@@ -201,7 +312,7 @@ class GameEngine:
                         "rule": rule.name, "gain": rule.value
                     })
                 elif eid == "rule_last_aid":
-                    if len(player.hand) < 3:
+                    if len(player.hand) < player.max_hand_size:
                         card = self.state.deck_shop.draw(1)[0]
                         player.add_card(card)
                         self.logger.log_event(player.uid, "RULE_TRIGGER", {
@@ -217,16 +328,19 @@ class GameEngine:
 
         return False
 
+    @command
     def end_turn_checks(self, player: Player):
         """Правила, действующие в конце хода игрока"""
+        player.end_checks_done = True
         is_last = self._is_last(player)
 
-        for rule in self.state.active_rules:
+        # Копия: прыжок может привести на «Удачный расклад», который добавляет правило
+        for rule in list(self.state.active_rules):
             eid = rule.effect_id
 
             if is_last:
                 if eid == "rule_last_dice_coins":
-                    roll = random.randint(1, 6)
+                    roll = self.rng.randint(1, 6)
                     player.add_coins(roll)
                     self.logger.log_event(player.uid, "RULE_TRIGGER", {
                         "rule": rule.name, "roll": roll, "gain": roll
@@ -240,7 +354,7 @@ class GameEngine:
 
     def _check_global_rules(self, player: Player, cell):
         """Проверка правил Та-Дам после броска на передвижение."""
-        for rule in self.state.active_rules:
+        for rule in list(self.state.active_rules):  # Копия: движение может добавить правило
             eid = rule.effect_id
 
             # Срабатывают при приземлении на цвет
@@ -360,7 +474,7 @@ class GameEngine:
             pass  # Обрабатывается через правила Та-Дам
 
         elif ctype == CellType.FORTUNE_CUBE:
-            rolls = [random.randint(1, 6) for _ in range(3)]
+            rolls = [self.rng.randint(1, 6) for _ in range(3)]
             total = sum(rolls)
             self.logger.log_event(player.uid, "FORTUNE_CUBE", {"rolls": rolls, "total": total})
             self.move_player(player, total)
@@ -374,7 +488,8 @@ class GameEngine:
             ))
 
             shop_card = self.state.deck_shop.draw(1)[0]
-            player.add_card(shop_card)
+            if not player.add_card(shop_card):
+                self.state.deck_shop.discard(shop_card)  # Рука полна
 
             new_rule = self.state.deck_tadam.draw(1)[0]
             self.state.add_rule(new_rule)
@@ -401,7 +516,7 @@ class GameEngine:
             total_collected = 0
             for p in self.state.players:
                 if p.uid != player.uid:
-                    roll = random.randint(1, 6)
+                    roll = self.rng.randint(1, 6)
                     payment = min(p.coins, roll)
                     p.pay(payment)
                     total_collected += payment
@@ -422,7 +537,7 @@ class GameEngine:
                 ))
 
         elif ctype == CellType.MINE:
-            roll = random.randint(1, 6)
+            roll = self.rng.randint(1, 6)
             if roll == 1:
                 player.skip_next_turn = True
             elif roll == 6:
@@ -444,17 +559,23 @@ class GameEngine:
         else:
             raise Exception(f"КУДА МЫ ВСТАЛИ БЛ?Ё! тип клетки: {ctype}")
 
+    @command
     def resolve_shop_choice(self, player: Player, cards: List[ShopCard], choice_idx: int):
         """Разрешение выбора в Лавке Джо (0, 1 - купить, 2 - сбросить)"""
         if choice_idx < 2:
             card = cards[choice_idx]
-            if player.pay(5):
+            if len(player.hand) >= player.max_hand_size:
+                self.state.deck_shop.discard(card)
+                self.logger.log_event(player.uid, "SHOP_SKIP", {"reason": "hand is full"})
+            elif player.pay(self.ruleset.shop_price):
                 player.add_card(card)
                 self.logger.log_event(player.uid, "SHOP_BUY", {
                     "card": card.name,
-                    "cost": 5
+                    "card_uid": card.uid,
+                    "cost": self.ruleset.shop_price
                 })
             else:
+                self.state.deck_shop.discard(card)
                 self.logger.log_event(player.uid, "SHOP_SKIP", {"reason": "not enough coins"})
             self.state.deck_shop.discard(cards[1 - choice_idx])
         else:
@@ -462,24 +583,32 @@ class GameEngine:
                 self.state.deck_shop.discard(c)
             self.logger.log_event(player.uid, "SHOP_SKIP", {})
 
+    @command
     def resolve_shop_free_choice(self, player: Player, cards: List[ShopCard], choice_idx: int):
         """Бесплатный выбор карты из Лавки Джо"""
         if choice_idx < 2:
             card = cards[choice_idx]
-            player.add_card(card)
-            self.logger.log_event(player.uid, "SHOP_FREE", {
-                "card": card.name,
-            })
+            if player.add_card(card):
+                self.logger.log_event(player.uid, "SHOP_FREE", {
+                    "card": card.name,
+                })
+            else:
+                self.state.deck_shop.discard(card)
             self.state.deck_shop.discard(cards[1 - choice_idx])
         else:
             for c in cards:
                 self.state.deck_shop.discard(c)
             self.logger.log_event(player.uid, "SHOP_FREE_SKIP", {})
 
+    @command
     def resolve_duel_opponent(self, attacker: Player, defender: Player):
         atk_roll, def_roll, winner = self.resolve_duel_roll(attacker, defender)
         if winner:
             loser = defender if winner == attacker else attacker
+            self.logger.log_event(attacker.uid, "DUEL_WON", {
+                "winner_uid": winner.uid, "attacker_won": winner is attacker,
+                "atk_roll": atk_roll, "def_roll": def_roll
+            })
             self.pending_events.append(GameEvent(
                 type="DUEL_CHOOSE_REWARD",
                 player=winner,
@@ -490,14 +619,13 @@ class GameEngine:
                 "atk_roll": atk_roll, "def_roll": def_roll
             })
 
-    @staticmethod
-    def resolve_duel_roll(attacker: Player, defender: Player) -> Tuple[int, int, Player]:
+    def resolve_duel_roll(self, attacker: Player, defender: Player) -> Tuple[int, int, Player]:
         """
         Проводит броски для схватки.
         Возвращает: (бросок_атк + 2, бросок_деф, победитель)
         """
-        atk_roll = random.randint(1, 6) + 2
-        def_roll = random.randint(1, 6)
+        atk_roll = self.rng.randint(1, 6) + 2
+        def_roll = self.rng.randint(1, 6)
 
         winner = attacker if atk_roll > def_roll else defender
         if atk_roll == def_roll:
@@ -505,21 +633,23 @@ class GameEngine:
 
         return atk_roll, def_roll, winner
 
+    @command
     def resolve_duel_reward_choice(self, winner: Player, loser: Player, reward_type: str, card_idx: int = -1):
         """Игрок выбрал награду за дуэль"""
         self.apply_duel_reward(winner, loser, reward_type, card_idx)
 
+    @command
     def resolve_tornado_choice(self, victim: Player, choice_idx: int, target_pos: int):
         """
         :param victim: игрок, которого засасывает
         :param choice_idx: 0 - откупиться (10 монет), 1 - лететь к смерчу
         """
-        if choice_idx == 0:
-            if not victim.pay(10):
-                victim.position = target_pos
-        else:
+        paid = choice_idx == 0 and victim.pay(10)
+        if not paid:
             victim.position = target_pos
+        self.logger.log_event(victim.uid, "TORNADO_CHOICE", {"paid": paid, "to": victim.position})
 
+    @command
     def resolve_tadam_choice(self, rule: RuleCard):
         """Вызывается из UI после закрытия диалога с новым правилом"""
         self.state.add_rule(rule)
@@ -547,13 +677,14 @@ class GameEngine:
                     # Если у победителя нет места, карта уходит в сброс лавки
                     self.state.deck_shop.discard(card)
 
+    @command
     def resolve_event_card(self, player: Player, card: EventCard, is_good: bool):
         """Разыгрывает карту из сундучка"""
         side = card.good_side if is_good else card.bad_side
 
         # Логируем карту ДО применения эффекта
         self.logger.log_event(player.uid, "EVENT_CARD", {
-            "type": "Хорошо" if is_good else "Плохо",
+            "side": "Хорошо" if is_good else "Плохо",
             "name": side.name,
             "effect": side.effect_id,
             "value": side.value,
@@ -738,7 +869,7 @@ class GameEngine:
 
         # --- РАНДОМ И КУБИКИ ---
         elif effect_id == "roll_lose_coins_or_move_back":
-            roll = random.randint(1, 6)
+            roll = self.rng.randint(1, 6)
             if roll <= 3:
                 source.pay(5)
                 self.logger.log_event(source.uid, "ROLL_EFFECT", {"roll": roll, "result": "lose_coins", "value": 5})
@@ -747,7 +878,7 @@ class GameEngine:
                 self.logger.log_event(source.uid, "ROLL_EFFECT", {"roll": roll, "result": "move_back", "value": 10})
 
         elif effect_id == "roll_gamble_money_move":
-            roll = random.randint(1, 6)
+            roll = self.rng.randint(1, 6)
             if roll <= 3:
                 source.add_coins(10)
                 self.logger.log_event(source.uid, "ROLL_EFFECT", {"roll": roll, "result": "gain_coins", "value": 10})
@@ -816,7 +947,7 @@ class GameEngine:
 
         elif effect_id == "discard_enemy_shop_card":
             if not target.hand:
-                print(f"У игрока {target.name} нет карт для сброса")
+                self.logger.log_event(source.uid, "EFFECT_DISCARD", {"target": target.name, "card": None})
                 return
 
             if len(target.hand) == 1:
@@ -845,7 +976,7 @@ class GameEngine:
                     ))
                     return
 
-            roll = random.randint(1, 6)
+            roll = self.rng.randint(1, 6)
             self.move_player(target, roll, apply_effects=False)
             self.logger.log_event(source.uid, "EFFECT_PUSH", {
                 "target": target.name, "roll": roll
@@ -903,16 +1034,22 @@ class GameEngine:
                 target.skip_next_turn = True
             self.logger.log_event(source.uid, "SKIP_TURN_MUTUAL", {"target": target.name})
 
+    @command
     def resolve_target_choice(self, source: Player, target_uid: int, effect_id: str, value: int):
         target = next(p for p in self.state.players if p.uid == target_uid)
         self._execute_targeted_logic(effect_id, source, target, value)
 
+    @command
     def resolve_discard_enemy_card(self, source: Player, target: Player, card_idx: int):
         card = target.remove_card(card_idx)
+        if card is None:  # Рука успела измениться, пока событие ждало в очереди
+            return
+        self.state.deck_shop.discard(card)
         self.logger.log_event(source.uid, "EFFECT_DISCARD_CHOICE", {
             "target": target.name, "card": card.name
         })
 
+    @command
     def resolve_slider_input(self, player: Player, coins_spent: int, effect_data: dict):
         """
         Обрабатывает результат выбора слайдером
@@ -953,15 +1090,84 @@ class GameEngine:
                 "targets": [p.name for p in self.state.players if p.uid != player.uid]
             })
 
+    @command
     def resolve_inventory_keep(self, player: Player, keep_idx: int):
         kept = player.hand[keep_idx]
         was_used = keep_idx in player.used_cards_indices
         for i, card in enumerate(player.hand):
             if i != keep_idx:
                 self.state.deck_shop.discard(card)
+        player.hand[:] = [kept]  # На месте: список руки может лежать в данных других событий
         player.used_cards_indices = {0} if was_used else set()
+        player.touch()
         self.logger.log_event(player.uid, "INVENTORY_KEEP", {"kept": kept.name})
 
+    @command
+    def resolve_red_choice(self, player: Player, choice_idx: int):
+        """Красная западня: 0 - потерять 3 монеты, 1 - назад на 3 клетки"""
+        if choice_idx == 0:
+            player.pay(3)
+        else:
+            self.move_player(player, 3, is_forward=False)
+
+    @command
+    def resolve_tax_choice(self, player: Player, pay: bool):
+        """
+        Налог на имущество: решение по текущей карте из события TAX_SHOP_CARD.
+        Событие снимается с очереди, когда карты закончились.
+        """
+        event = self.pending_events[0]
+        card_idx = event.data["card_idx"]
+        cost = event.data["cost"]
+        if pay and player.pay(cost):
+            card_idx += 1  # Карта осталась, переходим к следующей
+        else:
+            # Не захотел или не смог заплатить — сброс
+            removed = player.remove_card(card_idx)
+            self.state.deck_shop.discard(removed)
+            # card_idx не меняем — после remove следующая карта сдвинулась на это место
+
+        if card_idx < len(player.hand):
+            event.data["card_idx"] = card_idx
+        else:
+            self.pending_events.pop(0)
+
+    @command
+    def cancel_slider_input(self, player: Player):
+        self.logger.log_event(player.uid, "SLIDER_CANCELLED", {})
+
+    @command
+    def place_mine(self, player: Player, cell_id: int) -> bool:
+        """Карта «ловушка»: кладёт монету игрока на клетку"""
+        if cell_id in self.placed_mines or not player.pay(1):
+            return False
+        self.placed_mines[cell_id] = player.uid
+        self.mines_version += 1
+        self.logger.log_event(player.uid, "MINE_PLACED", {"cell": cell_id})
+        return True
+
+    @command
+    def request_finish_roll(self, player: Player):
+        """Игрок на Финиш-сейфе вместо хода бросает кубик на открытие сейфа"""
+        self.pending_events.append(GameEvent(type="FINISH_ROLL", player=player, data={}))
+        player.has_moved = True
+
+    @command
+    def pop_event(self) -> GameEvent:
+        """Снимает обработанное событие с очереди"""
+        return self.pending_events.pop(0)
+
+    @command
+    def advance_turn(self, player: Player):
+        """Завершает ход: дополнительный ход тому же игроку или передача хода"""
+        if player.has_extra_turn:
+            player.has_extra_turn = False
+            player.reset_turn_flags()
+            self.logger.log_event(player.uid, "EXTRA_TURN_START", {})
+        else:
+            self.state.next_turn(self.logger)
+
+    @command
     def use_card_from_hand(self, player_idx: int, card_idx: int, target_idx: Optional[int] = None) -> bool:
         player = self.state.players[player_idx]
         card = player.hand[card_idx]
@@ -969,21 +1175,9 @@ class GameEngine:
 
         if card.is_passive: return False
         if card_idx in player.used_cards_indices: return False
+        if not self.can_use_card(player, card, target): return False
 
         eid = card.effect_id
-        if eid in ["attack_hook", "move_harpoon"]:
-            if not (target and not target.is_finished and 0 < (target.position - player.position) <= 10):
-                return False
-        elif eid == "attack_grenade":
-            if not (target and not target.is_finished and target.position > player.position):
-                return False
-        elif eid == "attack_hand_fate":
-            if not (target and not target.is_finished and target.position > 0):
-                return False
-        elif eid == "attack_voodoo":
-            if not (target and not target.is_finished):
-                return False
-
         if not player.pay(card.use_cost): return False
 
         if eid == "attack_grenade" and target:
@@ -1008,8 +1202,13 @@ class GameEngine:
             target.position = player.position
 
         player.mark_card_used(card_idx)
+        details = {"card": card.name, "card_uid": card.uid}
+        if target:
+            details["target"] = target.name
+        self.logger.log_event(player.uid, "CARD_USE", details)
         return True
 
+    @command
     def attempt_finish(self, player: Player, coin_bonus: int = 0) -> tuple:
         """
         Попытка открыть сейф.
@@ -1022,9 +1221,9 @@ class GameEngine:
         elif coin_bonus == 10 and player.pay(10):
             bonus = 2
 
-        roll = random.randint(1, 6)
+        roll = self.rng.randint(1, 6)
         total = roll + bonus
-        success = total >= WINNING_ROLL
+        success = total >= self.ruleset.winning_roll
 
         self.logger.log_event(player.uid, "FINISH_ROLL", {
             "roll": roll, "bonus": bonus, "total": total, "success": success
@@ -1037,6 +1236,9 @@ class GameEngine:
         return roll, bonus, total, success
 
     def _is_last(self, player: Player) -> bool:
+        return self._memoized(("is_last", player.uid), lambda: self._compute_is_last(player))
+
+    def _compute_is_last(self, player: Player) -> bool:
         others = [p for p in self.state.players if p.uid != player.uid]
         return all(p.position >= player.position for p in others) \
             and any(p.position > player.position for p in others)
@@ -0,0 +1,234 @@
+"""
+Счётчики и таймеры по путям движка: эффекты карт, типы клеток, фазы правил
+Та-Дам и глубина цепочек перемещений.
+
+Включается явно: EngineInstrumentation().attach(engine) подменяет методы
+только у этого экземпляра движка, класс GameEngine не меняется — у движков
+без инструментации накладных расходов нет совсем. Время включающее: если
+эффект двигает игрока, время клетки, на которую он встал, входит и во время
+эффекта.
+
+Использование:
+    python -m game_core.instrumentation --games 500 --json stats.json --prom engine.prom
+"""
+import argparse
+import json
+import time
+import types
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+from game_core.simulation import make_bots, run_match
+
+# Методы движка и как из аргументов вызова получить метку
+_HOOKS: Dict[str, Callable] = {
+    "apply_effect": lambda args: ("effect", args[0]),
+    "_trigger_cell_effect": lambda args: ("cell", args[1].type.name),
+    "_check_global_rules": lambda args: ("phase", "landing"),
+    "start_turn_checks": lambda args: ("phase", "turn_start"),
+    "end_turn_checks": lambda args: ("phase", "turn_end"),
+}
+
+# Сколько правил проверяет фаза (правила перебираются одним циклом внутри метода,
+# поэтому время есть на фазу целиком, а по правилам — число проверок)
+_RULE_PHASES = {"_check_global_rules": "landing", "start_turn_checks": "turn_start", "end_turn_checks": "turn_end"}
+
+DEPTH_BUCKETS = (1, 2, 3, 4, 6, 8)
+
+
+class EngineInstrumentation:
+    def __init__(self):
+        self.calls: Dict[tuple, int] = defaultdict(int)  # (вид, метка) -> вызовов
+        self.seconds: Dict[tuple, float] = defaultdict(float)
+        self.rule_checks: Dict[tuple, int] = defaultdict(int)  # (фаза, uid правила) -> проверок
+        self.move_chains = 0  # Внешних вызовов move_player
+        self.move_calls = 0  # Всех вызовов, включая вложенные
+        self.depth_hist = [0] * (len(DEPTH_BUCKETS) + 1)  # Последняя ячейка — глубже DEPTH_BUCKETS[-1]
+        self.max_depth = 0
+        self.depth_sum = 0
+        self._depth = 0
+        self._chain_depth = 0
+
+    def attach(self, engine: GameEngine) -> "EngineInstrumentation":
+        for name, labeler in _HOOKS.items():
+            setattr(engine, name, types.MethodType(self._timed(name, labeler), engine))
+        engine.move_player = types.MethodType(self._move_player(), engine)
+        return self
+
+    @staticmethod
+    def detach(engine: GameEngine):
+        for name in list(_HOOKS) + ["move_player"]:
+            engine.__dict__.pop(name, None)
+
+    # Обёртки вызывают метод класса, а не сохранённый bound-метод: при deepcopy
+    # движка (ключевые кадры реплея) MethodType перепривязывается к копии
+    def _timed(self, name: str, labeler: Callable):
+        original = getattr(GameEngine, name)
+        phase = _RULE_PHASES.get(name)
+        calls, seconds, rule_checks = self.calls, self.seconds, self.rule_checks
+
+        def wrapper(engine, *args, **kwargs):
+            key = labeler(args)
+            if phase:
+                for rule in engine.state.active_rules:
+                    rule_checks[(phase, rule.uid)] += 1
+            started = time.perf_counter_ns()
+            try:
+                return original(engine, *args, **kwargs)
+            finally:
+                seconds[key] += (time.perf_counter_ns() - started) / 1e9
+                calls[key] += 1
+        return wrapper
+
+    def _move_player(self):
+        original = GameEngine.move_player
+
+        def wrapper(engine, *args, **kwargs):
+            self.move_calls += 1
+            self._depth += 1
+            self._chain_depth = max(self._chain_depth, self._depth)
+            try:
+                return original(engine, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._record_chain(self._chain_depth)
+                    self._chain_depth = 0
+        return wrapper
+
+    def _record_chain(self, depth: int):
+        self.move_chains += 1
+        self.depth_sum += depth
+        self.max_depth = max(self.max_depth, depth)
+        for i, bound in enumerate(DEPTH_BUCKETS):
+            if depth <= bound:
+                self.depth_hist[i] += 1
+                return
+        self.depth_hist[-1] += 1
+
+    def reset(self):
+        self.__init__()
+
+    # === ВЫГРУЗКА ===
+
+    def snapshot(self) -> dict:
+        """Копия всех счётчиков в виде вложенных словарей"""
+        by_kind: Dict[str, Dict[str, dict]] = {"effect": {}, "cell": {}, "phase": {}}
+        for (kind, label), n in self.calls.items():
+            by_kind[kind][label] = {"calls": n, "seconds": self.seconds[(kind, label)]}
+        rules: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (phase, uid), n in self.rule_checks.items():
+            rules[phase][uid] = n
+        return {
+            "effects": by_kind["effect"],
+            "cells": by_kind["cell"],
+            "phases": by_kind["phase"],
+            "rule_checks": dict(rules),
+            "move_player": {
+                "calls": self.move_calls,
+                "chains": self.move_chains,
+                "max_depth": self.max_depth,
+                "depth_sum": self.depth_sum,
+                "depth_buckets": list(DEPTH_BUCKETS),
+                "depth_hist": list(self.depth_hist),
+            },
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.snapshot(), ensure_ascii=False, indent=2, sort_keys=True)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, path: Optional[str] = None) -> str:
+        """Текстовый формат экспозиции Prometheus"""
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+        for section, label, what in (("effects", "effect", "эффектам карт"), ("cells", "cell", "типам клеток"),
+                                     ("phases", "phase", "фазам правил Та-Дам")):
+            items = sorted(snap[section].items())
+            metric(f"engine_{label}_calls_total", "counter", f"Вызовы по {what}",
+                   [({label: k}, v["calls"]) for k, v in items])
+            metric(f"engine_{label}_seconds_total", "counter", f"Время по {what}, с (включающее)",
+                   [({label: k}, f"{v['seconds']:.9f}") for k, v in items])
+
+        metric("engine_rule_checks_total", "counter", "Проверки правил Та-Дам по фазам",
+               [({"phase": phase, "rule": uid}, n)
+                for phase, rules in sorted(snap["rule_checks"].items()) for uid, n in sorted(rules.items())])
+
+        moves = snap["move_player"]
+        metric("engine_move_player_calls_total", "counter", "Вызовы move_player, включая вложенные",
+               [({}, moves["calls"])])
+        cumulative = 0
+        buckets = []
+        for bound, n in zip(DEPTH_BUCKETS, moves["depth_hist"]):
+            cumulative += n
+            buckets.append(({"le": bound}, cumulative))
+        buckets.append(({"le": "+Inf"}, moves["chains"]))
+        lines.append("# HELP engine_move_chain_depth Глубина рекурсии цепочек move_player")
+        lines.append("# TYPE engine_move_chain_depth histogram")
+        for labels, value in buckets:
+            lines.append(f'engine_move_chain_depth_bucket{{le="{labels["le"]}"}} {value}')
+        lines.append(f"engine_move_chain_depth_sum {moves['depth_sum']}")
+        lines.append(f"engine_move_chain_depth_count {moves['chains']}")
+
+        text = "\n".join(lines) + "\n"
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+    def summary(self, limit: int = 15) -> str:
+        snap = self.snapshot()
+        lines = []
+        for title, section in (("Эффекты", "effects"), ("Клетки", "cells"), ("Фазы правил", "phases")):
+            lines.append(f"{title} (вызовов, мс всего, мкс на вызов):")
+            items = sorted(snap[section].items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+            for label, v in items[:limit]:
+                per_call = v["seconds"] / v["calls"] * 1e6 if v["calls"] else 0.0
+                lines.append(f"  {label:32s} {v['calls']:8d} {v['seconds'] * 1e3:10.2f} {per_call:8.1f}")
+            lines.append("")
+        moves = snap["move_player"]
+        lines.append(f"move_player: {moves['calls']} вызовов в {moves['chains']} цепочках, "
+                     f"макс. глубина {moves['max_depth']}")
+        labels = [f"≤{b}" for b in DEPTH_BUCKETS] + [f">{DEPTH_BUCKETS[-1]}"]
+        lines.append("  " + ", ".join(f"{label}: {n}" for label, n in zip(labels, moves["depth_hist"]) if n))
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Профиль путей движка по бот-матчам")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0, help="сид первого матча")
+    parser.add_argument("--json", help="сохранить снимок в JSON")
+    parser.add_argument("--prom", help="сохранить в текстовом формате Prometheus")
+    args = parser.parse_args(argv)
+
+    instr = EngineInstrumentation()
+    for seed in range(args.seed, args.seed + args.games):
+        engine = GameEngine(GameLogger(echo=False, keep_history=False), player_count=args.players, seed=seed)
+        instr.attach(engine)
+        run_match(engine, make_bots(seed, args.players), args.max_turns)
+
+    print(instr.summary())
+    if args.json:
+        instr.to_json(args.json)
+    if args.prom:
+        instr.to_prometheus(args.prom)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,15 @@ import os
 from datetime import datetime
 
 class GameLogger:
-    def __init__(self):
+    def __init__(self, echo: bool = True, keep_history: bool = True):
         self.log_data = {
             "timestamp": datetime.now().isoformat(),
-            "history": []
+            "history": [],
+            "commands": []  # Журнал действий игроков для реплея
         }
+        self.echo = echo  # Дублировать ли события в консоль
+        self.keep_history = keep_history  # False - только подписчики, без накопления (массовые симуляции)
+        self.listeners = []  # Подписчики на события по мере их появления (аналитика и т.п.)
         self._current_turn = 1
         # Создаем папку, если её нет
         if not os.path.exists("match_logs"):
@@ -28,11 +32,44 @@ class GameLogger:
             "type": event_type,
             **details
         }
-        self.log_data["history"].append(entry)
+        if self.keep_history:
+            self.log_data["history"].append(entry)
+        for listener in self.listeners:
+            listener(entry)
         # Сразу дублируем в консоль
-        print(f"[Turn {self.current_turn}] Player {player_id+1}: {event_type} | {details}")
+        if self.echo:
+            print(f"[Turn {self.current_turn}] Player {player_id+1}: {event_type} | {details}")
 
-    def save(self, filename="match_logs/match.json"):
+    def add_listener(self, callback):
+        """callback(entry) вызывается на каждое событие сразу после записи"""
+        self.listeners.append(callback)
+
+    def set_match_info(self, **info):
+        """Параметры матча, нужные для реплея (сид, число игроков)"""
+        self.log_data.update(info)
+
+    def log_command(self, name: str, args: list, kwargs: dict):
+        """Вызывается движком на каждое действие игрока (см. engine.command)"""
+        if not self.keep_history:
+            return
+        self.log_data["commands"].append({
+            "turn": self._current_turn,
+            "cmd": name,
+            "args": args,
+            "kwargs": kwargs
+        })
+
+    def rewind(self, turn: int, history_len: int, commands_len: int):
+        """Откат лога к ключевому кадру реплея"""
+        self._current_turn = turn
+        del self.log_data["history"][history_len:]
+        del self.log_data["commands"][commands_len:]
+
+    def save(self, filename: str = None):
+        # По умолчанию у каждого матча свой файл, чтобы логи копились для архива
+        if filename is None:
+            stamp = datetime.fromisoformat(self.log_data["timestamp"]).strftime("%Y%m%d_%H%M%S")
+            filename = f"match_logs/match_{stamp}.json"
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(self.log_data, f, ensure_ascii=False, indent=2)
         print(f"Лог сохранен в {filename}")
@@ -0,0 +1,169 @@
+"""
+Детерминированный реплей матча.
+
+Лог матча хранит сид ГСЧ и журнал команд (действий игроков). Реплеер создаёт
+GameEngine с тем же сидом и повторяет команды по порядку — кубики и порядок
+колод получаются те же самые. Каждые N ходов сохраняется ключевой кадр
+(полная копия движка), поэтому перемотка на любой ход восстанавливает
+ближайший кадр и доигрывает только остаток.
+
+Использование (воспроизведение бага из присланного лога):
+    python -m game_core.replay match_logs/match_....json --verify
+    python -m game_core.replay match_logs/match_....json --turn 300
+"""
+import argparse
+import bisect
+import copy
+import json
+import traceback
+from typing import List, NamedTuple, Optional
+
+from game_core.config import Ruleset
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+
+
+class ReplayError(Exception):
+    """Команда из журнала упала при повторе"""
+    def __init__(self, index: int, entry: dict):
+        super().__init__(f"Команда #{index} ({entry['cmd']}, ход {entry['turn']}) упала при реплее")
+        self.index = index
+        self.entry = entry
+
+
+class Keyframe(NamedTuple):
+    command_idx: int  # Индекс следующей команды журнала
+    turn: int
+    engine: GameEngine
+    history_len: int
+    commands_len: int
+
+
+class MatchReplayer:
+    def __init__(self, log_data: dict, keyframe_interval: int = 10):
+        if "seed" not in log_data or "commands" not in log_data:
+            raise ValueError("В логе нет сида и журнала команд — матч нельзя воспроизвести")
+
+        self.commands: List[dict] = log_data["commands"]
+        self.recorded_history: List[dict] = log_data["history"]
+        self.keyframe_interval = keyframe_interval
+
+        self.logger = GameLogger(echo=False)
+        self.engine = GameEngine(self.logger, player_count=log_data.get("player_count", 2),
+                                 seed=log_data["seed"], ruleset=Ruleset.from_dict(log_data.get("ruleset", {})))
+        self.position = 0  # Индекс следующей команды
+        self.keyframes: List[Keyframe] = []
+        self._save_keyframe()
+
+    @classmethod
+    def from_file(cls, path: str, keyframe_interval: int = 10) -> "MatchReplayer":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), keyframe_interval)
+
+    @property
+    def turn(self) -> int:
+        return self.logger.current_turn
+
+    @property
+    def last_turn(self) -> int:
+        return self.commands[-1]["turn"] if self.commands else 1
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= len(self.commands)
+
+    def step(self) -> Optional[dict]:
+        """Применяет следующую команду журнала. Возвращает её или None в конце матча."""
+        if self.finished:
+            return None
+        entry = self.commands[self.position]
+        if entry["turn"] >= self.keyframes[-1].turn + self.keyframe_interval \
+                and self.keyframes[-1].command_idx < self.position:
+            self._save_keyframe()
+        try:
+            self.engine.apply_command(entry)
+        except Exception as e:
+            raise ReplayError(self.position, entry) from e
+        self.position += 1
+        return entry
+
+    def seek(self, turn: int):
+        """Переходит к началу хода turn (или к концу матча, если ход за пределами)"""
+        turns = [kf.turn for kf in self.keyframes]
+        kf = self.keyframes[max(0, bisect.bisect_right(turns, turn) - 1)]
+        # Назад — только через ключевой кадр. Вперёд — с кадра, если он дальше текущей позиции
+        if turn < self.turn or kf.command_idx > self.position:
+            self._restore(kf)
+        while not self.finished and self.commands[self.position]["turn"] < turn:
+            self.step()
+
+    def run_to_end(self):
+        while self.step() is not None:
+            pass
+
+    def verify(self) -> Optional[int]:
+        """
+        Доигрывает матч до конца и сравнивает историю событий с записанной.
+        Возвращает индекс первого расхождения или None, если реплей совпал.
+        """
+        self.run_to_end()
+        replayed = self.logger.log_data["history"]
+        for i, (expected, actual) in enumerate(zip(self.recorded_history, replayed)):
+            if expected != actual:
+                return i
+        if len(self.recorded_history) != len(replayed):
+            return min(len(self.recorded_history), len(replayed))
+        return None
+
+    def _save_keyframe(self):
+        # Логгер не копируем: у кадра только длины истории и журнала, откат через rewind()
+        engine_copy = copy.deepcopy(self.engine, {id(self.logger): self.logger, id(self.engine.board): self.engine.board})
+        kf = Keyframe(self.position, self.turn, engine_copy,
+                      len(self.logger.log_data["history"]), len(self.logger.log_data["commands"]))
+        self.keyframes.append(kf)
+
+    def _restore(self, kf: Keyframe):
+        self.engine = copy.deepcopy(kf.engine, {id(self.logger): self.logger, id(kf.engine.board): kf.engine.board})
+        self.logger.rewind(kf.turn, kf.history_len, kf.commands_len)
+        self.position = kf.command_idx
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Реплей матча по логу")
+    parser.add_argument("log")
+    parser.add_argument("--turn", type=int, help="показать состояние на начало хода")
+    parser.add_argument("--verify", action="store_true", help="сверить историю событий с записанной")
+    parser.add_argument("--keyframes", type=int, default=10, help="ключевой кадр каждые N ходов")
+    args = parser.parse_args(argv)
+
+    replayer = MatchReplayer.from_file(args.log, args.keyframes)
+    try:
+        if args.verify:
+            diverged = replayer.verify()
+            if diverged is None:
+                print(f"Реплей совпал с логом: {len(replayer.commands)} команд, {replayer.turn} ходов")
+            else:
+                history = replayer.logger.log_data["history"]
+                print(f"Расхождение на событии #{diverged}:")
+                print("  в логе:  ", replayer.recorded_history[diverged] if diverged < len(replayer.recorded_history) else "—")
+                print("  в реплее:", history[diverged] if diverged < len(history) else "—")
+        elif args.turn is not None:
+            replayer.seek(args.turn)
+        else:
+            replayer.run_to_end()
+    except ReplayError as e:
+        print(e)
+        print(f"  аргументы: {e.entry['args']} {e.entry['kwargs']}")
+        traceback.print_exception(e.__cause__)
+        return
+
+    state = replayer.engine.state
+    print(f"Ход {replayer.turn}, команда {replayer.position}/{len(replayer.commands)}")
+    for p in state.players:
+        marker = "→" if p is state.current_player else " "
+        print(f" {marker} {p.name}: клетка {p.position}, монет {p.coins}, карты {[c.name for c in p.hand]}")
+    print(f"   Та-Дам: {[r.name for r in state.active_rules]}, мины: {sorted(replayer.engine.placed_mines)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Безголовый прогон матчей: тот же порядок хода, что и в main.py, но решения
+игроков принимают боты (или любой другой поставщик решений).
+
+MatchDriver.next_decision() сам выполняет автоматическую часть хода
+(проверки начала и конца хода, передачу хода) и останавливается, когда
+нужно решение игрока; MatchDriver.apply() применяет выбранный вариант.
+MatchThread играет матч ботами в отдельном потоке (просмотр матча ботов).
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from game_core.config import DEFAULT_RULESET, Ruleset
+from game_core.engine import GameEngine, GameEvent, TARGETED_CARD_EFFECTS
+from game_core.logger import GameLogger
+from game_core.state import Player
+
+
+@dataclass
+class Decision:
+    """Точка, где нужен выбор игрока. Ответ — индекс в options."""
+    kind: str  # "TURN", "MOVE", "END", "MINE" или тип события движка ("SHOP", "RED_CHOICE", ...)
+    player: Player
+    options: list = field(default_factory=list)
+    event: Optional[GameEvent] = None
+
+
+class MatchDriver:
+    def __init__(self, engine: GameEngine, max_turns: int = 1000):
+        self.engine = engine
+        self.max_turns = max_turns
+        self._move_options: List[int] = []
+        self._mine_player: Optional[Player] = None
+
+    @property
+    def is_over(self) -> bool:
+        return self.engine.is_game_over or self.engine.logger.current_turn > self.max_turns
+
+    def next_decision(self) -> Optional[Decision]:
+        """Продвигает матч до следующего решения. None — матч окончен."""
+        engine = self.engine
+        while not self.is_over:
+            p = engine.state.current_player
+
+            if self._move_options:
+                return Decision("MOVE", p, list(self._move_options))
+
+            if self._mine_player:
+                if self._mine_player.coins <= 0:
+                    self._mine_player = None
+                    continue
+                free = [cid for cid in engine.board.cells if 0 < cid < engine.board.max_cell_id
+                        and cid not in engine.placed_mines]
+                return Decision("MINE", self._mine_player, [None] + free)
+
+            if engine.pending_events:
+                decision = self._event_decision(engine.pending_events[0])
+                if decision:
+                    return decision
+                continue
+
+            if not p.turn_checks_done and not p.has_moved:
+                engine.start_turn_checks(p)
+                continue
+
+            if not p.has_moved:
+                return Decision("TURN", p, ["roll"] + self._card_actions(p))
+
+            if not p.end_checks_done:
+                if engine.can_player_do_actions(p):
+                    return Decision("END", p, ["end"] + self._card_actions(p))
+                engine.end_turn_checks(p)
+                continue
+
+            engine.advance_turn(p)
+        return None
+
+    def _event_decision(self, ev: GameEvent) -> Optional[Decision]:
+        """Решение по событию из очереди движка. None — событие обработано автоматически."""
+        engine = self.engine
+        player = ev.player
+        data = ev.data
+
+        if ev.type == "MINE_PLACEMENT":
+            engine.pop_event()  # Как в UI: дальше режим расстановки
+            self._mine_player = player
+            return None
+        if ev.type == "TORNADO_DECISION" and player.coins < 10:
+            engine.resolve_tornado_choice(player, 1, data["target_pos"])
+            engine.pop_event()
+            return None
+        if ev.type == "TAX_SHOP_CARD" and data["card_idx"] >= len(player.hand):
+            engine.pop_event()
+            return None
+        if ev.type in ("INVENTORY_KEEP", "CHOOSE_CARD_TO_DISCARD") and not data["cards"]:
+            engine.pop_event()  # Карты успели уйти из руки
+            return None
+
+        if ev.type in ("SHOP", "SHOP_FREE"):
+            options = list(data["cards"]) + [None]
+        elif ev.type in ("INVENTORY_KEEP", "CHOOSE_CARD_TO_DISCARD"):
+            options = list(data["cards"])
+        elif ev.type == "SLIDER_INPUT":
+            options = list(range(data["max_value"] + 1))
+        elif ev.type == "FINISH_ROLL":
+            options = [bonus for bonus in (0, 5, 10) if player.coins >= bonus]
+        elif ev.type == "RED_CHOICE":
+            options = ["pay", "back"]
+        elif ev.type == "TORNADO_DECISION":
+            options = ["pay", "fly"]
+        elif ev.type == "TAX_SHOP_CARD":
+            options = ["pay", "discard"]
+        elif ev.type == "DUEL_CHOOSE_REWARD":
+            options = [("money", -1), ("push", -1)] + [("steal_card", i) for i in range(len(data["loser"].hand))]
+        elif ev.type in ("DUEL_CHOOSE_OPPONENT", "CHOOSE_TARGET"):
+            options = list(data["opponents"])
+        else:  # EVENT_CARD, TADAM_SHOW — только подтверждение
+            options = ["ok"]
+        return Decision(ev.type, player, options, ev)
+
+    def _card_actions(self, player: Player) -> list:
+        """Активные карты, которые игрок может применить сейчас: (индекс карты, uid цели)"""
+        actions = []
+        for j, card in enumerate(player.hand):
+            if card.is_passive or j in player.used_cards_indices or not player.can_afford(card.use_cost):
+                continue
+            if card.effect_id not in TARGETED_CARD_EFFECTS:
+                actions.append((j, None))
+                continue
+            for other in self.engine.state.players:
+                if other.uid != player.uid and self.engine.can_use_card(player, card, other):
+                    actions.append((j, other.uid))
+        return actions
+
+    def apply(self, decision: Decision, choice: int):
+        engine = self.engine
+        p = decision.player
+        option = decision.options[choice]
+        kind = decision.kind
+
+        if kind in ("TURN", "END"):
+            if option == "roll":
+                self._roll(p)
+            elif option == "end":
+                engine.end_turn_checks(p)
+            else:
+                card_idx, target_uid = option
+                engine.use_card_from_hand(p.uid, card_idx, target_idx=target_uid)
+            return
+        if kind == "MOVE":
+            self._move_options = []
+            engine.move_player(p, option, is_own_move=True)
+            return
+        if kind == "MINE":
+            if option is None:
+                self._mine_player = None
+            else:
+                engine.place_mine(p, option)
+            return
+
+        data = decision.event.data
+        if kind == "SHOP":
+            engine.resolve_shop_choice(p, data["cards"], choice)
+        elif kind == "SHOP_FREE":
+            engine.resolve_shop_free_choice(p, data["cards"], choice)
+        elif kind == "INVENTORY_KEEP":
+            engine.resolve_inventory_keep(p, choice)
+        elif kind == "CHOOSE_CARD_TO_DISCARD":
+            engine.resolve_discard_enemy_card(p, data["target"], choice)
+        elif kind == "SLIDER_INPUT":
+            engine.resolve_slider_input(p, option, {
+                "effect_id": data["effect_id"],
+                "multiplier": data["multiplier"],
+                "target_self": data.get("target_self", True)
+            })
+        elif kind == "EVENT_CARD":
+            engine.resolve_event_card(p, data["card"], data["is_good"])
+        elif kind == "TADAM_SHOW":
+            engine.resolve_tadam_choice(data["rule"])
+        elif kind == "FINISH_ROLL":
+            engine.attempt_finish(p, option)
+        elif kind == "RED_CHOICE":
+            engine.resolve_red_choice(p, choice)
+        elif kind == "TORNADO_DECISION":
+            engine.resolve_tornado_choice(p, choice, data["target_pos"])
+        elif kind == "TAX_SHOP_CARD":
+            engine.resolve_tax_choice(p, pay=(option == "pay"))
+            return  # resolve_tax_choice сам снимает событие, когда карты кончились
+        elif kind == "DUEL_CHOOSE_OPPONENT":
+            engine.resolve_duel_opponent(p, option)
+        elif kind == "DUEL_CHOOSE_REWARD":
+            reward_type, card_idx = option
+            engine.resolve_duel_reward_choice(p, data["loser"], reward_type, card_idx)
+        elif kind == "CHOOSE_TARGET":
+            engine.resolve_target_choice(p, option.uid, data["effect_id"], data["value"])
+        engine.pop_event()
+
+    def _roll(self, p: Player):
+        if p.is_finished:
+            self.engine.request_finish_roll(p)
+            return
+        rolls = self.engine.get_roll(p)
+        options = self.engine.get_move_options(p, rolls)
+        if len(options) > 1:
+            self._move_options = options
+        else:
+            self.engine.move_player(p, options[0], is_own_move=True)
+
+
+class RandomBot:
+    """Случайные решения; карты применяет с вероятностью card_chance"""
+    def __init__(self, rng: random.Random = None, card_chance: float = 0.3):
+        self.rng = rng or random.Random()
+        self.card_chance = card_chance
+
+    def choose(self, decision: Decision) -> int:
+        if decision.kind in ("TURN", "END"):
+            if len(decision.options) > 1 and self.rng.random() < self.card_chance:
+                return self.rng.randrange(1, len(decision.options))
+            return 0
+        if decision.kind == "MINE":
+            # Пара мин и хватит
+            return self.rng.randrange(1, len(decision.options)) if self.rng.random() < 0.5 else 0
+        return self.rng.randrange(len(decision.options))
+
+
+def run_match(engine: GameEngine, bots: list, max_turns: int = 1000) -> GameEngine:
+    """Доигрывает матч: bots[uid].choose(decision) -> индекс варианта"""
+    driver = MatchDriver(engine, max_turns)
+    while True:
+        decision = driver.next_decision()
+        if decision is None:
+            break
+        driver.apply(decision, bots[decision.player.uid].choose(decision))
+    return engine
+
+
+def play_match(seed: int, player_count: int = 2, max_turns: int = 1000,
+               bot_factory: Callable[[random.Random], RandomBot] = RandomBot,
+               logger: GameLogger = None, ruleset: Ruleset = DEFAULT_RULESET) -> GameEngine:
+    """Играет один матч ботами до конца и возвращает движок с финальным состоянием"""
+    engine = GameEngine(logger or GameLogger(echo=False), player_count=player_count, seed=seed, ruleset=ruleset)
+    return run_match(engine, make_bots(seed, player_count, bot_factory), max_turns)
+
+
+def make_bots(seed: int, player_count: int,
+              bot_factory: Callable[[random.Random], RandomBot] = RandomBot) -> list:
+    # У ботов свой ГСЧ, чтобы их решения не сдвигали кубики матча
+    bot_rng = random.Random(seed ^ 0x5EED)
+    return [bot_factory(bot_rng) for _ in range(player_count)]
+
+
+class MatchThread(threading.Thread):
+    """
+    Матч ботов в отдельном потоке. Шаг — одно решение бота вместе с
+    автоматической частью хода перед ним; после шага движок публикует
+    снимок (engine.snapshot), и отрисовка читает только его, без блокировок.
+    Сам поток отрисовку не ждёт — скорость задаёт только steps_per_second.
+    """
+
+    def __init__(self, engine: GameEngine, bots: list, max_turns: int = 1000,
+                 steps_per_second: Optional[float] = None):
+        super().__init__(name="match", daemon=True)
+        self.engine = engine
+        self.bots = bots
+        self.driver = MatchDriver(engine, max_turns)
+        self.steps_per_second = steps_per_second  # None — без ограничения
+        self.steps = 0
+        self.finished = False
+        self.stepped = threading.Condition()  # Будит ждущих очередного шага
+        self._resume = threading.Event()
+        self._resume.set()
+        self._stop_requested = False
+        engine.publish_snapshot()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def stop(self):
+        self._stop_requested = True
+        self._resume.set()
+
+    def wait_steps(self, target: int, timeout: float) -> bool:
+        """Ждёт, пока шагов станет не меньше target (или матч кончится)"""
+        with self.stepped:
+            return self.stepped.wait_for(lambda: self.steps >= target or self.finished, timeout)
+
+    def run(self):
+        next_step_at = time.perf_counter()
+        while not self._stop_requested:
+            self._resume.wait()
+            rate = self.steps_per_second
+            if rate:
+                delay = next_step_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(min(delay, 0.05))  # Короткими кусками: смена скорости и пауза действуют сразу
+                    continue
+                next_step_at = time.perf_counter() + 1 / rate
+            decision = self.driver.next_decision()
+            if decision is not None:
+                self.driver.apply(decision, self.bots[decision.player.uid].choose(decision))
+            self.engine.publish_snapshot()
+            with self.stepped:
+                if decision is None:
+                    self.finished = True
+                else:
+                    self.steps += 1
+                self.stepped.notify_all()
+            if self.finished:
+                break
@@ -0,0 +1,80 @@
+"""
+Неизменяемые снимки партии для отрисовки.
+
+Renderer читает только снимки, а не живые Player и GameState. Движок
+собирает снимок после пачки изменений (GameEngine.publish_snapshot) и
+подменяет ссылку engine.snapshot одним присваиванием. Присваивание
+атрибута атомарно, поэтому поток отрисовки берёт engine.snapshot без
+блокировок и всегда видит целое состояние на границе шагов — никогда
+полшага.
+
+Снимок игрока пересобирается, только когда меняется его версия (или флаг
+хода); остальные снимки берутся из предыдущего целиком.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+
+class CardView(NamedTuple):
+    uid: str
+    name: str
+    sprite_id: Optional[int]
+
+
+class PlayerSnapshot(NamedTuple):
+    uid: int
+    name: str
+    version: int
+    position: int
+    coins: int
+    is_finished: bool
+    has_moved: bool
+    hand: Tuple[CardView, ...]
+    used_cards_indices: frozenset
+
+
+class GameSnapshot(NamedTuple):
+    version: int  # GameEngine.version на момент снимка
+    turn: int
+    current_player_idx: int
+    players: Tuple[PlayerSnapshot, ...]
+    active_rules: Tuple[CardView, ...]
+    placed_mines: Tuple[int, ...]  # Клетки с минами по возрастанию
+    winner_uid: Optional[int]
+    is_game_over: bool
+
+    @property
+    def current_player(self) -> PlayerSnapshot:
+        return self.players[self.current_player_idx]
+
+
+def card_view(card) -> CardView:
+    return CardView(card.uid, card.name, getattr(card, "sprite_id", None))
+
+
+def player_snapshot(player, previous: Optional[PlayerSnapshot] = None) -> PlayerSnapshot:
+    if previous is not None and previous.version == player.version and previous.has_moved == player.has_moved:
+        return previous
+    return PlayerSnapshot(
+        player.uid, player.name, player.version, player.position, player.coins, player.is_finished,
+        player.has_moved, tuple(card_view(card) for card in player.hand), frozenset(player.used_cards_indices),
+    )
+
+
+def take_snapshot(engine, previous: Optional[GameSnapshot] = None) -> GameSnapshot:
+    """Снимок партии; неизменившиеся части берутся из previous"""
+    state = engine.state
+    old_players = previous.players if previous and len(previous.players) == len(state.players) else ()
+    players = tuple(player_snapshot(p, old_players[i] if old_players else None)
+                    for i, p in enumerate(state.players))
+
+    version = engine.version
+    if previous is not None and previous.version == version:
+        rules, mines = previous.active_rules, previous.placed_mines
+    else:
+        rules = tuple(card_view(rule) for rule in state.active_rules)
+        mines = tuple(sorted(int(cell_id) for cell_id in engine.placed_mines))
+
+    return GameSnapshot(
+        version, engine.logger.current_turn, state.current_player_idx, players, rules, mines,
+        engine.winner.uid if engine.winner else None, engine.is_game_over,
+    )
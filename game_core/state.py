@@ -1,16 +1,26 @@
+import random
 from typing import List, Deque, Set
 from collections import deque
-from game_core.config import START_MONEY, MAX_HAND_SIZE, TA_DAM_QUEUE_SIZE
+from game_core.config import START_MONEY, MAX_HAND_SIZE, DEFAULT_RULESET, Ruleset
 from game_core.cards import Card, CardLibrary, RuleCard, ShopCard
 from game_core.logger import GameLogger
 
 
 class Player:
-    def __init__(self, uid: int, name: str):
+    """
+    version растёт при любом изменении позиции, монет, руки, использованных
+    карт и финиша — по нему кешируются производные вычисления и панели UI.
+    Позиция, монеты и финиш — свойства, поэтому прямое присваивание тоже
+    учитывается; руку меняют методами, а при правке списка напрямую нужен touch().
+    """
+
+    def __init__(self, uid: int, name: str, start_money: int = START_MONEY, max_hand_size: int = MAX_HAND_SIZE):
+        self.version = 0
         self.uid = uid
         self.name = name
         self.position: int = 0
-        self.coins: int = START_MONEY
+        self.coins: int = start_money
+        self.max_hand_size = max_hand_size
 
         self.hand: List[ShopCard] = []
         self.used_cards_indices: Set[int] = set()
@@ -24,6 +34,36 @@ class Player:
         self.end_checks_done = False
         self.is_finished: bool = False
 
+    def touch(self):
+        self.version += 1
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @position.setter
+    def position(self, value: int):
+        self._position = value
+        self.version += 1
+
+    @property
+    def coins(self) -> int:
+        return self._coins
+
+    @coins.setter
+    def coins(self, value: int):
+        self._coins = value
+        self.version += 1
+
+    @property
+    def is_finished(self) -> bool:
+        return self._is_finished
+
+    @is_finished.setter
+    def is_finished(self, value: bool):
+        self._is_finished = value
+        self.version += 1
+
     def can_afford(self, amount: int) -> bool:
         return self.coins >= amount
 
@@ -38,52 +78,67 @@ class Player:
 
     def add_card(self, card: Card) -> bool:
         """Возвращает False, если рука полна (нужно сбросить другую)"""
-        if len(self.hand) >= MAX_HAND_SIZE:
+        if len(self.hand) >= self.max_hand_size:
             return False
         self.hand.append(card)
+        self.version += 1
         return True
 
     def remove_card(self, index: int) -> Card:
         """Удаляет карту (при сбросе лишней или продаже)"""
         if 0 <= index < len(self.hand):
+            self.version += 1
             return self.hand.pop(index)
 
     def mark_card_used(self, index: int):
         self.used_cards_indices.add(index)
+        self.version += 1
 
     def reset_turn_flags(self):
         """Вызывается в начале хода"""
-        self.used_cards_indices.clear()
+        if self.used_cards_indices:
+            self.used_cards_indices.clear()
+            self.version += 1
         self.has_moved = False
         self.has_extra_turn = False
         self.turn_checks_done = False
         self.end_checks_done = False
 
 class GameState:
-    def __init__(self, player_count=2):
-        self.players = [Player(i, f"Игрок {i+1}") for i in range(player_count)]
+    def __init__(self, player_count=2, rng: random.Random = None, ruleset: Ruleset = DEFAULT_RULESET):
+        self.ruleset = ruleset
+        self.players = [Player(i, f"Игрок {i+1}", ruleset.start_money, ruleset.max_hand_size)
+                        for i in range(player_count)]
         self.current_player_idx = 0
 
         # Колоды
-        self.deck_shop = CardLibrary.create_shop_deck()
-        self.deck_events = CardLibrary.create_event_deck()
-        self.deck_tadam = CardLibrary.create_tadam_deck()
+        self.deck_shop = CardLibrary.create_shop_deck(rng, ruleset.card_overrides)
+        self.deck_events = CardLibrary.create_event_deck(rng)
+        self.deck_tadam = CardLibrary.create_tadam_deck(rng)
 
         # Очередь глобальных правил
-        self.active_rules: Deque[RuleCard] = deque(maxlen=TA_DAM_QUEUE_SIZE)
+        self.active_rules: Deque[RuleCard] = deque(maxlen=ruleset.ta_dam_queue_size)
+        self.rules_version = 0  # Растёт при смене правил Та-дам и хода
+
+    @property
+    def version(self) -> int:
+        """Растёт при любом изменении игроков, правил или текущего игрока"""
+        return self.rules_version + sum(p.version for p in self.players)
 
     @property
     def current_player(self) -> Player:
         return self.players[self.current_player_idx]
 
     def next_turn(self, logger: GameLogger):
+        self.rules_version += 1
         self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
         logger.inc_turn()
         self.current_player.reset_turn_flags()
 
     def add_rule(self, card: RuleCard):
         """Добавляет правило в Та-Дам, вытесняя старое"""
-        if len(self.active_rules) == TA_DAM_QUEUE_SIZE:
+        if len(self.active_rules) == self.active_rules.maxlen:
             removed = self.active_rules.popleft()  # Удаляем старое (FIFO)
             # Тут можно добавить логи в будущем
         self.active_rules.append(card)
+        self.rules_version += 1
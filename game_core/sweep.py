@@ -0,0 +1,206 @@
+"""
+Подбор баланса: перебор параметров Ruleset (сеткой или случайно) с прогоном
+ботов по пулу процессов.
+
+Для каждой конфигурации считаются средняя длина матча, преимущество мест
+(разброс винрейта по местам за столом) и сила догоняния — как часто
+побеждает тот, кто отставал в середине матча. Результаты кешируются на диске
+по хешу параметров, поэтому повторный запуск с теми же настройками бесплатный.
+
+Использование:
+    python -m game_core.sweep --grid start_money=5,10,15 shop_price=3,5 --games 500
+    python -m game_core.sweep --random 20 --range start_money=5:20 shop_rocket.value=3:8
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+from typing import Dict, List, Optional
+
+from game_core.config import Ruleset
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+from game_core.simulation import make_bots, run_match
+
+CACHE_DIR = "match_logs/sweep_cache"
+CACHE_VERSION = 1  # Поднять, если поменялась логика движка или ботов
+
+
+class _PositionTrace:
+    """Позиции игроков на начало каждого хода (нужны для оценки догоняния)"""
+
+    def __init__(self, engine: GameEngine):
+        self.engine = engine
+        self.positions: List[tuple] = []
+        engine.logger.add_listener(self.on_event)
+
+    def on_event(self, entry: dict):
+        while len(self.positions) < entry["turn"]:
+            self.positions.append(tuple(p.position for p in self.engine.state.players))
+
+
+def _play(job: Dict) -> List[Dict]:
+    """Матчи одной пачки сидов для одной конфигурации"""
+    ruleset = Ruleset.from_dict(job["ruleset"])
+    results = []
+    for seed in range(job["start"], job["stop"]):
+        engine = GameEngine(GameLogger(echo=False, keep_history=False), player_count=job["player_count"],
+                            seed=seed, ruleset=ruleset)
+        trace = _PositionTrace(engine)
+        run_match(engine, make_bots(seed, job["player_count"]), job["max_turns"])
+
+        turns = engine.logger.current_turn
+        trailing = None
+        if trace.positions:
+            mid = trace.positions[len(trace.positions) // 2]
+            lowest = min(mid)
+            if mid.count(lowest) == 1:
+                trailing = mid.index(lowest)
+        results.append({
+            "turns": turns,
+            "winner": engine.winner.uid if engine.winner else None,
+            "trailing": trailing,
+        })
+    return results
+
+
+def summarize(results: List[Dict], player_count: int) -> Dict:
+    finished = [r for r in results if r["winner"] is not None]
+    seat_wins = [0] * player_count
+    for r in finished:
+        seat_wins[r["winner"]] += 1
+    seat_rates = [w / len(finished) if finished else 0.0 for w in seat_wins]
+
+    comebacks = [r for r in finished if r["trailing"] is not None]
+    catch_up = sum(r["winner"] == r["trailing"] for r in comebacks) / len(comebacks) if comebacks else 0.0
+    return {
+        "games": len(results),
+        "finished": len(finished),
+        "avg_turns": sum(r["turns"] for r in results) / len(results) if results else 0.0,
+        "seat_win_rates": seat_rates,
+        "seat_advantage": max(seat_rates) - min(seat_rates),
+        # Винрейт отстающего в середине матча; 1/player_count — нейтральная игра
+        "catch_up": catch_up,
+    }
+
+
+class BalanceSweep:
+    def __init__(self, games: int = 200, player_count: int = 2, max_turns: int = 300,
+                 base_seed: int = 0, workers: Optional[int] = None, chunk: int = 50,
+                 cache_dir: str = CACHE_DIR):
+        self.games = games
+        self.player_count = player_count
+        self.max_turns = max_turns
+        self.base_seed = base_seed
+        self.workers = workers
+        self.chunk = chunk
+        self.cache_dir = cache_dir
+
+    def _cache_path(self, ruleset: Ruleset) -> str:
+        raw = json.dumps([CACHE_VERSION, ruleset.key(), self.games, self.player_count,
+                          self.max_turns, self.base_seed])
+        return os.path.join(self.cache_dir, hashlib.sha1(raw.encode()).hexdigest()[:20] + ".json")
+
+    def run(self, configs: List[Dict[str, int]]) -> List[Dict]:
+        """Прогоняет все конфигурации, возвращает отчёты в том же порядке"""
+        rulesets = [Ruleset.from_params(params) for params in configs]
+        reports: List[Optional[Dict]] = [None] * len(configs)
+        jobs = []
+        for i, ruleset in enumerate(rulesets):
+            cached = self._load_cached(ruleset)
+            if cached is not None:
+                reports[i] = cached
+                continue
+            for start in range(self.base_seed, self.base_seed + self.games, self.chunk):
+                jobs.append((i, {"ruleset": ruleset.to_dict(), "start": start,
+                                 "stop": min(start + self.chunk, self.base_seed + self.games),
+                                 "player_count": self.player_count, "max_turns": self.max_turns}))
+
+        if jobs:
+            # Все пачки всех конфигураций — в один пул, чтобы процессы не простаивали
+            results: Dict[int, List[Dict]] = {}
+            with multiprocessing.Pool(self.workers) as pool:
+                for i, part in zip((i for i, _ in jobs), pool.imap(_play, [job for _, job in jobs])):
+                    results.setdefault(i, []).extend(part)
+            for i, games in results.items():
+                reports[i] = summarize(games, self.player_count)
+                self._store_cached(rulesets[i], reports[i])
+
+        for params, report in zip(configs, reports):
+            report["params"] = params
+        return reports
+
+    def _load_cached(self, ruleset: Ruleset) -> Optional[Dict]:
+        path = self._cache_path(ruleset)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _store_cached(self, ruleset: Ruleset, report: Dict):
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        with open(self._cache_path(ruleset), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False)
+
+
+def grid_configs(grid: Dict[str, List[int]]) -> List[Dict[str, int]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_configs(ranges: Dict[str, tuple], count: int, seed: int = 0) -> List[Dict[str, int]]:
+    rng = random.Random(seed)
+    return [{name: rng.randint(lo, hi) for name, (lo, hi) in ranges.items()} for _ in range(count)]
+
+
+def _parse_assignments(items: List[str]) -> Dict[str, str]:
+    parsed = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"Ожидалось имя=значение, а не {item}")
+        parsed[name] = value
+    return parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перебор балансовых параметров")
+    parser.add_argument("--grid", nargs="*", default=[], help="param=v1,v2,... (декартово произведение)")
+    parser.add_argument("--range", nargs="*", default=[], help="param=lo:hi для случайного поиска")
+    parser.add_argument("--random", type=int, default=0, help="сколько случайных конфигураций")
+    parser.add_argument("--games", type=int, default=200, help="матчей на конфигурацию")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="сохранить отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    if args.random:
+        ranges = {name: tuple(int(v) for v in spec.split(":"))
+                  for name, spec in _parse_assignments(args.range).items()}
+        configs = random_configs(ranges, args.random, args.seed)
+    else:
+        grid = {name: [int(v) for v in spec.split(",")]
+                for name, spec in _parse_assignments(args.grid).items()}
+        configs = grid_configs(grid) if grid else [{}]
+
+    sweep = BalanceSweep(args.games, args.players, args.max_turns, args.seed, args.workers)
+    reports = sweep.run(configs)
+
+    print(f"{'ходов':>7} {'доиграно':>9} {'перекос мест':>13} {'догонялки':>10}  параметры")
+    for r in sorted(reports, key=lambda r: r["seat_advantage"]):
+        print(f"{r['avg_turns']:7.1f} {r['finished']:5d}/{r['games']:<3d} {r['seat_advantage']:13.1%} "
+              f"{r['catch_up']:10.1%}  {r['params'] or 'по умолчанию'}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,80 @@
+import argparse
 import pygame
 import sys
-from game_core.engine import GameEngine, GameEvent
+from game_core.engine import GameEngine
+from game_core.replay import MatchReplayer
+from game_core.simulation import MatchThread, make_bots
 from ui.view_config import ViewConfig
 from ui.renderer import Renderer
+from ui.asset_loader import AssetLoader, draw_loading_screen
 from game_core.logger import GameLogger
 from ui.components import Dialog, SliderDialog
+from ui.dirty import DirtyTracker
+from ui.fonts import get_font
+from ui.input_record import InputPlayback, InputRecorder, LiveInput
+from ui.overlays import dim_overlay
+from ui.profiler import FrameProfiler
+from ui.sprite_cache import sprite_cache
 
 
 WINDOW_SIZE = 1000
+DEFAULT_FPS = 60
+SPECTATOR_SPEEDS = (1, 2, 5, 10, 25, 50, 100, 250, 1000, None)  # Шагов движка в секунду; None — без ограничения
 
 
-def main():
+def init_window(caption: str):
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_SIZE + 300, WINDOW_SIZE))  # +300 для панели инфо
-    pygame.display.set_caption("Cutthroat Race: Game Mode")
+    pygame.display.set_caption(caption)
+
+    view_cfg = ViewConfig("ui/coords.json", target_size=WINDOW_SIZE)
+    load_assets(screen)
+    # Уменьшенное поле берётся из дискового кеша; convert() внутри ускоряет отрисовку
+    board_img = sprite_cache.load_scaled("assets/field_corrected.png", (WINDOW_SIZE, WINDOW_SIZE), alpha=False)
+    return screen, view_cfg, board_img
+
+
+def load_assets(screen: pygame.Surface):
+    """Картинки грузятся в фоновых потоках, окно в это время показывает прогресс"""
+    loader = AssetLoader(sprite_cache)
+    loader.submit("assets/field_corrected.png", (WINDOW_SIZE, WINDOW_SIZE), alpha=False)
+    for path, size, alpha in Renderer.sprite_requests():
+        loader.submit(path, size, alpha)
+
     clock = pygame.time.Clock()
+    try:
+        while not loader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+            loader.poll()
+            draw_loading_screen(screen, loader.progress)
+            pygame.display.flip()
+            clock.tick(30)
+    finally:
+        loader.shutdown()
+
+
+def main(seed: int = None, profile: bool = False, dirty_rects: bool = True,
+         fps: int = DEFAULT_FPS, idle_wait: bool = True,
+         record_input: str = None, playback: InputPlayback = None):
+    """
+    Игра за одним компьютером. record_input - файл для записи ввода;
+    playback - записанный ввод вместо настоящего (тогда main возвращает движок).
+    """
+    screen, view_cfg, board_img = init_window("Cutthroat Race: Game Mode")
+    clock = pygame.time.Clock()
+    # F3 - оверлей с временем стадий кадра; --profile - ещё и запись в CSV
+    profiler = FrameProfiler(log_path=FrameProfiler.default_log_path() if profile else None)
+    # Перерисовываем только изменившиеся области; без трекера - весь экран каждый кадр
+    dirty = DirtyTracker(screen.get_size()) if dirty_rects else None
+    # Простой: пока нет ввода и перерисовывать нечего, спим в event.wait (нужен учёт областей)
+    idle_wait = idle_wait and dirty is not None
+    quiet_frames = 0
     start_ticks = pygame.time.get_ticks()
 
-    logger = GameLogger()
+    logger = GameLogger(echo=playback is None)
     turn_count = 1
 
     active_dialog = None
@@ -38,16 +95,21 @@ def main():
     mine_placement_mode = False
     mine_placement_player = None
 
-    view_cfg = ViewConfig("ui/coords.json", target_size=WINDOW_SIZE)
-    raw_board = pygame.image.load("assets/field_corrected.png").convert()  # convert() ускоряет отрисовку
-    board_img = pygame.transform.smoothscale(raw_board, (WINDOW_SIZE, WINDOW_SIZE))
-
-    engine = GameEngine(logger, player_count=2) # Передаём logger
+    engine = GameEngine(logger, player_count=2, seed=seed) # Передаём logger
     renderer = Renderer(screen, view_cfg, board_img)
+    if playback:
+        input_source = playback
+    elif record_input:
+        input_source = InputRecorder(record_input, engine.seed, dirty_rects)
+    else:
+        input_source = LiveInput()
 
     running = True
     while running:
-        mouse_pos = pygame.mouse.get_pos()
+        if playback and playback.finished:
+            break
+        profiler.begin_frame()
+        mouse_pos = input_source.next_frame()
         elapsed_seconds = (pygame.time.get_ticks() - start_ticks) // 1000
         p = engine.state.current_player
 
@@ -83,7 +145,7 @@ def main():
                     opts.append(f"Сбросить 5 монет (+1 к броску)")
                 if event_player.coins >= 10:
                     opts.append(f"Сбросить 10 монет (+2 к броску)")
-                active_dialog = Dialog(f"{event_player.name}: Финиш-сейф! Нужно 6+", opts)
+                active_dialog = Dialog(f"{event_player.name}: Финиш-сейф! Нужно {engine.ruleset.winning_roll}+", opts)
             elif game_event.type == "RED_CHOICE":
                 active_dialog = Dialog(f"{event_player.name}: Красная западня",
                                        ["Потерять 3 монеты", "Назад на 3 клетки"])
@@ -108,7 +170,7 @@ def main():
                     active_dialog = Dialog(f"Смерч: {event_player.name}", ["Откупиться (10 монет)", "Лететь к Смерчу!"])
                 else:
                     engine.resolve_tornado_choice(event_player, 1, game_event.data["target_pos"])
-                    engine.pending_events.pop(0)
+                    engine.pop_event()
             elif game_event.type == "CHOOSE_TARGET":
                 options = [f"{opp.name}" for opp in game_event.data["opponents"]]
                 active_dialog = Dialog(f"{event_player}: Выбери цель", options)
@@ -118,14 +180,14 @@ def main():
             elif game_event.type == "MINE_PLACEMENT":
                 mine_placement_mode = True
                 mine_placement_player = event_player
-                engine.pending_events.pop(0)  # сразу снимаем — режим управляется флагом
+                engine.pop_event()  # сразу снимаем — режим управляется флагом
             elif game_event.type == "INVENTORY_KEEP":
                 pending_shop_cards = game_event.data["cards"]
             elif game_event.type == "TAX_SHOP_CARD":
                 card_idx = game_event.data["card_idx"]
                 cost = game_event.data["cost"]
                 if card_idx >= len(event_player.hand):
-                    engine.pending_events.pop(0)  # Все карты обработаны
+                    engine.pop_event()  # Все карты обработаны
                 else:
                     card = event_player.hand[card_idx]
                     active_dialog = Dialog(
@@ -146,22 +208,27 @@ def main():
             if not p.end_checks_done:
                 if not engine.can_player_do_actions(p):
                     engine.end_turn_checks(p)
-                    p.end_checks_done = True
                     if engine.pending_events: continue
             if p.end_checks_done and not engine.pending_events:
-                if p.has_extra_turn:
-                    p.has_extra_turn = False
-                    p.reset_turn_flags()
-                    logger.log_event(p.uid, "EXTRA_TURN_START", {"reason": "double_roll"})
-                else:
-                    engine.state.next_turn(logger)
+                engine.advance_turn(p)
+
+        profiler.lap("events")
 
         # 2. Обработка ввода
-        for event in pygame.event.get():
+        had_input = False
+        for event in input_source.get_events():
+            had_input = True
             if event.type == pygame.QUIT:
-                logger.save()
+                if not playback:
+                    logger.save()
                 running = False
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                continue
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED) and dirty:
+                dirty.invalidate()
+
             if active_slider:
                 result = active_slider.handle_event(event, mouse_pos)
                 if result:
@@ -175,11 +242,11 @@ def main():
                             "target_self": current_ev.data.get("target_self", True)
                         }
                         engine.resolve_slider_input(current_ev.player, value, effect_data)
-                        engine.pending_events.pop(0)
+                        engine.pop_event()
                     elif action == "cancel":
                         # Просто закрываем
-                        engine.pending_events.pop(0)
-                        logger.log_event(current_ev.player.uid, "SLIDER_CANCELLED", {})
+                        engine.pop_event()
+                        engine.cancel_slider_input(current_ev.player)
 
                     active_slider = None
                 continue
@@ -191,7 +258,7 @@ def main():
                     # Если pending_tadam_rule есть - это новое правило, нужен resolve
                     if pending_tadam_rule:
                         engine.resolve_tadam_choice(pending_tadam_rule)
-                        engine.pending_events.pop(0)
+                        engine.pop_event()
                         pending_tadam_rule = None
                     # Если None - просто смотрели активное правило
                     viewing_card_sprite_id = None
@@ -216,10 +283,10 @@ def main():
                                     # Если нажат «Пропустить» — оставляем первую карту
                                     actual_keep_idx = choice_idx if choice_idx < len(pending_shop_cards) else 0
                                     engine.resolve_inventory_keep(current_ev.player, actual_keep_idx)
-                                    engine.pending_events.pop(0)
+                                    engine.pop_event()
                                     pending_selection_rects = []
                                     break
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                                 pending_selection_rects = []
                                 break
                         continue
@@ -236,10 +303,8 @@ def main():
                     # Клик по клетке на доске
                     if mouse_pos[0] < WINDOW_SIZE and mine_placement_player.coins > 0:
                         cell_id = view_cfg.get_cell_under_mouse(mouse_pos, radius=35)
-                        if cell_id != -1 and cell_id not in engine.placed_mines:
-                            mine_placement_player.pay(1)
-                            engine.placed_mines[cell_id] = mine_placement_player.uid
-                            logger.log_event(mine_placement_player.uid, "MINE_PLACED", {"cell": cell_id})
+                        if cell_id != -1:
+                            engine.place_mine(mine_placement_player, cell_id)
                 continue  # не обрабатываем другие клики в этом режиме
             if mine_placement_mode and mine_placement_player and mine_placement_player.coins <= 0:
                 mine_placement_mode = False
@@ -263,12 +328,12 @@ def main():
                                 game_event = engine.pending_events[0]
                                 engine.resolve_event_card(game_event.player, pending_event_card, pending_event_is_good)
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "противника" in title:  # Схватка
                                 game_event = engine.pending_events[0]
                                 engine.resolve_duel_opponent(p, game_event.data["opponents"][i])
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Победа!" in title:  # Награда за победу в Схватке
                                 game_event = engine.pending_events[0]
                                 reward_types = ["money", "push"]
@@ -276,74 +341,49 @@ def main():
                                     reward_types.append("steal_card")
                                 engine.resolve_duel_reward_choice(game_event.player, duel_defender, reward_types[i])
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Финиш-сейф" in title:
                                 bonus_map = {0: 0, 1: 5, 2: 10}
                                 coin_bonus = bonus_map.get(i, 0)
                                 roll, bonus, total, success = engine.attempt_finish(
                                     game_event.player, coin_bonus
                                 )
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                                 result_text = f"Выпало {roll}" + (f"+{bonus}" if bonus else "") + f" = {total}"
                                 if success:
                                     result_text += " — ПОБЕДА!"
                                 else:
-                                    result_text += " — Не хватило... (нужно 6+)"
+                                    result_text += f" — Не хватило... (нужно {engine.ruleset.winning_roll}+)"
                                 active_dialog = Dialog(result_text, ["ОК"])
                                 pending_finish_result = (roll, bonus, total, success)
                             elif "западня" in title:
                                 game_event = engine.pending_events[0]
-                                target_player = game_event.player
-                                if i == 0:
-                                    target_player.pay(3)
-                                else:
-                                    engine.move_player(target_player, 3, is_forward=False)
+                                engine.resolve_red_choice(game_event.player, i)
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Смерч" in title:
                                 engine.resolve_tornado_choice(game_event.player, i, pending_tornado_target)
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Выбери цель" in title:
                                 target_uid = game_event.data["opponents"][i].uid
                                 engine.resolve_target_choice(p, target_uid, game_event.data["effect_id"],
                                                              game_event.data["value"])
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Сбрось карту" in title:
                                 engine.resolve_discard_enemy_card(p, game_event.data["target"], i)
                                 active_dialog = None
-                                engine.pending_events.pop(0)
+                                engine.pop_event()
                             elif "Налог" in title:
                                 game_event = engine.pending_events[0]
-                                card_idx = game_event.data["card_idx"]
-                                cost = game_event.data["cost"]
-                                if i == 0:  # Заплатить
-                                    if not game_event.player.pay(cost):
-                                        # Не хватает монет — принудительный сброс
-                                        removed = game_event.player.remove_card(card_idx)
-                                        engine.state.deck_shop.discard(removed)
-                                    else:
-                                        card_idx += 1  # Карта осталась, переходим к следующей
-                                else:  # Сбросить
-                                    removed = game_event.player.remove_card(card_idx)
-                                    engine.state.deck_shop.discard(removed)
-                                    # card_idx не меняем — после remove следующая карта сдвинулась на это место
-                                # Проверяем, есть ли ещё карты
-                                if card_idx < len(game_event.player.hand):
-                                    game_event.data["card_idx"] = card_idx  # Обновляем индекс на месте
-                                else:
-                                    engine.pending_events.pop(0)
+                                # 0 - заплатить, 1 - сбросить карту
+                                engine.resolve_tax_choice(game_event.player, pay=(i == 0))
                                 active_dialog = None
                             elif "Выбери цель для" in title:
                                 opponents = [opp for opp in engine.state.players if opp.uid != p.uid]
                                 target = opponents[i]
-                                if engine.use_card_from_hand(p_idx, pending_card_use_idx, target_idx=target.uid):
-                                    logger.log_event(p.uid, "CARD_USE", {
-                                        "card": p.hand[pending_card_use_idx].name if pending_card_use_idx < len(
-                                            p.hand) else "?",
-                                        "target": target.name
-                                    })
+                                engine.use_card_from_hand(p_idx, pending_card_use_idx, target_idx=target.uid)
                                 pending_card_use_idx = None
                                 active_dialog = None
                 continue
@@ -352,10 +392,7 @@ def main():
                 if not engine.pending_events and not p.has_moved and p.turn_checks_done:
                     # Игрок застрял на финише — бросает только на сейф
                     if p.is_finished:
-                        engine.pending_events.append(GameEvent(
-                            type="FINISH_ROLL", player=p, data={}
-                        ))
-                        p.has_moved = True
+                        engine.request_finish_roll(p)
                     else:
                         rolls = engine.get_roll(p)
                         options = engine.get_move_options(p, rolls)
@@ -373,13 +410,8 @@ def main():
                     if btn_rect.collidepoint(mouse_pos):
                         if not p.end_checks_done:
                             engine.end_turn_checks(p)
-                            p.end_checks_done = True
                         if not engine.pending_events:
-                            if p.has_extra_turn:
-                                p.has_extra_turn = False
-                                p.reset_turn_flags()
-                            else:
-                                engine.state.next_turn(logger)
+                            engine.advance_turn(p)
                         continue
 
                 if mouse_pos[0] > WINDOW_SIZE:
@@ -392,8 +424,7 @@ def main():
                                 break
                             opponents = [opp for opp in engine.state.players if opp.uid != p.uid]
                             if len(opponents) == 1:
-                                if engine.use_card_from_hand(p_idx, j, target_idx=opponents[0].uid):
-                                    logger.log_event(p.uid, "CARD_USE", {"card": card.name})
+                                engine.use_card_from_hand(p_idx, j, target_idx=opponents[0].uid)
                             else:
                                 pending_card_use_idx = j
                                 active_dialog = Dialog(f"Выбери цель для «{card.name}»",
@@ -412,63 +443,279 @@ def main():
                             pending_tadam_rule = None
                             break
 
-        # Отрисовка
-        screen.fill((30, 30, 30))
-        renderer.draw_board()
-        renderer.draw_active_rules(engine.state.active_rules)
-        renderer.draw_mines(engine.placed_mines)
-        renderer.draw_players(engine.state)
-
-        if viewing_card_sprite_id:
-            renderer.draw_large_rule_card(viewing_card_sprite_id, mouse_pos)
-        elif engine.pending_events and engine.pending_events[0].type in ["SHOP", "SHOP_FREE", "CHOOSE_CARD_TO_DISCARD", "INVENTORY_KEEP"]:
-            ev = engine.pending_events[0]
-            titles = {
-                "SHOP": "Лавка Джо: выбери карту (5 монет)",
-                "SHOP_FREE": "Бесплатная карта Лавки Джо",
-                "CHOOSE_CARD_TO_DISCARD": f"Сбрось карту у {ev.data.get('target', '')}",
-                "INVENTORY_KEEP": f"Инвентаризация: {ev.player.name} — выбери карту, которую оставишь",
-            }
-            pending_selection_rects = renderer.draw_card_selector(
-                ev.data["cards"], titles.get(ev.type, ""), mouse_pos,
-                show_skip=(ev.type != "SHOP_FREE")
-            )
-        else:
-            renderer.draw_hover(mouse_pos)
-            if active_slider: active_slider.draw(screen, mouse_pos)
-            elif active_dialog: active_dialog.draw(screen)
+        profiler.lap("input")
 
+        # Отрисовка: только из снимка, собранного после обработки ввода
+        snapshot = engine.publish_snapshot()
         can_act = engine.can_player_do_actions(p) if p.has_moved else False
         has_pending = bool(engine.pending_events or active_dialog or active_slider or viewing_card_sprite_id or mine_placement_mode)
-        _end_btn, sidebar_card_rects = renderer.draw_sidebar(
-            engine.state, turn_count, elapsed_seconds, can_act, has_pending
-        )
+        selector_event = None
+        if engine.pending_events and engine.pending_events[0].type in ["SHOP", "SHOP_FREE", "CHOOSE_CARD_TO_DISCARD", "INVENTORY_KEEP"]:
+            selector_event = engine.pending_events[0]
+
+        if dirty:
+            # Окна затемняют весь экран: пока окно открыто, любое движение мыши - полная перерисовка
+            modal = viewing_card_sprite_id or selector_event or active_dialog or active_slider
+            dirty.watch("modal", (viewing_card_sprite_id, selector_event, active_dialog, active_slider,
+                                  mouse_pos if modal else None))
+            dirty.watch_items("board", renderer.board_items(snapshot, snapshot.placed_mines, mouse_pos))
+            dirty.watch("sidebar", (turn_count, elapsed_seconds, renderer.sidebar_key(snapshot), p.has_moved,
+                                    can_act, has_pending, mine_placement_mode,
+                                    mine_placement_player.coins if mine_placement_player else None,
+                                    mouse_pos if mine_placement_mode else None), renderer.sidebar_rect)
+            dirty.watch("profiler", profiler.show_overlay)
+            if profiler.show_overlay:
+                dirty.mark(profiler.panel_rect)
+            redraw_rects = dirty.collect()
+        else:
+            redraw_rects = [screen.get_rect()]
+        profiler.lap("dirty_rects")
 
-        if mine_placement_mode and mine_placement_player:
-            renderer.draw_mine_placement_button(mine_placement_player.coins, mouse_pos)
+        for clip_rect in redraw_rects:
+            screen.set_clip(clip_rect)
+            screen.fill((30, 30, 30))
+            renderer.draw_background(snapshot.active_rules, snapshot.placed_mines)
+            profiler.lap("draw_background")
+            renderer.draw_players(snapshot)
+            profiler.lap("draw_players")
 
-        pygame.display.flip()
+            if viewing_card_sprite_id:
+                renderer.draw_large_rule_card(viewing_card_sprite_id, mouse_pos)
+                profiler.lap("dialogs")
+            elif selector_event:
+                ev = selector_event
+                titles = {
+                    "SHOP": f"Лавка Джо: выбери карту ({engine.ruleset.shop_price} монет)",
+                    "SHOP_FREE": "Бесплатная карта Лавки Джо",
+                    "CHOOSE_CARD_TO_DISCARD": f"Сбрось карту у {ev.data.get('target', '')}",
+                    "INVENTORY_KEEP": f"Инвентаризация: {ev.player.name} — выбери карту, которую оставишь",
+                }
+                pending_selection_rects = renderer.draw_card_selector(
+                    ev.data["cards"], titles.get(ev.type, ""), mouse_pos,
+                    show_skip=(ev.type != "SHOP_FREE")
+                )
+                profiler.lap("draw_card_selector")
+            else:
+                renderer.draw_hover(mouse_pos)
+                profiler.lap("draw_hover")
+                if active_slider: active_slider.draw(screen, mouse_pos)
+                elif active_dialog: active_dialog.draw(screen)
+                profiler.lap("dialogs")
+
+            _end_btn, sidebar_card_rects = renderer.draw_sidebar(
+                snapshot, turn_count, elapsed_seconds, can_act, has_pending
+            )
+            profiler.lap("draw_sidebar")
+
+            if mine_placement_mode and mine_placement_player:
+                renderer.draw_mine_placement_button(mine_placement_player.coins, mouse_pos)
+                profiler.lap("dialogs")
+
+            profiler.draw_overlay(screen)
+            profiler.lap("overlay")
+        screen.set_clip(None)
+
+        if redraw_rects:
+            if redraw_rects[0] == screen.get_rect():
+                pygame.display.flip()
+            else:
+                pygame.display.update(redraw_rects)
+        profiler.lap("flip")
 
         if engine.is_game_over and engine.winner:
-            overlay = pygame.Surface((WINDOW_SIZE + 300, WINDOW_SIZE), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-            font_big = pygame.font.SysFont("Arial", 64, bold=True)
+            if not playback:
+                logger.save()
+            screen.blit(dim_overlay(screen.get_size(), 160), (0, 0))
+            font_big = get_font(64, bold=True)
             win_txt = font_big.render(f"{engine.winner.name} ПОБЕДИЛ!", True, (255, 215, 0))
             screen.blit(win_txt, (
                 (WINDOW_SIZE + 300) // 2 - win_txt.get_width() // 2,
                 WINDOW_SIZE // 2 - win_txt.get_height() // 2
             ))
             pygame.display.flip()
-            pygame.time.wait(3000)
+            if not playback:
+                pygame.time.wait(3000)
             running = False
             continue
 
+        # Два тихих кадра подряд (без ввода и без перерисовки) - игра ждёт игрока.
+        # Спим до события или до смены секунды на часах в панели.
+        quiet_frames = quiet_frames + 1 if not had_input and not redraw_rects else 0
+        if idle_wait and quiet_frames >= 2:
+            to_next_second = 1000 - (pygame.time.get_ticks() - start_ticks) % 1000
+            event = pygame.event.wait(to_next_second)
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)  # Разберёт обычный цикл ввода
+        clock.tick(fps)
+        profiler.lap("tick")
+
+    if isinstance(input_source, InputRecorder):
+        input_source.save(engine)
+    profiler.close()
+    pygame.quit()
+    if playback:
+        return engine
+    sys.exit()
+
+
+def run_replay(log_path: str):
+    """
+    Просмотр записанного матча.
+    Пробел - пуск/пауза, → - шаг, ← - предыдущий ход, ↑/↓ - ±10 ходов,
+    Home/End - начало/конец, клик по полосе - перемотка.
+    """
+    screen, view_cfg, board_img = init_window(f"Cutthroat Race: Replay — {log_path}")
+    clock = pygame.time.Clock()
+    renderer = Renderer(screen, view_cfg, board_img)
+    replayer = MatchReplayer.from_file(log_path)
+
+    playing = False
+    step_delay_ms = 150  # Пауза между командами при воспроизведении
+    last_step = pygame.time.get_ticks()
+    bar_rect = None
+
+    running = True
+    while running:
+        mouse_pos = pygame.mouse.get_pos()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    replayer.step()
+                elif event.key == pygame.K_LEFT:
+                    replayer.seek(replayer.turn - 1)
+                elif event.key == pygame.K_UP:
+                    replayer.seek(replayer.turn + 10)
+                elif event.key == pygame.K_DOWN:
+                    replayer.seek(max(1, replayer.turn - 10))
+                elif event.key == pygame.K_HOME:
+                    replayer.seek(1)
+                elif event.key == pygame.K_END:
+                    replayer.run_to_end()
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if bar_rect and bar_rect.collidepoint(mouse_pos):
+                    ratio = (mouse_pos[0] - bar_rect.x) / bar_rect.w
+                    replayer.seek(1 + round(ratio * (replayer.last_turn - 1)))
+
+        now = pygame.time.get_ticks()
+        if playing and now - last_step >= step_delay_ms:
+            last_step = now
+            if replayer.step() is None:
+                playing = False
+
+        snapshot = replayer.engine.publish_snapshot()
+        screen.fill((30, 30, 30))
+        renderer.draw_background(snapshot.active_rules, snapshot.placed_mines)
+        renderer.draw_players(snapshot)
+        renderer.draw_sidebar(snapshot, replayer.turn, 0)
+        bar_rect = renderer.draw_replay_bar(replayer.turn, replayer.last_turn, playing)
+        pygame.display.flip()
         clock.tick(60)
 
     pygame.quit()
-    sys.exit()
+
+
+def run_spectator(player_count: int = 2, seed: int = None, render_every: int = None, render_fps: int = 30):
+    """
+    Матч ботов на всех местах. Движок играет в своём потоке, окно раз в кадр
+    берёт последнее состояние: с частотой render_fps или не чаще чем раз
+    в render_every шагов движка. Окон выбора нет - решения принимают боты.
+    Пробел - пауза, ↑/↓ - быстрее/медленнее, клик по полосе - скорость.
+    """
+    screen, view_cfg, board_img = init_window("Cutthroat Race: Bots")
+    clock = pygame.time.Clock()
+    renderer = Renderer(screen, view_cfg, board_img)
+    engine = GameEngine(GameLogger(echo=False), player_count=player_count, seed=seed)
+    match = MatchThread(engine, make_bots(engine.seed, player_count))
+    speed_idx = len(SPECTATOR_SPEEDS) - 1
+    match.start()
+
+    start_ticks = pygame.time.get_ticks()
+    rendered_steps = 0
+    bar_rect = None
+    log_saved = False
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    if match.paused:
+                        match.resume()
+                    else:
+                        match.pause()
+                elif event.key == pygame.K_UP:
+                    speed_idx = min(len(SPECTATOR_SPEEDS) - 1, speed_idx + 1)
+                elif event.key == pygame.K_DOWN:
+                    speed_idx = max(0, speed_idx - 1)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if bar_rect and bar_rect.inflate(0, 20).collidepoint(event.pos):
+                    ratio = (event.pos[0] - bar_rect.x) / bar_rect.w
+                    speed_idx = max(0, min(len(SPECTATOR_SPEEDS) - 1, round(ratio * (len(SPECTATOR_SPEEDS) - 1))))
+        match.steps_per_second = SPECTATOR_SPEEDS[speed_idx]
+
+        if render_every and not match.paused:
+            match.wait_steps(rendered_steps + render_every, timeout=0.25)
+
+        # Поток движка подменяет снимок целиком: кадр никогда не увидит полшага
+        rendered_steps = match.steps
+        finished = match.finished
+        snapshot = engine.snapshot
+        screen.fill((30, 30, 30))
+        renderer.draw_background(snapshot.active_rules, snapshot.placed_mines)
+        renderer.draw_players(snapshot)
+        renderer.draw_sidebar(snapshot, snapshot.turn, (pygame.time.get_ticks() - start_ticks) // 1000)
+
+        speed = SPECTATOR_SPEEDS[speed_idx]
+        state_txt = "❚❚" if match.paused else "▶"
+        bar_rect = renderer.draw_speed_bar(
+            speed_idx / (len(SPECTATOR_SPEEDS) - 1),
+            f"{state_txt}  Скорость: {f'{speed} шаг/с' if speed else 'максимум'}   шагов: {rendered_steps}"
+        )
+        if finished:
+            if not log_saved:
+                engine.logger.save()
+                log_saved = True
+            title = (f"{snapshot.players[snapshot.winner_uid].name} ПОБЕДИЛ!" if snapshot.winner_uid is not None
+                     else "Матч остановлен по лимиту ходов")
+            screen.blit(dim_overlay(screen.get_size(), 160), (0, 0))
+            win_txt = get_font(64, bold=True).render(title, True, (255, 215, 0))
+            screen.blit(win_txt, (
+                (WINDOW_SIZE + 300) // 2 - win_txt.get_width() // 2,
+                WINDOW_SIZE // 2 - win_txt.get_height() // 2
+            ))
+        pygame.display.flip()
+        clock.tick(render_fps)
+
+    match.stop()
+    pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Cutthroat Race")
+    parser.add_argument("--seed", type=int, help="сид ГСЧ матча")
+    parser.add_argument("--replay", metavar="LOG", help="просмотр записанного матча")
+    parser.add_argument("--bots", type=int, metavar="N", help="смотреть матч N ботов")
+    parser.add_argument("--render-every", type=int, metavar="STEPS", help="(--bots) кадр не чаще раза в STEPS шагов")
+    parser.add_argument("--render-fps", type=int, default=30, help="(--bots) кадров в секунду")
+    parser.add_argument("--profile", action="store_true", help="писать время стадий каждого кадра в CSV")
+    parser.add_argument("--full-redraw", action="store_true", help="перерисовывать весь экран каждый кадр")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS, help="ограничение кадров в секунду")
+    parser.add_argument("--no-idle-wait", action="store_true", help="не засыпать, пока игра ждёт ввода")
+    parser.add_argument("--record-input", nargs="?", const=InputRecorder.default_path(), metavar="FILE",
+                        help="записать ввод для benchmarks/ui_replay.py")
+    args = parser.parse_args()
+    if args.replay:
+        run_replay(args.replay)
+    elif args.bots:
+        run_spectator(args.bots, seed=args.seed, render_every=args.render_every, render_fps=args.render_fps)
+    else:
+        main(seed=args.seed, profile=args.profile, dirty_rects=not args.full_redraw,
+             fps=args.fps, idle_wait=not args.no_idle_wait, record_input=args.record_input)
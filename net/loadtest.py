@@ -0,0 +1,157 @@
+"""
+Нагрузочный клиент для net/server.py.
+
+Поднимает N игроков-ботов (RandomBot), каждый на своём соединении: игрок
+встаёт в очередь на партию, отвечает на запросы решений и после конца партии
+встаёт в очередь снова, пока не сыграет --matches партий. Задержка решения —
+от отправки ответа до снимка партии, который сервер присылает после его
+применения; в отчёт идут её перцентили и число решений в секунду.
+
+--idle K добавляет K игроков, которые встают в партии и молчат: их партии
+висят в ожидании до таймаута хода — так видно, сколько памяти занимают
+простаивающие партии. --local запускает сервер в этом же процессе.
+
+Использование:
+    python -m net.loadtest --players 200 --size 2 --matches 3
+    python -m net.loadtest --local --players 100 --idle 2000 --think-ms 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import time
+from typing import List
+
+from game_core.simulation import Decision, RandomBot
+from net.server import DEFAULT_PORT, MatchServer
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.matches = 0
+        self.errors = 0
+        self.disconnects = 0
+
+    def percentiles(self, qs=(50, 95, 99)) -> List[float]:
+        values = sorted(self.latencies_ms)
+        if not values:
+            return [0.0 for _ in qs]
+        return [values[min(len(values) - 1, int(len(values) * q / 100))] for q in qs]
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def bot_player(host: str, port: int, size: int, matches: int, think_ms: float,
+                     rng: random.Random, stats: LoadStats):
+    reader, writer = await asyncio.open_connection(host, port)
+    bot = RandomBot(rng)
+    sent_at = {}  # id партии -> когда отправили ответ
+    played = 0
+    try:
+        await _send(writer, {"op": "join", "size": size})
+        while played < matches:
+            line = await reader.readline()
+            if not line:
+                stats.disconnects += 1
+                break
+            message = json.loads(line)
+            op = message["op"]
+            match_id = message.get("match")
+            if match_id in sent_at and op in ("state", "end"):
+                stats.latencies_ms.append((time.perf_counter() - sent_at.pop(match_id)) * 1000)
+
+            if op == "decision":
+                if think_ms:
+                    await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+                choice = bot.choose(Decision(message["kind"], None, message["options"]))
+                sent_at[match_id] = time.perf_counter()
+                await _send(writer, {"op": "decide", "match": match_id, "id": message["id"], "choice": choice})
+            elif op == "end":
+                played += 1
+                stats.matches += 1
+                if played < matches:
+                    await _send(writer, {"op": "join", "size": size})
+            elif op == "error":
+                stats.errors += 1
+    finally:
+        writer.close()
+
+
+async def idle_player(host: str, port: int, size: int, joined: asyncio.Queue, stop: asyncio.Event):
+    """Встаёт в партию и молчит; входящие сообщения только вычитывает"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await _send(writer, {"op": "join", "size": size})
+        await reader.readline()
+        joined.put_nowait(True)
+        while not stop.is_set():
+            try:
+                if not await asyncio.wait_for(reader.readline(), 0.5):
+                    break
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        writer.close()
+
+
+async def run(args) -> LoadStats:
+    server = tcp = None
+    if args.local:
+        server = MatchServer(args.turn_timeout)
+        tcp = await asyncio.start_server(server.handle_client, args.host, args.port, backlog=4096)
+
+    stats = LoadStats()
+    stop = asyncio.Event()
+    # Молчуны занимают партии целиком и до прихода ботов: иначе бот попадёт в партию к молчуну
+    idle_count = -(-args.idle // args.size) * args.size
+    joined = asyncio.Queue()
+    idle = [asyncio.create_task(idle_player(args.host, args.port, args.size, joined, stop))
+            for _ in range(idle_count)]
+    for _ in range(idle_count):
+        await joined.get()
+    if idle_count:
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Простаивают {idle_count // args.size} партий"
+              + (f"; {server.stats()}; память процесса (пик) {rss_mb:.0f} МБ" if server else ""))
+
+    started = time.perf_counter()
+    rng = random.Random(args.seed)
+    await asyncio.gather(*(
+        bot_player(args.host, args.port, args.size, args.matches, args.think_ms, random.Random(rng.random()), stats)
+        for _ in range(args.players)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*idle, return_exceptions=True)
+
+    p50, p95, p99 = stats.percentiles()
+    decisions = len(stats.latencies_ms)
+    print(f"{args.players} игроков, {stats.matches // args.size} партий сыграно, {decisions} решений за {elapsed:.1f} с "
+          f"({decisions / elapsed if elapsed else 0:.0f} решений/с), ошибок {stats.errors}, обрывов {stats.disconnects}")
+    print(f"  задержка решения, мс: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  "
+          f"макс {max(stats.latencies_ms, default=0):.2f}")
+    if server:
+        print(f"  сервер: {server.stats()}")
+        tcp.close()
+        await tcp.wait_closed()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервера матчей")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=100, help="активных игроков-ботов")
+    parser.add_argument("--size", type=int, default=2, help="игроков в партии")
+    parser.add_argument("--matches", type=int, default=1, help="партий на игрока")
+    parser.add_argument("--think-ms", type=float, default=0, help="среднее время раздумья бота")
+    parser.add_argument("--idle", type=int, default=0, help="игроков, которые встают в партию и молчат")
+    parser.add_argument("--local", action="store_true", help="запустить сервер в этом же процессе")
+    parser.add_argument("--turn-timeout", type=float, default=30.0, help="(--local) таймаут хода")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,339 @@
+"""
+Сервер сетевых матчей: много партий в одном процессе на asyncio.
+
+Протокол — JSON по строке на сообщение поверх TCP.
+Клиент -> сервер:
+    {"op": "join", "size": 2}                              — место в ближайшей партии на size игроков
+    {"op": "decide", "match": 7, "id": 12, "choice": 0}    — ответ на запрос решения id
+Сервер -> клиент:
+    {"op": "joined", "match": 7, "seat": 1, "size": 2}
+    {"op": "state", "match": 7, "turn": ..., ...}          — снимок партии (game_core/snapshot.py)
+    {"op": "decision", "match": 7, "id": 12, "seat": 1, "kind": "TURN", "options": [...]}
+    {"op": "end", "match": 7, "winner": 1}
+    {"op": "error", "msg": "..."}
+
+Партия — GameEngine, который ведёт MatchDriver (тот же порядок хода, что у
+ботов в game_core/simulation.py): решение нужного игрока запрашивается у его
+клиента. Ответа нет за turn_timeout секунд — сервер выбирает вариант 0 (он
+всегда допустим: бросок, пропуск, первая карта). Ушедший игрок дальше
+отвечает вариантом 0 сразу; ушли все — партия закрывается.
+
+У ждущей партии нет своей задачи asyncio: только объекты движка и таймер
+loop.call_later, поэтому тысячи партий в ожидании почти ничего не стоят.
+Поле (Board) не меняется и общее для всех партий, логи матчей не копятся.
+
+Исходящие сообщения соединения копятся в очереди, а одна задача-писатель
+отправляет их пачкой и ждёт drain(). Пока медленный клиент не дочитал, новые
+снимки одной партии заменяют друг друга — в сеть уходит только последний.
+Запросы решений не теряются; очередь выросла больше MAX_PENDING — клиент
+не успевает читать, соединение закрывается.
+
+Использование:
+    python -m net.server --port 8765 --turn-timeout 30
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+from game_core.board import Board
+from game_core.engine import GameEngine
+from game_core.logger import GameLogger
+from game_core.simulation import Decision, MatchDriver
+from game_core.state import Player
+
+DEFAULT_PORT = 8765
+DEFAULT_TURN_TIMEOUT = 30.0
+MAX_PENDING = 1000  # Сообщений в очереди соединения, после которых клиент считается зависшим
+MATCH_SIZES = (2, 3, 4)
+
+
+def option_label(option) -> str:
+    """Вариант решения для клиента: игроки и карты — по имени"""
+    if option is None:
+        return "-"
+    if isinstance(option, Player):
+        return option.name
+    if hasattr(option, "name"):
+        return option.name
+    return str(option)
+
+
+def snapshot_message(match_id: int, snapshot) -> dict:
+    return {
+        "op": "state", "match": match_id, "turn": snapshot.turn, "current": snapshot.current_player_idx,
+        "players": [[p.position, p.coins, p.is_finished, [c.uid for c in p.hand]] for p in snapshot.players],
+        "rules": [rule.uid for rule in snapshot.active_rules],
+        "mines": list(snapshot.placed_mines),
+    }
+
+
+class Connection:
+    """Соединение клиента; может занимать места в нескольких партиях"""
+    __slots__ = ("writer", "seats", "closed", "_pending", "_states", "_wakeup")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.seats: Dict[int, int] = {}  # id партии -> место
+        self.closed = False
+        self._pending: List[dict] = []
+        self._states: Dict[int, dict] = {}  # Последний неотправленный снимок каждой партии
+        self._wakeup = asyncio.Event()
+
+    def send(self, message: dict):
+        if self.closed:
+            return
+        self._pending.append(message)
+        if len(self._pending) > MAX_PENDING:
+            self.close()
+            return
+        self._wakeup.set()
+
+    def push_state(self, match_id: int, message: dict):
+        if self.closed:
+            return
+        self._states[match_id] = message
+        self._wakeup.set()
+
+    async def writer_loop(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                # Снимки раньше запросов: клиент решает уже по свежему состоянию
+                batch = list(self._states.values()) + self._pending
+                self._states = {}
+                self._pending = []
+                if batch:
+                    self.writer.write(b"".join(json.dumps(m, ensure_ascii=False).encode() + b"\n" for m in batch))
+                    await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._wakeup.set()
+        self.writer.close()
+
+
+class Match:
+    __slots__ = ("server", "id", "size", "engine", "driver", "seats", "decision", "decision_id",
+                 "timeout_handle", "timeouts")
+
+    def __init__(self, server: "MatchServer", match_id: int, size: int, seed: Optional[int] = None):
+        self.server = server
+        self.id = match_id
+        self.size = size
+        self.engine = GameEngine(GameLogger(echo=False, keep_history=False), player_count=size, seed=seed,
+                                 board=server.board)
+        self.driver = MatchDriver(self.engine, server.max_turns)
+        self.seats: List[Optional[Connection]] = []
+        self.decision: Optional[Decision] = None
+        self.decision_id = 0
+        self.timeout_handle: Optional[asyncio.TimerHandle] = None
+        self.timeouts = 0
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.seats) == self.size
+
+    def start(self):
+        self.advance()
+
+    def advance(self):
+        """Автоматическая часть хода до следующего решения; игроки без связи отвечают сразу"""
+        while True:
+            decision = self.driver.next_decision()
+            if decision is None:
+                self.finish()
+                return
+            conn = self.seats[decision.player.uid]
+            if conn is None or conn.closed:
+                self.driver.apply(decision, 0)
+                continue
+            break
+
+        self.decision = decision
+        self.decision_id += 1
+        self.push_state()
+        conn.send({
+            "op": "decision", "match": self.id, "id": self.decision_id, "seat": decision.player.uid,
+            "kind": decision.kind, "options": [option_label(o) for o in decision.options],
+        })
+        self.timeout_handle = asyncio.get_running_loop().call_later(
+            self.server.turn_timeout, self.on_timeout, self.decision_id)
+
+    def push_state(self):
+        """Снимок всем игрокам — один на пачку изменений до следующего решения"""
+        message = snapshot_message(self.id, self.engine.publish_snapshot())
+        for conn in self.seats:
+            if conn is not None:
+                conn.push_state(self.id, message)
+
+    def decide(self, decision_id: int, choice: int) -> Optional[str]:
+        """Ответ игрока; возвращает текст ошибки или None"""
+        if self.decision is None or decision_id != self.decision_id:
+            return None  # Запоздалый ответ: за игрока уже решил таймаут
+        if not isinstance(choice, int) or not 0 <= choice < len(self.decision.options):
+            return f"Вариант {choice!r} вне диапазона 0..{len(self.decision.options) - 1}"
+        self._apply(choice)
+        return None
+
+    def on_timeout(self, decision_id: int):
+        if decision_id == self.decision_id and self.decision is not None:
+            self.timeouts += 1
+            self.server.timeouts += 1
+            self._apply(0)
+
+    def _apply(self, choice: int):
+        if self.timeout_handle:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+        decision, self.decision = self.decision, None
+        self.driver.apply(decision, choice)
+        self.server.decisions += 1
+        self.advance()
+
+    def leave(self, conn: Connection):
+        for i, seat in enumerate(self.seats):
+            if seat is conn:
+                self.seats[i] = None
+        if not self.is_full:
+            return  # Партия ещё не началась: место просто освободится для следующего
+        if all(seat is None for seat in self.seats):
+            self.close()
+        elif self.decision is not None and self.seats[self.decision.player.uid] is None:
+            self._apply(0)
+
+    def finish(self):
+        self.push_state()
+        winner = self.engine.winner.uid if self.engine.winner else None
+        for conn in self.seats:
+            if conn is not None:
+                conn.send({"op": "end", "match": self.id, "winner": winner})
+                conn.seats.pop(self.id, None)
+        self.server.finished += 1
+        self.close()
+
+    def close(self):
+        if self.timeout_handle:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+        self.decision = None
+        self.server.matches.pop(self.id, None)
+
+
+class MatchServer:
+    def __init__(self, turn_timeout: float = DEFAULT_TURN_TIMEOUT, max_turns: int = 1000):
+        self.turn_timeout = turn_timeout
+        self.max_turns = max_turns
+        self.board = Board()
+        self.matches: Dict[int, Match] = {}
+        self._open: Dict[int, Match] = {}  # Набирающая игроков партия для каждого размера
+        self._next_id = 1
+        self.connections = 0
+        self.decisions = 0
+        self.timeouts = 0
+        self.finished = 0
+
+    def join(self, conn: Connection, size: int) -> Match:
+        match = self._open.get(size)
+        if match is None:
+            match = Match(self, self._next_id, size)
+            self._next_id += 1
+            self.matches[match.id] = match
+            self._open[size] = match
+        # Место ушедшего до старта игрока занимает новый
+        seat = match.seats.index(None) if None in match.seats else len(match.seats)
+        if seat == len(match.seats):
+            match.seats.append(conn)
+        else:
+            match.seats[seat] = conn
+        conn.seats[match.id] = seat
+        conn.send({"op": "joined", "match": match.id, "seat": seat, "size": size})
+        if match.is_full and None not in match.seats:
+            del self._open[size]
+            match.start()
+        return match
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = Connection(writer)
+        self.connections += 1
+        writer_task = asyncio.create_task(conn.writer_loop())
+        try:
+            while not conn.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    error = self.dispatch(conn, message)
+                except (ValueError, KeyError, TypeError) as e:
+                    error = f"Плохое сообщение: {e}"
+                if error:
+                    conn.send({"op": "error", "msg": error})
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            for match_id in list(conn.seats):
+                match = self.matches.get(match_id)
+                if match:
+                    match.leave(conn)
+            conn.close()
+            writer_task.cancel()
+
+    def dispatch(self, conn: Connection, message: dict) -> Optional[str]:
+        op = message["op"]
+        if op == "join":
+            size = message.get("size", 2)
+            if size not in MATCH_SIZES:
+                return f"Размер партии {size!r}: ожидается один из {MATCH_SIZES}"
+            self.join(conn, size)
+            return None
+        if op == "decide":
+            match = self.matches.get(message["match"])
+            if match is None or message["match"] not in conn.seats:
+                return f"Нет партии {message['match']} у этого соединения"
+            if match.decision is not None and match.seats[match.decision.player.uid] is not conn:
+                return "Сейчас решает другой игрок"
+            return match.decide(message["id"], message["choice"])
+        return f"Неизвестная операция {op!r}"
+
+    def stats(self) -> str:
+        waiting = sum(1 for m in self.matches.values() if not m.is_full)
+        return (f"партий {len(self.matches)} (набирают игроков {waiting}), соединений {self.connections}, "
+                f"решений {self.decisions}, таймаутов {self.timeouts}, доиграно {self.finished}")
+
+
+async def serve(host: str, port: int, turn_timeout: float, stats_interval: float = 0):
+    server = MatchServer(turn_timeout)
+    tcp = await asyncio.start_server(server.handle_client, host, port, backlog=1024)
+    print(f"Сервер матчей на {host}:{port}, таймаут хода {turn_timeout} с")
+    if stats_interval:
+        asyncio.create_task(print_stats(server, stats_interval))
+    async with tcp:
+        await tcp.serve_forever()
+
+
+async def print_stats(server: MatchServer, interval: float):
+    started = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        print(f"[{time.perf_counter() - started:7.1f} с] {server.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервер сетевых матчей")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--turn-timeout", type=float, default=DEFAULT_TURN_TIMEOUT)
+    parser.add_argument("--stats", type=float, default=0, metavar="SEC", help="печатать статистику раз в SEC секунд")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.turn_timeout, args.stats))
+    except KeyboardInterrupt:
+        pass
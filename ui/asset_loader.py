@@ -0,0 +1,85 @@
+"""
+Фоновая загрузка картинок.
+
+Декодирование PNG и smoothscale идут в пуле потоков (pygame отпускает GIL на
+этих операциях), а главный поток тем временем рисует экран загрузки. Готовые
+картинки главный поток забирает в poll(), приводит к формату экрана и кладёт
+в SpriteCache — после этого Renderer получает их мгновенно.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pygame
+
+from ui.fonts import get_font
+from ui.sprite_cache import SpriteCache
+from ui.text_cache import render_text
+
+Request = Tuple[str, Tuple[int, int], bool]  # (путь, размер, альфа)
+
+
+class AssetLoader:
+    def __init__(self, sprites: SpriteCache, workers: int = 4):
+        self.sprites = sprites
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._pending: List[Tuple[Request, Future]] = []
+        self._requested = set()
+        self.total = 0
+        self.loaded = 0
+        self.errors: List[Tuple[str, BaseException]] = []
+
+    def submit(self, path: str, size: Tuple[int, int], alpha: bool = True):
+        request = (path, (int(size[0]), int(size[1])), alpha)
+        if request in self._requested:
+            return
+        self._requested.add(request)
+        self._pending.append((request, self._pool.submit(self.sprites.load_pixels, *request)))
+        self.total += 1
+
+    def poll(self, budget_ms: float = 8.0):
+        """
+        Забрать готовые картинки и привести их к формату экрана (только главный поток).
+        budget_ms ограничивает работу за вызов, чтобы экран загрузки не подвисал.
+        """
+        started = pygame.time.get_ticks()
+        still_pending = []
+        for request, future in self._pending:
+            if not future.done() or pygame.time.get_ticks() - started > budget_ms:
+                still_pending.append((request, future))
+                continue
+            path, size, alpha = request
+            try:
+                surf = future.result()
+            except Exception as e:
+                # Загрузка не прошла — Renderer повторит её синхронно и покажет настоящую ошибку
+                self.errors.append((path, e))
+            else:
+                self.sprites.put(path, size, alpha, surf.convert_alpha() if alpha else surf.convert())
+            self.loaded += 1
+        self._pending = still_pending
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    @property
+    def progress(self) -> float:
+        return self.loaded / self.total if self.total else 1.0
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def draw_loading_screen(screen: pygame.Surface, progress: float, label: Optional[str] = None):
+    screen.fill((30, 30, 30))
+    w, h = screen.get_size()
+    bar = pygame.Rect(0, 0, w // 2, 24)
+    bar.center = (w // 2, h // 2)
+
+    txt = render_text(get_font(24, bold=True), label or f"Загрузка... {progress:.0%}", (255, 215, 0))
+    screen.blit(txt, (bar.centerx - txt.get_width() // 2, bar.y - 40))
+    pygame.draw.rect(screen, (60, 60, 70), bar, border_radius=6)
+    if progress > 0:
+        fill = bar.copy()
+        fill.w = max(12, int(bar.w * progress))
+        pygame.draw.rect(screen, (255, 215, 0), fill, border_radius=6)
@@ -1,13 +1,17 @@
 import pygame
 from pygame import MOUSEBUTTONUP, MOUSEMOTION
 
+from ui.fonts import get_font
+from ui.overlays import dim_overlay
+from ui.text_cache import render_text
+
 
 class Button:
     def __init__(self, x, y, w, h, text, color=(70, 70, 70)):
         self.rect = pygame.Rect(x, y, w, h)
         self.text = text
         self.color = color
-        self.font = pygame.font.SysFont("Arial", 20, bold=True)
+        self.font = get_font(20, bold=True)
 
     def draw(self, screen):
         # Рисуем тень и кнопку
@@ -16,7 +20,7 @@ class Button:
         pygame.draw.rect(screen, self.color, self.rect, border_radius=5)
         pygame.draw.rect(screen, (200, 200, 200), self.rect, 2, border_radius=5)
 
-        txt_surf = self.font.render(self.text, True, (255, 255, 255))
+        txt_surf = render_text(self.font, self.text, (255, 255, 255))
         screen.blit(txt_surf, (self.rect.centerx - txt_surf.get_width() // 2,
                                self.rect.centery - txt_surf.get_height() // 2))
 
@@ -40,16 +44,14 @@ class Dialog:
 
     def draw(self, screen):
         # Затемнение заднего фона
-        overlay = pygame.Surface((1300, 1000), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, (0, 0))
+        screen.blit(dim_overlay(screen.get_size(), 150), (0, 0))
 
         # Окно
         pygame.draw.rect(screen, (40, 40, 40), self.rect, border_radius=10)
         pygame.draw.rect(screen, (255, 215, 0), self.rect, 3, border_radius=10)
 
-        font = pygame.font.SysFont("Arial", 24, bold=True)
-        title_surf = font.render(self.title, True, (255, 255, 255))
+        font = get_font(24, bold=True)
+        title_surf = render_text(font, self.title, (255, 255, 255))
         screen.blit(title_surf, (self.rect.centerx - title_surf.get_width() // 2, self.rect.y + 20))
 
         for btn in self.buttons:
@@ -84,10 +86,11 @@ class SliderDialog:
         self.cancel_btn = Button(self.rect.x + 260, self.rect.y + 300, 160, 60, "Отмена", (150, 50, 50))
 
         # Шрифты
-        self.title_font = pygame.font.SysFont("Arial", 26, bold=True)
-        self.desc_font = pygame.font.SysFont("Arial", 18)
-        self.value_font = pygame.font.SysFont("Arial", 32, bold=True)
-        self.result_font = pygame.font.SysFont("Arial", 20)
+        self.title_font = get_font(26, bold=True)
+        self.desc_font = get_font(18)
+        self.value_font = get_font(32, bold=True)
+        self.result_font = get_font(20)
+        self.desc_lines = self._wrap_text(description, 460)  # Описание не меняется — переносим один раз
 
     def handle_event(self, event, mouse_pos):
         """
@@ -136,35 +139,33 @@ class SliderDialog:
 
     def draw(self, screen, mouse_pos):
         # Затемнение фона
-        overlay = pygame.Surface((1300, 1300), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        screen.blit(dim_overlay(screen.get_size(), 180), (0, 0))
 
         # Главное окно
         pygame.draw.rect(screen, (40, 40, 45), self.rect, border_radius=12)
         pygame.draw.rect(screen, (255, 215, 0), self.rect, 4, border_radius=12)
 
         # Заголовок
-        title_surf = self.title_font.render(self.title, True, (255, 215, 0))
+        title_surf = render_text(self.title_font, self.title, (255, 215, 0))
         screen.blit(title_surf, (self.rect.centerx - title_surf.get_width() // 2, self.rect.y + 25))
 
         # Описание (многострочное)
         y_offset = self.rect.y + 70
-        for line in self._wrap_text(self.description, 460):
-            desc_surf = self.desc_font.render(line, True, (200, 200, 200))
+        for line in self.desc_lines:
+            desc_surf = render_text(self.desc_font, line, (200, 200, 200))
             screen.blit(desc_surf, (self.rect.x + 20, y_offset))
             y_offset += 25
 
         # Отображение текущего значения
         value_text = f"{self.current_value} монет"
-        value_surf = self.value_font.render(value_text, True, (255, 255, 255))
+        value_surf = render_text(self.value_font, value_text, (255, 255, 255))
         screen.blit(value_surf, (self.rect.centerx - value_surf.get_width() // 2, self.rect.y + 130))
 
         # Результат
         result_value = self.current_value * self.multiplier
         result_text = f"→ {result_value} клеток вперёд" if self.multiplier > 0 else f"→ {abs(result_value)} клеток назад"
-        result_surf = self.result_font.render(result_text, True,
-                                              (100, 255, 100) if self.multiplier > 0 else (255, 100, 100))
+        result_surf = render_text(self.result_font, result_text,
+                                  (100, 255, 100) if self.multiplier > 0 else (255, 100, 100))
         screen.blit(result_surf, (self.rect.centerx - result_surf.get_width() // 2, self.rect.y + 230))
 
         # Слайдер
@@ -201,8 +202,8 @@ class SliderDialog:
         pygame.draw.circle(screen, (255, 215, 0), handle_pos, self.handle_radius, 3)
 
         # Метки min/max
-        min_label = self.desc_font.render("0", True, (150, 150, 150))
-        max_label = self.desc_font.render(str(self.max_value), True, (150, 150, 150))
+        min_label = render_text(self.desc_font, "0", (150, 150, 150))
+        max_label = render_text(self.desc_font, str(self.max_value), (150, 150, 150))
         screen.blit(min_label, (self.slider_rect.x - 5, self.slider_rect.bottom + 5))
         screen.blit(max_label, (self.slider_rect.right - 15, self.slider_rect.bottom + 5))
 
@@ -214,8 +215,7 @@ class SliderDialog:
 
         for word in words:
             test_line = ' '.join(current_line + [word])
-            test_surf = self.desc_font.render(test_line, True, (255, 255, 255))
-            if test_surf.get_width() <= max_width:
+            if self.desc_font.size(test_line)[0] <= max_width:
                 current_line.append(word)
             else:
                 if current_line:
@@ -0,0 +1,69 @@
+"""
+Учёт изменившихся областей экрана (dirty rectangles).
+
+Каждый кадр главный цикл сообщает трекеру, что сейчас на экране: ключи
+состояния областей (боковая панель, открытый диалог) и прямоугольники
+подвижных объектов (фишки, мины, подсветка). collect() сравнивает с прошлым
+кадром и отдаёт только изменившиеся прямоугольники. Если ничего не
+изменилось, кадр не перерисовывается вовсе; если изменилось слишком много —
+отдаётся весь экран.
+"""
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+_MISSING = object()
+
+
+class DirtyTracker:
+    def __init__(self, screen_size: Tuple[int, int], full_threshold: float = 0.5):
+        self.screen_rect = pygame.Rect((0, 0), screen_size)
+        self.full_threshold = full_threshold  # Доля площади экрана, после которой проще перерисовать всё
+        self._keys: Dict[str, object] = {}
+        self._items: Dict[str, Dict[Hashable, pygame.Rect]] = {}
+        self._dirty: List[pygame.Rect] = []
+        self._full = True  # Первый кадр рисуется целиком
+
+    def invalidate(self):
+        """Перерисовать весь экран на следующем кадре"""
+        self._full = True
+
+    def mark(self, rect: pygame.Rect):
+        self._dirty.append(pygame.Rect(rect))
+
+    def watch(self, name: str, key, rect: Optional[pygame.Rect] = None):
+        """Область rect (или весь экран) грязная, если key изменился с прошлого кадра"""
+        if self._keys.get(name, _MISSING) != key:
+            self._keys[name] = key
+            if rect is None:
+                self._full = True
+            else:
+                self.mark(rect)
+
+    def watch_items(self, name: str, items: Dict[Hashable, pygame.Rect]):
+        """
+        Набор объектов {id: rect}. Появившийся, пропавший или сдвинутый объект
+        пачкает и старое, и новое место.
+        """
+        previous = self._items.get(name, {})
+        for item_id in previous.keys() | items.keys():
+            old, new = previous.get(item_id), items.get(item_id)
+            if old != new:
+                if old is not None:
+                    self.mark(old)
+                if new is not None:
+                    self.mark(new)
+        self._items[name] = items
+
+    def collect(self) -> List[pygame.Rect]:
+        """Прямоугольники для перерисовки в этом кадре; пустой список — кадр не нужен"""
+        if self._full:
+            rects = [self.screen_rect.copy()]
+        else:
+            rects = [r.clip(self.screen_rect) for r in self._dirty]
+            rects = [r for r in rects if r.w and r.h]
+            if sum(r.w * r.h for r in rects) > self.full_threshold * self.screen_rect.w * self.screen_rect.h:
+                rects = [self.screen_rect.copy()]
+        self._full = False
+        self._dirty = []
+        return rects
@@ -0,0 +1,35 @@
+"""
+Общий реестр шрифтов.
+
+pygame.font.SysFont каждый раз ищет шрифт в системе и заново грузит файл —
+это миллисекунды на вызов, а отрисовка вызывала его по несколько раз за кадр.
+get_font() создаёт шрифт один раз на ключ (семейство, размер, жирность) и
+дальше отдаёт тот же объект.
+"""
+import time
+from typing import Dict, Tuple
+
+import pygame
+
+DEFAULT_FAMILY = "Arial"
+
+_fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+
+# Сколько раз шрифт реально загружался и сколько это заняло (для профилирования)
+load_stats = {"loads": 0, "seconds": 0.0}
+
+
+def get_font(size: int, bold: bool = False, family: str = DEFAULT_FAMILY) -> pygame.font.Font:
+    key = (family, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        started = time.perf_counter()
+        font = _fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+        load_stats["loads"] += 1
+        load_stats["seconds"] += time.perf_counter() - started
+    return font
+
+
+def clear():
+    """Забыть загруженные шрифты (после pygame.quit() они недействительны)"""
+    _fonts.clear()
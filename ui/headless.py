@@ -0,0 +1,219 @@
+"""
+Отрисовка записанных матчей без окна: в PNG-последовательности или сырой
+поток RGB для внешнего кодировщика.
+
+Рендерер работает с SDL-драйвером dummy — экран существует только в памяти.
+Кадр снимается после каждой команды журнала (per=command), в конце каждого
+хода (per=turn) или один раз в конце матча (per=end — миниатюры). Разные
+матчи и разные отрезки ходов одного матча рисуются параллельно в пуле
+процессов; номер кадра — позиция в журнале команд (или номер хода), так что
+кадры отрезков не пересекаются и склеиваются по порядку.
+
+Использование:
+    python -m ui.headless match_logs/match_*.json --out match_logs/frames --per turn --workers 8
+    python -m ui.headless match_logs/match_X.json --format raw --split 4 --out clips/
+        (ffmpeg -f rawvideo -pix_fmt rgb24 -s 1300x1000 -r 30 -i <файл>.rgb clip.mp4)
+    python -m ui.headless match_logs/*.json --per end --scale 0.2 --out thumbs/
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional
+
+import pygame
+
+from game_core.engine import GameEngine
+from game_core.replay import MatchReplayer
+
+FORMATS = ("png", "raw")
+PER = ("command", "turn", "end")
+
+_worker = {}  # Экран и рендерер процесса; создаются один раз на процесс
+
+
+def _init_renderer():
+    if _worker:
+        return _worker["screen"], _worker["renderer"]
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    # Иначе SDL перехватывает SIGTERM, и пул не может завершить рабочий процесс
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    from main import WINDOW_SIZE
+    from ui.renderer import Renderer
+    from ui.sprite_cache import sprite_cache
+    from ui.view_config import ViewConfig
+
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_SIZE + 300, WINDOW_SIZE))
+    view_cfg = ViewConfig("ui/coords.json", target_size=WINDOW_SIZE)
+    board_img = sprite_cache.load_scaled("assets/field_corrected.png", (WINDOW_SIZE, WINDOW_SIZE), alpha=False)
+    _worker.update(screen=screen, renderer=Renderer(screen, view_cfg, board_img))
+    return screen, _worker["renderer"]
+
+
+def draw_spectator_frame(renderer, engine: GameEngine, turn: int, last_turn: int):
+    """Поле, фишки, панель игроков и полоса прогресса — как в просмотре реплея"""
+    renderer.screen.fill((30, 30, 30))
+    snapshot = engine.publish_snapshot()
+    renderer.draw_background(snapshot.active_rules, snapshot.placed_mines)
+    renderer.draw_players(snapshot)
+    renderer.draw_sidebar(snapshot, turn, 0)
+    renderer.draw_replay_bar(turn, last_turn, True)
+
+
+class FrameSink:
+    """Куда пишутся кадры: каталог PNG или файл сырого RGB24"""
+
+    def __init__(self, path: str, fmt: str = "png", scale: Optional[float] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Формат {fmt}: ожидается один из {FORMATS}")
+        self.path = path
+        self.fmt = fmt
+        self.scale = scale
+        self.frames = 0
+        self._stream = None
+        if fmt == "png":
+            os.makedirs(path, exist_ok=True)
+        else:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._stream = open(path, 'wb')
+
+    def write(self, surface: pygame.Surface, index: int):
+        if self.scale:
+            size = (max(1, round(surface.get_width() * self.scale)), max(1, round(surface.get_height() * self.scale)))
+            surface = pygame.transform.smoothscale(surface, size)
+        if self._stream:
+            self._stream.write(pygame.image.tobytes(surface, "RGB"))
+        else:
+            pygame.image.save(surface, os.path.join(self.path, f"frame_{index:06d}.png"))
+        self.frames += 1
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+
+def render_match(log_path: str, sink: FrameSink, per: str = "command",
+                 start_turn: int = 1, end_turn: Optional[int] = None) -> int:
+    """
+    Рисует ходы [start_turn, end_turn) матча из лога в sink.
+    Возвращает число кадров.
+    """
+    if per not in PER:
+        raise ValueError(f"per={per}: ожидается один из {PER}")
+    screen, renderer = _init_renderer()
+    replayer = MatchReplayer.from_file(log_path)
+    last_turn = replayer.last_turn
+    frames_before = sink.frames
+
+    def emit(index: int):
+        draw_spectator_frame(renderer, replayer.engine, replayer.turn, last_turn)
+        sink.write(screen, index)
+
+    if per == "end":
+        replayer.run_to_end()
+        emit(replayer.position)
+        return sink.frames - frames_before
+
+    replayer.seek(start_turn)
+    if start_turn <= 1 and per == "command":
+        emit(0)  # Начальная расстановка; у следующих отрезков её кадр — последний кадр предыдущего
+    while not replayer.finished:
+        if end_turn is not None and replayer.commands[replayer.position]["turn"] >= end_turn:
+            break
+        entry = replayer.step()
+        if per == "command":
+            emit(replayer.position)
+        elif replayer.finished or replayer.commands[replayer.position]["turn"] != entry["turn"]:
+            emit(entry["turn"])
+    return sink.frames - frames_before
+
+
+def _job_output(out: str, log_path: str, fmt: str, start_turn: int, end_turn: Optional[int], split: bool) -> str:
+    stem = os.path.splitext(os.path.basename(log_path))[0]
+    if fmt == "png":
+        return os.path.join(out, stem)  # Отрезки одного матча пишут в общий каталог, номера кадров не пересекаются
+    suffix = f"_{start_turn:05d}-{end_turn:05d}" if split and end_turn is not None else ""
+    return os.path.join(out, f"{stem}{suffix}.rgb")
+
+
+def _render_job(job: Dict) -> Dict:
+    started = time.perf_counter()
+    sink = FrameSink(job["out"], job["fmt"], job["scale"])
+    try:
+        frames = render_match(job["log"], sink, job["per"], job["start"], job["end"])
+    finally:
+        sink.close()
+    return {"log": job["log"], "out": job["out"], "frames": frames, "seconds": time.perf_counter() - started}
+
+
+def make_jobs(logs: List[str], out: str, fmt: str = "png", per: str = "command", split: int = 1,
+              turns: Optional[tuple] = None, scale: Optional[float] = None) -> List[Dict]:
+    """Задания по матчам; при split > 1 диапазон ходов матча режется на split отрезков"""
+    jobs = []
+    for log_path in logs:
+        start, end = turns or (1, None)
+        if split > 1 and per != "end":
+            if end is None:
+                end = MatchReplayer.from_file(log_path).last_turn + 1
+            bounds = [start + (end - start) * k // split for k in range(split + 1)]
+            ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+        else:
+            ranges = [(start, end)]
+        for a, b in ranges:
+            jobs.append({"log": log_path, "fmt": fmt, "per": per, "start": a, "end": b, "scale": scale,
+                         "out": _job_output(out, log_path, fmt, a, b, len(ranges) > 1)})
+    return jobs
+
+
+def render_parallel(jobs: List[Dict], workers: Optional[int] = None) -> List[Dict]:
+    if workers == 1 or len(jobs) == 1:
+        return [_render_job(job) for job in jobs]
+    # spawn, а не fork: у каждого процесса своя чистая инициализация SDL
+    pool = multiprocessing.get_context("spawn").Pool(workers)
+    try:
+        results = list(pool.imap_unordered(_render_job, jobs))
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    pool.join()
+    return results
+
+
+def _parse_turns(value: str) -> tuple:
+    start, _, end = value.partition(":")
+    return int(start or 1), int(end) if end else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Отрисовка матчей без окна в PNG или сырой RGB")
+    parser.add_argument("logs", nargs="+", help="логи матчей (можно маской)")
+    parser.add_argument("--out", default="match_logs/frames")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--per", choices=PER, default="command", help="кадр на команду, на ход или один в конце")
+    parser.add_argument("--turns", type=_parse_turns, help="диапазон ходов A:B (B не включается)")
+    parser.add_argument("--split", type=int, default=1, help="резать каждый матч на N отрезков по процессам")
+    parser.add_argument("--scale", type=float, help="масштаб кадров, например 0.2 для миниатюр")
+    parser.add_argument("--workers", type=int, default=None, help="по умолчанию — все ядра")
+    args = parser.parse_args(argv)
+
+    logs = sorted({path for pattern in args.logs for path in glob.glob(pattern)})
+    if not logs:
+        parser.error("логи не найдены")
+    jobs = make_jobs(logs, args.out, args.format, args.per, args.split, args.turns, args.scale)
+
+    started = time.perf_counter()
+    results = render_parallel(jobs, args.workers)
+    elapsed = time.perf_counter() - started
+    frames = sum(r["frames"] for r in results)
+    print(f"{len(logs)} матчей, {len(jobs)} заданий, {frames} кадров за {elapsed:.1f} с "
+          f"({frames / elapsed if elapsed else 0:.1f} кадр/с) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Запись и воспроизведение ввода главного цикла.
+
+python main.py --record-input FILE пишет позицию мыши и события pygame
+(клики, клавиши, движение мыши) с номером итерации главного цикла, а также
+сид матча и режим перерисовки. InputPlayback подаёт те же события в те же
+итерации: при том же сиде движок приходит в то же состояние, что и при
+записи. Прогон под dummy-драйвером без ограничения FPS — сквозной замер
+всего пути UI (benchmarks/ui_replay.py).
+
+Номер итерации, а не время: ранний continue в главном цикле не забирает
+события из очереди, и при воспроизведении они должны попасть в ту же
+итерацию, где их забрала запись.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pygame
+
+FORMAT_VERSION = 1
+
+# Какие события пишем и какие их поля нужны обработчикам главного цикла
+RECORDED = {
+    pygame.QUIT: ("quit", ()),
+    pygame.KEYDOWN: ("keydown", ("key", "mod")),
+    pygame.KEYUP: ("keyup", ("key", "mod")),
+    pygame.MOUSEBUTTONDOWN: ("mousedown", ("pos", "button")),
+    pygame.MOUSEBUTTONUP: ("mouseup", ("pos", "button")),
+    pygame.MOUSEMOTION: ("mousemotion", ("pos", "rel", "buttons")),
+}
+_TYPES = {name: event_type for event_type, (name, _) in RECORDED.items()}
+
+
+def engine_summary(engine) -> dict:
+    """Итоговое состояние матча, которое воспроизведение обязано повторить"""
+    return {
+        "turn": engine.logger.current_turn,
+        "current_player": engine.state.current_player_idx,
+        "winner": engine.winner.uid if engine.winner else None,
+        "players": [[p.position, p.coins, p.is_finished, [c.uid for c in p.hand]] for p in engine.state.players],
+        "rules": [rule.sprite_id for rule in engine.state.active_rules],
+        "mines": sorted([cell, owner] for cell, owner in engine.placed_mines.items()),
+        "commands": len(engine.logger.log_data["commands"]),
+    }
+
+
+class LiveInput:
+    """Обычный ввод с клавиатуры и мыши"""
+
+    def __init__(self):
+        self.frame = -1
+
+    def next_frame(self) -> Tuple[int, int]:
+        """Начало итерации главного цикла; возвращает позицию мыши"""
+        self.frame += 1
+        return pygame.mouse.get_pos()
+
+    def get_events(self) -> List[pygame.event.Event]:
+        return pygame.event.get()
+
+
+class InputRecorder(LiveInput):
+    """Обычный ввод, который попутно пишется в файл"""
+
+    def __init__(self, path: str, seed: int, dirty_rects: bool):
+        super().__init__()
+        self.path = path
+        self.seed = seed
+        self.dirty_rects = dirty_rects
+        self.mouse: List[list] = []  # [итерация, x, y] — только когда позиция меняется
+        self.events: List[list] = []  # [итерация, тип, поля]
+        self._last_pos = None
+
+    @staticmethod
+    def default_path() -> str:
+        return f"match_logs/input_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    def next_frame(self) -> Tuple[int, int]:
+        pos = super().next_frame()
+        if pos != self._last_pos:
+            self.mouse.append([self.frame, pos[0], pos[1]])
+            self._last_pos = pos
+        return pos
+
+    def get_events(self) -> List[pygame.event.Event]:
+        events = super().get_events()
+        for event in events:
+            spec = RECORDED.get(event.type)
+            if spec:
+                name, fields = spec
+                self.events.append([self.frame, name, {f: getattr(event, f) for f in fields}])
+        return events
+
+    def save(self, engine):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        data = {
+            "version": FORMAT_VERSION,
+            "seed": self.seed,
+            "dirty_rects": self.dirty_rects,
+            "frames": self.frame + 1,
+            "mouse": self.mouse,
+            "events": self.events,
+            "final": engine_summary(engine),
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        print(f"Ввод сохранен в {self.path}")
+
+
+class InputPlayback:
+    """Подаёт записанный ввод вместо настоящего; попутно меряет время итераций"""
+
+    def __init__(self, data: dict):
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Запись ввода версии {data.get('version')}, ожидается {FORMAT_VERSION}")
+        self.seed: int = data["seed"]
+        self.dirty_rects: bool = data["dirty_rects"]
+        self.frames: int = data["frames"]
+        self.expected: dict = data["final"]
+        self._mouse = data["mouse"]
+        self._events = data["events"]
+        self._mouse_idx = 0
+        self._event_idx = 0
+        self._pos = (0, 0)
+        self.frame = -1
+        self.frame_times_ms: List[float] = []
+        self._frame_started: Optional[float] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "InputPlayback":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def finished(self) -> bool:
+        return self.frame + 1 >= self.frames
+
+    def next_frame(self) -> Tuple[int, int]:
+        now = time.perf_counter()
+        if self._frame_started is not None:
+            self.frame_times_ms.append((now - self._frame_started) * 1000)
+        self._frame_started = now
+
+        self.frame += 1
+        while self._mouse_idx < len(self._mouse) and self._mouse[self._mouse_idx][0] <= self.frame:
+            _, x, y = self._mouse[self._mouse_idx]
+            self._pos = (x, y)
+            self._mouse_idx += 1
+        return self._pos
+
+    def get_events(self) -> List[pygame.event.Event]:
+        pygame.event.get()  # Настоящая очередь не должна переполняться; её события не нужны
+        events = []
+        while self._event_idx < len(self._events) and self._events[self._event_idx][0] <= self.frame:
+            _, name, fields = self._events[self._event_idx]
+            events.append(pygame.event.Event(_TYPES[name], {k: tuple(v) if isinstance(v, list) else v
+                                                            for k, v in fields.items()}))
+            self._event_idx += 1
+        return events
+
+    def mismatches(self, engine) -> List[str]:
+        """Поля итогового состояния, которые разошлись с записью"""
+        actual = engine_summary(engine)
+        return [f"{key}: ожидалось {self.expected.get(key)!r}, получено {value!r}"
+                for key, value in actual.items() if self.expected.get(key) != value]
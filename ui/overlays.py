@@ -0,0 +1,45 @@
+"""
+Заранее подготовленные слои затемнения и подсветки.
+
+Раньше диалоги и выбор карт каждый кадр создавали полноэкранную
+SRCALPHA-поверхность и заливали её. Затемнение одного цвета не требует
+попиксельной альфы: достаточно обычной поверхности с общей прозрачностью
+(set_alpha), её SDL блитит заметно быстрее. Слои создаются один раз на
+размер и прозрачность и дальше переиспользуются.
+"""
+from typing import Dict, Tuple
+
+import pygame
+
+_dims: Dict[Tuple[Tuple[int, int], int], pygame.Surface] = {}
+_circles: Dict[Tuple[int, Tuple[int, ...]], pygame.Surface] = {}
+
+
+def dim_overlay(size: Tuple[int, int], alpha: int) -> pygame.Surface:
+    """Чёрный слой размера size с прозрачностью alpha (0-255)"""
+    key = (tuple(size), alpha)
+    surf = _dims.get(key)
+    if surf is None:
+        surf = pygame.Surface(size).convert()
+        surf.fill((0, 0, 0))
+        surf.set_alpha(alpha)
+        _dims[key] = surf
+    return surf
+
+
+def circle_overlay(radius: int, color: Tuple[int, int, int, int]) -> pygame.Surface:
+    """Полупрозрачный круг в квадрате 2*radius + запас, центр — в середине поверхности"""
+    key = (radius, tuple(color))
+    surf = _circles.get(key)
+    if surf is None:
+        side = radius * 2 + 20
+        surf = pygame.Surface((side, side), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(surf, color, (side // 2, side // 2), radius)
+        _circles[key] = surf
+    return surf
+
+
+def clear():
+    """Сбросить слои (после смены режима экрана)"""
+    _dims.clear()
+    _circles.clear()
@@ -0,0 +1,148 @@
+"""
+Профилировщик кадра: время каждой стадии главного цикла, скользящие
+перцентили и прирост выделенной памяти за кадр.
+
+Стадии размечаются «кругами», как на секундомере: lap(name) относит к
+стадии name всё время с предыдущей отметки. Так разметка главного цикла не
+требует переносить код в блоки with, а ранний continue просто оставляет
+остаток кадра неразмеченным.
+
+F3 в игре включает оверлей; python main.py --profile дополнительно пишет
+каждый кадр в CSV (match_logs/frames_<время>.csv). Пока профилировщик
+выключен, begin_frame() и lap() сразу возвращаются.
+"""
+import gc
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+import pygame
+
+from ui.fonts import get_font
+from ui.text_cache import render_text, text_cache
+
+FRAME_BUDGET_MS = 1000 / 60
+
+# Порядок строк в оверлее и колонок в CSV
+STAGES = (
+    "events", "input", "dirty_rects", "draw_background", "draw_players",
+    "draw_hover", "draw_card_selector", "dialogs", "draw_sidebar", "overlay", "flip", "tick",
+)
+
+
+class FrameProfiler:
+    def __init__(self, window: int = 300, log_path: Optional[str] = None, show_overlay: bool = False):
+        self.window = window  # Сколько последних кадров учитывают перцентили
+        self.show_overlay = show_overlay
+        self.history: Dict[str, Deque[float]] = {name: deque(maxlen=window) for name in STAGES + ("work", "frame")}
+        self.alloc_history: Deque[int] = deque(maxlen=window)
+        self.frames = 0
+        self.slow_frames = 0  # Кадры, где работа (без ожидания tick) вылезла за FRAME_BUDGET_MS
+
+        self._current: Dict[str, float] = {}
+        self._frame_started: Optional[float] = None
+        self._last_lap = 0.0
+        self._blocks_at_start = 0
+        self._gc_at_start = 0
+        self._font = None
+        self.panel_rect = pygame.Rect(8, 8, 320, 400)  # Где оверлей на экране (последний отрисованный)
+        self._overlay_lines: List[str] = []
+
+        self._log = None
+        if log_path:
+            folder = os.path.dirname(log_path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self._log = open(log_path, 'w', encoding='utf-8')
+            self._log.write(",".join(("frame", "frame_ms", "work_ms") + STAGES + ("alloc_blocks", "gc_gen0")) + "\n")
+        self.enabled = self.show_overlay or self._log is not None
+
+    @staticmethod
+    def default_log_path() -> str:
+        return f"match_logs/frames_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self._log is not None
+        self._frame_started = None  # Незаконченный кадр не считаем
+
+    def lap(self, name: str):
+        """Относит к стадии name время с предыдущей отметки (или с начала кадра)"""
+        if not self.enabled or self._frame_started is None:
+            return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last_lap) * 1000
+        self._last_lap = now
+
+    def begin_frame(self):
+        """Вызывается в начале каждой итерации главного цикла; закрывает предыдущий кадр"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_started is not None:
+            self._finish_frame((now - self._frame_started) * 1000)
+        self._frame_started = self._last_lap = now
+        self._current = {}
+        self._blocks_at_start = sys.getallocatedblocks()
+        self._gc_at_start = gc.get_stats()[0]["collections"]
+
+    def _finish_frame(self, frame_ms: float):
+        current = self._current
+        work_ms = frame_ms - current.get("tick", 0.0)
+        allocated = sys.getallocatedblocks() - self._blocks_at_start
+        gc_runs = gc.get_stats()[0]["collections"] - self._gc_at_start
+
+        for name in STAGES:
+            self.history[name].append(current.get(name, 0.0))
+        self.history["work"].append(work_ms)
+        self.history["frame"].append(frame_ms)
+        self.alloc_history.append(allocated)
+        self.frames += 1
+        if work_ms > FRAME_BUDGET_MS:
+            self.slow_frames += 1
+
+        if self._log:
+            values = [f"{current.get(name, 0.0):.3f}" for name in STAGES]
+            self._log.write(f"{self.frames},{frame_ms:.3f},{work_ms:.3f},{','.join(values)},{allocated},{gc_runs}\n")
+        if self.show_overlay and self.frames % 15 == 0:
+            self._overlay_lines = self._format_lines()  # Перцентили пересчитываем не каждый кадр
+
+    def percentiles(self, name: str, qs=(50, 95, 99)) -> List[float]:
+        values = sorted(self.history[name])
+        if not values:
+            return [0.0 for _ in qs]
+        return [values[min(len(values) - 1, int(len(values) * q / 100))] for q in qs]
+
+    def _format_lines(self) -> List[str]:
+        lines = [f"{'стадия':18s} {'p50':>6s} {'p95':>6s} {'p99':>6s}  мс"]
+        for name in STAGES + ("work", "frame"):
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:18s} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        allocs = sorted(self.alloc_history)
+        if allocs:
+            lines.append(f"блоки памяти/кадр  p50 {allocs[len(allocs) // 2]:+d}  макс {allocs[-1]:+d}")
+        cache = text_cache.stats()
+        lines.append(f"кеш текста: {cache['hit_rate']:.0%} попаданий, {cache['size']}/{cache['capacity']}")
+        lines.append(f"медленных кадров: {self.slow_frames} из {self.frames}")
+        return lines
+
+    def draw_overlay(self, screen: pygame.Surface):
+        if not self.show_overlay:
+            return
+        if self._font is None:
+            self._font = get_font(14, family="Consolas")
+        lines = self._overlay_lines or ["сбор статистики..."]
+        line_h = self._font.get_linesize()
+        panel = self.panel_rect = pygame.Rect(8, 8, 320, line_h * len(lines) + 12)
+        pygame.draw.rect(screen, (0, 0, 0), panel)
+        pygame.draw.rect(screen, (255, 215, 0), panel, 1)
+        for i, line in enumerate(lines):
+            screen.blit(render_text(self._font, line, (220, 220, 220)), (panel.x + 6, panel.y + 6 + i * line_h))
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
@@ -1,20 +1,45 @@
 import os.path
+from typing import Dict, List, Optional, Tuple
 
 import pygame
 
 from game_core.cards import ShopCard
-from game_core.state import GameState
+from game_core.snapshot import GameSnapshot, PlayerSnapshot
+from ui.fonts import get_font
+from ui.overlays import circle_overlay, dim_overlay
+from ui.sprite_cache import SpriteCache, sprite_cache
+from ui.text_cache import render_text
 from ui.view_config import ViewConfig
 
+CARD_ART_SIZE = (738, 1039)  # Размер исходных картинок карт
+RULE_SMALL_SIZE = tuple([round(dim * 0.17) for dim in CARD_ART_SIZE])
+RULE_LARGE_SIZE = tuple([round(dim * 0.73) for dim in CARD_ART_SIZE])
+SHOP_SIZE = tuple([round(dim * 0.41) for dim in CARD_ART_SIZE])
+COIN_SIZES = {"coin_sprites": (26, 26), "coin_sprites_small": (18, 18), "coin_sprites_board": (52, 52)}
+SIDEBAR_BG = (40, 40, 45)
+COIN_BAR_MAX_ROWS = 2  # Больше рядов монет не рисуем — показываем «N × 5 + M × 1»
+COIN_BAR_CACHE_SIZE = 128
+
 
 class Renderer:
-    def __init__(self, screen: pygame.Surface, view_cfg: ViewConfig, board_img: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, view_cfg: ViewConfig, board_img: pygame.Surface,
+                 sprites: Optional[SpriteCache] = None):
         self.screen = screen
+        self.sprites = sprites or sprite_cache  # Дисковый кеш уменьшенных картинок
         self.view_cfg = view_cfg
         self.board_img = board_img
-        self.font = pygame.font.SysFont("Arial", 18, bold=True)
+        self.font = get_font(18, bold=True)
         self._load_sprites()
 
+        self._coin_bars: Dict[Tuple[int, int], pygame.Surface] = {}  # (монеты, ширина) -> готовая полоска
+        self._tokens: Dict[int, pygame.Surface] = {}  # uid -> фишка с обводкой и номером
+        self._panels: Dict[int, tuple] = {}  # Номер игрока -> ((игрок, версия, активен), панель, карты)
+
+        # Статичный слой: поле + правила Та-дам + мины, пересобирается при их изменении
+        self._background: Optional[pygame.Surface] = None
+        self._background_key = None
+        self.background_rebuilds = 0
+
         # Цвета игроков (кружки)
         self.player_colors = [
             (255, 50, 50),  # Красный
@@ -23,6 +48,19 @@ class Renderer:
             (255, 255, 50)  # Желтый
         ]
 
+    @staticmethod
+    def sprite_requests() -> List[Tuple[str, Tuple[int, int], bool]]:
+        """(путь, размер, альфа) всех картинок, которые рендерер грузит при создании"""
+        requests = []
+        for i in range(1, 17):
+            requests.append((f'assets/rule_cards/{i}.png', RULE_SMALL_SIZE, True))
+        for i in range(1, 11):
+            requests.append((f'assets/shop_cards/{i}.png', SHOP_SIZE, True))
+        for denom in [1, 5]:
+            for size in COIN_SIZES.values():
+                requests.append((f'assets/coins/{denom}.png', size, True))
+        return [req for req in requests if os.path.exists(req[0])]
+
     def _load_sprites(self):
         self._load_rule_sprites()
         self._load_shop_sprites()
@@ -30,26 +68,27 @@ class Renderer:
 
     def _load_rule_sprites(self):
         self.rule_sprites_small = {}
+        # Крупные карты нужны только при просмотре правила — создаются при первом показе
         self.rule_sprites_large = {}
 
-        small_size = tuple([round(dim * 0.17) for dim in (738, 1039)])
-        large_size = tuple([round(dim * 0.73) for dim in (738, 1039)])
-
         for i in range(1, 17):
             path = f'assets/rule_cards/{i}.png'
             if os.path.exists(path):
-                raw = pygame.image.load(path).convert_alpha()
-                self.rule_sprites_small[i] = pygame.transform.smoothscale(raw, small_size)
-                self.rule_sprites_large[i] = pygame.transform.smoothscale(raw, large_size)
+                self.rule_sprites_small[i] = self.sprites.load_scaled(path, RULE_SMALL_SIZE)
+
+    def get_large_rule_sprite(self, sprite_id: int) -> pygame.Surface:
+        sprite = self.rule_sprites_large.get(sprite_id)
+        if sprite is None:
+            sprite = self.sprites.load_scaled(f'assets/rule_cards/{sprite_id}.png', RULE_LARGE_SIZE)
+            self.rule_sprites_large[sprite_id] = sprite
+        return sprite
 
     def _load_shop_sprites(self):
         self.shop_sprites = {}
-        size = tuple([round(dim * 0.41) for dim in (738, 1039)])
         for i in range(1, 11):
             path = f'assets/shop_cards/{i}.png'
             if os.path.exists(path):
-                raw = pygame.image.load(path).convert_alpha()
-                self.shop_sprites[i] = pygame.transform.smoothscale(raw, size)
+                self.shop_sprites[i] = self.sprites.load_scaled(path, SHOP_SIZE)
 
     def _load_coin_sprites(self):
         self.coin_sprites = {}
@@ -58,30 +97,57 @@ class Renderer:
         for denom in [1, 5]:
             path = f'assets/coins/{denom}.png'
             if os.path.exists(path):
-                raw = pygame.image.load(path).convert_alpha()
-                self.coin_sprites[denom] = pygame.transform.smoothscale(raw, (26, 26))
-                self.coin_sprites_small[denom] = pygame.transform.smoothscale(raw, (18, 18))
-                self.coin_sprites_board[denom] = pygame.transform.smoothscale(raw, (52, 52))
+                self.coin_sprites[denom] = self.sprites.load_scaled(path, COIN_SIZES["coin_sprites"])
+                self.coin_sprites_small[denom] = self.sprites.load_scaled(path, COIN_SIZES["coin_sprites_small"])
+                self.coin_sprites_board[denom] = self.sprites.load_scaled(path, COIN_SIZES["coin_sprites_board"])
 
     def draw_board(self):
         self.screen.blit(self.board_img, (0, 0))
 
+    @staticmethod
+    def background_key(active_rules: list, placed_mines: dict) -> tuple:
+        """Всё, от чего зависит статичный слой: какие правила в каких слотах и где мины"""
+        return (tuple(rule.sprite_id for rule in active_rules),
+                tuple(sorted(int(cell_id) for cell_id in placed_mines)))
+
+    def draw_background(self, active_rules: list, placed_mines: dict):
+        """
+        Поле с правилами и минами одним блитом. Слой собирается заново, только
+        когда меняется набор правил Та-дам или мин, — это несколько раз за игру.
+        """
+        key = self.background_key(active_rules, placed_mines)
+        if self._background is None or key != self._background_key:
+            self._background = self.board_img.copy()
+            self._blit_active_rules(self._background, active_rules)
+            self._blit_mines(self._background, placed_mines)
+            self._background_key = key
+            self.background_rebuilds += 1
+        self.screen.blit(self._background, (0, 0))
+
+    def invalidate_background(self):
+        self._background = None
+
+    def hover_rect(self, mouse_pos: tuple) -> Optional[pygame.Rect]:
+        """Где будет подсветка клетки под мышкой (None — мышь не над клеткой)"""
+        cid = self.view_cfg.get_cell_under_mouse(mouse_pos)
+        if cid == -1:
+            return None
+        return circle_overlay(40, (255, 255, 255, 80)).get_rect(center=self.view_cfg.get_screen_coords(cid))
+
     def draw_hover(self, mouse_pos: tuple):
         """Рисует мягкую подсветку клетки"""
-        cid = self.view_cfg.get_cell_under_mouse(mouse_pos)
-        if cid != -1:
-            pos = self.view_cfg.get_screen_coords(cid)
-            # Рисуем полупрозрачный круг
-            overlay = pygame.Surface((100, 100), pygame.SRCALPHA)
-            pygame.draw.circle(overlay, (255, 255, 255, 80), (50, 50), 40)
-            self.screen.blit(overlay, (pos[0] - 50, pos[1] - 50))
-
-    def draw_players(self, state: GameState):
-        # Группируем игроков по позициям
+        rect = self.hover_rect(mouse_pos)
+        if rect:
+            # Полупрозрачный круг (рисуется один раз, дальше только блит)
+            self.screen.blit(circle_overlay(40, (255, 255, 255, 80)), rect)
+
+    def player_token_positions(self, state: GameSnapshot) -> List[Tuple[PlayerSnapshot, tuple]]:
+        """Центры фишек: игроки на одной клетке раздвигаются, чтобы не перекрываться"""
         pos_groups = {}
         for p in state.players:
             pos_groups.setdefault(p.position, []).append(p)
 
+        tokens = []
         for position, players in pos_groups.items():
             base_pos = self.view_cfg.get_screen_coords(position)
             count = len(players)
@@ -93,22 +159,61 @@ class Renderer:
                     offset_y = (i % 2) * 10
                 else:
                     offset_x, offset_y = 0, 0
-
-                final_pos = (base_pos[0] + offset_x, base_pos[1] + offset_y)
-                color = self.player_colors[player.uid % len(self.player_colors)]
-
-                pygame.draw.circle(self.screen, (0, 0, 0), final_pos, 18) # Обводка
-                pygame.draw.circle(self.screen, color, final_pos, 15)
-                txt = self.font.render(str(player.uid + 1), True, (255, 255, 255))
-                self.screen.blit(txt, (final_pos[0] - 5, final_pos[1] - 10))
-
-    def draw_sidebar(self, state: GameState, turn_count: int, elapsed_seconds: int,
+                tokens.append((player, (base_pos[0] + offset_x, base_pos[1] + offset_y)))
+        return tokens
+
+    def _token_sprite(self, uid: int) -> pygame.Surface:
+        """Фишка игрока (обводка, цвет, номер) рисуется один раз; центр — (19, 19)"""
+        token = self._tokens.get(uid)
+        if token is None:
+            color = self.player_colors[uid % len(self.player_colors)]
+            token = pygame.Surface((38, 38), pygame.SRCALPHA)
+            pygame.draw.circle(token, (0, 0, 0), (19, 19), 18) # Обводка
+            pygame.draw.circle(token, color, (19, 19), 15)
+            token.blit(render_text(self.font, str(uid + 1), (255, 255, 255)), (14, 9))
+            token = self._tokens[uid] = token.convert_alpha()
+        return token
+
+    def draw_players(self, state: GameSnapshot):
+        # Все фишки одним вызовом blits
+        self.screen.blits([
+            (self._token_sprite(player.uid), (int(pos[0]) - 19, int(pos[1]) - 19))
+            for player, pos in self.player_token_positions(state)
+        ], doreturn=False)
+
+    def board_items(self, state: GameSnapshot, placed_mines: tuple, mouse_pos: tuple) -> Dict[tuple, pygame.Rect]:
+        """Прямоугольники всего подвижного на поле — для учёта изменившихся областей (ui/dirty.py)"""
+        items = {}
+        for player, pos in self.player_token_positions(state):
+            items[("player", player.uid)] = pygame.Rect(int(pos[0]) - 19, int(pos[1]) - 19, 38, 38)
+        for cell_id in placed_mines:
+            pos = self.view_cfg.get_screen_coords(int(cell_id))
+            items[("mine", cell_id)] = pygame.Rect(pos[0] - 26, pos[1] - 26, 52, 52)
+        for i, rule in enumerate(state.active_rules):
+            sprite = self.rule_sprites_small.get(rule.sprite_id)
+            if sprite:
+                items[("rule", i, rule.uid)] = sprite.get_rect(center=self.view_cfg.get_slot_coords(i))
+        hover = self.hover_rect(mouse_pos)
+        if hover:
+            items[("hover",)] = hover
+        return items
+
+    @property
+    def sidebar_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.view_cfg.target_size, 0, 300, self.view_cfg.target_size)
+
+    @staticmethod
+    def sidebar_key(state: GameSnapshot) -> tuple:
+        """Всё, от чего зависит вид боковой панели, кроме хода и времени"""
+        return state.current_player_idx, state.players  # Снимки игроков сравниваются по значению
+
+    def draw_sidebar(self, state: GameSnapshot, turn_count: int, elapsed_seconds: int,
                      can_do_actions: bool = False, has_pending: bool = False):
         """Отрисовка правой информационной интерактивной панели"""
         active_card_rects = []
 
-        sidebar_rect = pygame.Rect(self.view_cfg.target_size, 0, 300, self.view_cfg.target_size)
-        pygame.draw.rect(self.screen, (40, 40, 45), sidebar_rect)
+        sidebar_rect = self.sidebar_rect
+        pygame.draw.rect(self.screen, SIDEBAR_BG, sidebar_rect)
         pygame.draw.line(self.screen, (100, 100, 100), (sidebar_rect.x, 0),
                          (sidebar_rect.x, sidebar_rect.h), 2)
 
@@ -117,45 +222,19 @@ class Renderer:
         seconds = elapsed_seconds % 60
         time_str = f"Время: {minutes:02d}:{seconds:02d}"
 
-        info_txt = self.font.render(f"Ход: {turn_count}", True, (255, 215, 0))
-        time_txt = self.font.render(time_str, True, (200, 200, 200))
+        info_txt = render_text(self.font, f"Ход: {turn_count}", (255, 215, 0))
+        time_txt = render_text(self.font, time_str, (200, 200, 200))
         self.screen.blit(info_txt, (sidebar_rect.x + 20, 20))
         self.screen.blit(time_txt, (sidebar_rect.x + 20, 50))
 
-        # 2. Игроки
+        # 2. Игроки: панель игрока пересобирается только при смене его версии или активности
         for i, player in enumerate(state.players):
-            y_offset = 120 + (i * 260)
             is_active = (state.current_player_idx == i)
-
-            color = self.player_colors[i % len(self.player_colors)]
-            bg_color = (60, 60, 70) if is_active else (45, 45, 50)
-            player_rect = pygame.Rect(sidebar_rect.x + 10, y_offset, 280, 240)
-            pygame.draw.rect(self.screen, bg_color, player_rect, border_radius=10)
+            panel, card_rects = self._player_panel(i, player, is_active)
+            x, y = sidebar_rect.x + 10, 120 + (i * 260)
+            self.screen.blit(panel, (x, y))
             if is_active:
-                pygame.draw.rect(self.screen, color, player_rect, 2, border_radius=10)
-
-            name_txt = self.font.render(f"{player.name}", True, color)
-            self.screen.blit(name_txt, (player_rect.x + 15, player_rect.y + 12))
-
-            # Монеты — спрайтами
-            coin_label = pygame.font.SysFont("Arial", 14).render("Монеты:", True, (180, 180, 180))
-            self.screen.blit(coin_label, (player_rect.x + 15, player_rect.y + 42))
-            coins_h = self.draw_coins_bar(player_rect.x + 15, player_rect.y + 58, player.coins, max_width=255)
-
-            cards_y = player_rect.y + 60 + coins_h + 4
-
-            if not player.hand:
-                empty_txt = pygame.font.SysFont("Arial", 15).render("Нет карт Лавки", True, (120, 120, 120))
-                self.screen.blit(empty_txt, (player_rect.x + 15, cards_y))
-            else:
-                for j, card in enumerate(player.hand):
-                    card_btn_rect = pygame.Rect(player_rect.x + 10, cards_y + (j * 34), 260, 28)
-                    pygame.draw.rect(self.screen, (30, 30, 35), card_btn_rect, border_radius=5)
-                    txt_color = (255, 255, 255) if j not in player.used_cards_indices else (100, 100, 100)
-                    card_txt = pygame.font.SysFont("Arial", 15, bold=True).render(card.name.upper(), True, txt_color)
-                    self.screen.blit(card_txt, (card_btn_rect.x + 8, card_btn_rect.y + 5))
-                    if is_active:
-                        active_card_rects.append(card_btn_rect)
+                active_card_rects.extend(rect.move(x, y) for rect in card_rects)
 
         # 3. Кнопка завершения хода
         p = state.current_player
@@ -164,53 +243,121 @@ class Renderer:
             btn_rect = pygame.Rect(self.view_cfg.target_size + 50, 850, 200, 60)
             pygame.draw.rect(self.screen, (200, 50, 50), btn_rect, border_radius=10)
             pygame.draw.rect(self.screen, (255, 255, 255), btn_rect, 2, border_radius=10)
-            txt = self.font.render("Завершить ход", True, (255, 255, 255))
+            txt = render_text(self.font, "Завершить ход", (255, 255, 255))
             self.screen.blit(txt,
                              (btn_rect.centerx - txt.get_width() // 2, btn_rect.centery - txt.get_height() // 2))
             return btn_rect, active_card_rects
         return None, active_card_rects
 
+    def _player_panel(self, i: int, player: PlayerSnapshot, is_active: bool) -> Tuple[pygame.Surface, List[pygame.Rect]]:
+        """Панель игрока в своих координатах и прямоугольники карт в ней"""
+        # Ключ — сам снимок: он неизменяем и сравнивается по значению, так что годится и для другой партии
+        key = (player, is_active)
+        cached = self._panels.get(i)
+        if cached and cached[0] == key:
+            return cached[1], cached[2]
+
+        color = self.player_colors[i % len(self.player_colors)]
+        bg_color = (60, 60, 70) if is_active else (45, 45, 50)
+        player_rect = pygame.Rect(0, 0, 280, 240)
+        # Фон — цвет боковой панели, так непрозрачная панель блитится в разы быстрее;
+        # длинный список карт вылезает за рамку, как и раньше
+        panel = pygame.Surface((280, max(240, 124 + len(player.hand) * 34))).convert()
+        panel.fill(SIDEBAR_BG)
+        pygame.draw.rect(panel, bg_color, player_rect, border_radius=10)
+        if is_active:
+            pygame.draw.rect(panel, color, player_rect, 2, border_radius=10)
+
+        name_txt = render_text(self.font, f"{player.name}", color)
+        panel.blit(name_txt, (player_rect.x + 15, player_rect.y + 12))
+
+        # Монеты — спрайтами
+        coin_label = render_text(get_font(14), "Монеты:", (180, 180, 180))
+        panel.blit(coin_label, (player_rect.x + 15, player_rect.y + 42))
+        coins_h = self._blit_coins_bar(panel, player_rect.x + 15, player_rect.y + 58, player.coins, max_width=255)
+
+        cards_y = player_rect.y + 60 + coins_h + 4
+
+        card_rects = []
+        if not player.hand:
+            empty_txt = render_text(get_font(15), "Нет карт Лавки", (120, 120, 120))
+            panel.blit(empty_txt, (player_rect.x + 15, cards_y))
+        else:
+            for j, card in enumerate(player.hand):
+                card_btn_rect = pygame.Rect(player_rect.x + 10, cards_y + (j * 34), 260, 28)
+                pygame.draw.rect(panel, (30, 30, 35), card_btn_rect, border_radius=5)
+                txt_color = (255, 255, 255) if j not in player.used_cards_indices else (100, 100, 100)
+                card_txt = render_text(get_font(15, bold=True), card.name.upper(), txt_color)
+                panel.blit(card_txt, (card_btn_rect.x + 8, card_btn_rect.y + 5))
+                card_rects.append(card_btn_rect)
+
+        self._panels[i] = (key, panel, card_rects)
+        return panel, card_rects
+
     def draw_coins_bar(self, x: int, y: int, coins: int, max_width: int = 255) -> int:
         """Рисует монеты спрайтами. Возвращает высоту занятой области в пикселях."""
+        return self._blit_coins_bar(self.screen, x, y, coins, max_width)
+
+    def _blit_coins_bar(self, target: pygame.Surface, x: int, y: int, coins: int, max_width: int) -> int:
         if not self.coin_sprites or coins <= 0:
-            txt = pygame.font.SysFont("Arial", 15).render("0", True, (150, 150, 150))
-            self.screen.blit(txt, (x, y + 5))
+            txt = render_text(get_font(15), "0", (150, 150, 150))
+            target.blit(txt, (x, y + 5))
             return 30
 
-        coin_list = []
+        # Полоска зависит только от числа монет и ширины — собираем один раз
+        key = (coins, max_width)
+        bar = self._coin_bars.get(key)
+        if bar is None:
+            if len(self._coin_bars) >= COIN_BAR_CACHE_SIZE:
+                self._coin_bars.clear()
+            bar = self._coin_bars[key] = self._build_coins_bar(coins, max_width)
+        target.blit(bar, (x, y))
+        return bar.get_height() + 2
+
+    def _build_coins_bar(self, coins: int, max_width: int) -> pygame.Surface:
         remaining = coins
         # Если делится на 5 — последнюю пятёрку заменяем на пять единиц
-        if remaining > 0 and remaining % 5 == 0:
-            remaining -= 5
-            fives = remaining // 5
-            coin_list.extend([5] * fives)
-            coin_list.extend([1] * 5)
+        if remaining % 5 == 0:
+            fives, ones = remaining // 5 - 1, 5
         else:
-            fives = remaining // 5
-            coin_list.extend([5] * fives)
-            remaining -= fives * 5
-            coin_list.extend([1] * remaining)
+            fives, ones = remaining // 5, remaining % 5
 
         size, gap = 26, 3
         per_row = max(1, max_width // (size + gap))
-        rows = (len(coin_list) + per_row - 1) // per_row
-
-        for i, d in enumerate(coin_list):
-            col, row = i % per_row, i // per_row
-            sprite = self.coin_sprites.get(d)
-            if sprite:
-                self.screen.blit(sprite, (x + col * (size + gap), y + row * (size + gap)))
-
-        return rows * (size + gap) + 2
+        count = fives + ones
+
+        if count > per_row * COIN_BAR_MAX_ROWS:
+            # Компактно: монета 5 × N и монета 1 × M в одну строку
+            bar = pygame.Surface((max_width, size), pygame.SRCALPHA)
+            font = get_font(16, bold=True)
+            bx = 0
+            for denom, n in ((5, fives), (1, ones)):
+                if n <= 0:
+                    continue
+                sprite = self.coin_sprites.get(denom)
+                if sprite:
+                    bar.blit(sprite, (bx, 0))
+                    bx += size + 4
+                label = render_text(font, f"× {n}", (230, 230, 230))
+                bar.blit(label, (bx, (size - label.get_height()) // 2))
+                bx += label.get_width() + 14
+            return bar.subsurface((0, 0, min(bx, max_width), size)).copy()  # Пустой хвост не блитим
+
+        rows = (count + per_row - 1) // per_row
+        width = min(count, per_row) * (size + gap)
+        bar = pygame.Surface((width, rows * (size + gap)), pygame.SRCALPHA)
+        bar.blits([
+            (self.coin_sprites[d], ((i % per_row) * (size + gap), (i // per_row) * (size + gap)))
+            for i, d in enumerate([5] * fives + [1] * ones) if d in self.coin_sprites
+        ], doreturn=False)
+        return bar
 
     def draw_large_rule_card(self, sprite_id: int, mouse_pos: tuple):
         """Рисует крупную карту в центре экрана с затемнением фона"""
         # Затемнение
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(dim_overlay(self.screen.get_size(), 180), (0, 0))
         # Карта
-        sprite = self.rule_sprites_large[sprite_id]
+        sprite = self.get_large_rule_sprite(sprite_id)
         card_rect = sprite.get_rect(center=(self.view_cfg.target_size // 2, self.view_cfg.target_size // 2))
         self.screen.blit(sprite, card_rect)
 
@@ -222,31 +369,32 @@ class Renderer:
         btn_color = (100, 100, 110) if is_hover else (60, 60, 70)
         pygame.draw.rect(self.screen, btn_color, btn_rect, border_radius=10)
         pygame.draw.rect(self.screen, (200, 200, 200), btn_rect, 2, border_radius=10)
-        txt = self.font.render("Закрыть", True, (255, 255, 255))
+        txt = render_text(self.font, "Закрыть", (255, 255, 255))
         self.screen.blit(txt, (btn_rect.centerx - txt.get_width() // 2, btn_rect.centery - txt.get_height() // 2))
 
         return btn_rect
 
     def draw_active_rules(self, active_rules: list):
         """Рисует правила Та-дам в слотах на доске"""
+        self._blit_active_rules(self.screen, active_rules)
+
+    def _blit_active_rules(self, target: pygame.Surface, active_rules: list):
+        batch = []
         for i, rule in enumerate(active_rules):
-            slot_key = f'slot_{i}' # Используем ключи из coords.json
-            pos = self.view_cfg.get_screen_coords(slot_key)
+            pos = self.view_cfg.get_slot_coords(i)  # Слоты slot_N из coords.json
 
             sprite = self.rule_sprites_small[rule.sprite_id]
-            rect = sprite.get_rect(center=pos)
-            self.screen.blit(sprite, rect)
+            batch.append((sprite, sprite.get_rect(center=pos)))
+        target.blits(batch, doreturn=False)
 
     def draw_card_selector(self, cards: list, title: str, mouse_pos: tuple, show_skip: bool = True):
         """
         Универсальный метод отрисовки выбора из нескольких карт.
         Возвращает индекс выбранной карты или -1.
         """
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(dim_overlay(self.screen.get_size(), 200), (0, 0))
 
-        title_surf = self.font.render(title, True, (255, 215, 0))
+        title_surf = render_text(self.font, title, (255, 215, 0))
         self.screen.blit(title_surf, (self.view_cfg.target_size // 2 - title_surf.get_width() // 2, 100))
 
         card_rects = []
@@ -278,7 +426,7 @@ class Renderer:
             skip_btn = pygame.Rect(self.view_cfg.target_size // 2 - 100, 700, 200, 50)
             is_skip_hover = skip_btn.collidepoint(mouse_pos)
             pygame.draw.rect(self.screen, (150, 50, 50) if is_skip_hover else (100, 30, 30), skip_btn, border_radius=10)
-            txt = self.font.render("Пропустить", True, (255, 255, 255))
+            txt = render_text(self.font, "Пропустить", (255, 255, 255))
             self.screen.blit(txt, (skip_btn.centerx - txt.get_width() // 2,
                                         skip_btn.centery - txt.get_height() // 2 - 1))
             card_rects.append(skip_btn)
@@ -287,11 +435,14 @@ class Renderer:
 
     def draw_mines(self, placed_mines: dict):
         """Рисует мины на доске."""
-        for cell_id in placed_mines:
-            pos = self.view_cfg.get_screen_coords(int(cell_id))
-            sprite = self.coin_sprites_board.get(1)
-            if sprite:
-                self.screen.blit(sprite, (pos[0] - 26, pos[1] - 26))
+        self._blit_mines(self.screen, placed_mines)
+
+    def _blit_mines(self, target: pygame.Surface, placed_mines: dict):
+        sprite = self.coin_sprites_board.get(1)
+        if not sprite:
+            return
+        coords = [self.view_cfg.get_screen_coords(int(cell_id)) for cell_id in placed_mines]
+        target.blits([(sprite, (x - 26, y - 26)) for x, y in coords], doreturn=False)
 
     def draw_mine_placement_button(self, player_coins: int, mouse_pos: tuple) -> pygame.Rect:
         btn_rect = pygame.Rect(self.view_cfg.target_size + 15, 815, 270, 85)
@@ -299,12 +450,32 @@ class Renderer:
         pygame.draw.rect(self.screen, (140, 90, 0) if is_hover else (100, 65, 0), btn_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 215, 0), btn_rect, 2, border_radius=10)
 
-        label = self.font.render("Завершить расстановку", True, (255, 255, 255))
-        sub_font = pygame.font.SysFont("Arial", 14)
-        sub1 = sub_font.render(f"Монет осталось: {player_coins}", True, (220, 200, 120))
-        sub2 = sub_font.render("(клик на клетку = -1 монета)", True, (220, 200, 120))
+        label = render_text(self.font, "Завершить расстановку", (255, 255, 255))
+        sub_font = get_font(14)
+        sub1 = render_text(sub_font, f"Монет осталось: {player_coins}", (220, 200, 120))
+        sub2 = render_text(sub_font, "(клик на клетку = -1 монета)", (220, 200, 120))
 
         self.screen.blit(label, (btn_rect.centerx - label.get_width() // 2, btn_rect.y + 10))
         self.screen.blit(sub1, (btn_rect.centerx - sub1.get_width() // 2, btn_rect.y + 40))
         self.screen.blit(sub2, (btn_rect.centerx - sub2.get_width() // 2, btn_rect.y + 58))
         return btn_rect
+
+    def draw_replay_bar(self, turn: int, last_turn: int, playing: bool) -> pygame.Rect:
+        """Полоса прогресса реплея внизу поля. Возвращает её rect для перемотки кликом."""
+        state_txt = "▶" if playing else "❚❚"
+        return self._draw_bar((turn - 1) / max(1, last_turn - 1), f"{state_txt}  Ход {turn} / {last_turn}")
+
+    def draw_speed_bar(self, ratio: float, label: str) -> pygame.Rect:
+        """Ползунок скорости матча ботов на месте полосы реплея. Возвращает rect для клика."""
+        return self._draw_bar(ratio, label)
+
+    def _draw_bar(self, ratio: float, label: str) -> pygame.Rect:
+        bar_rect = pygame.Rect(20, self.view_cfg.target_size - 40, self.view_cfg.target_size - 40, 16)
+        pygame.draw.rect(self.screen, (40, 40, 45), bar_rect.inflate(12, 34), border_radius=10)
+        pygame.draw.rect(self.screen, (70, 70, 80), bar_rect, border_radius=8)
+        filled = pygame.Rect(bar_rect.x, bar_rect.y, int(bar_rect.w * max(0.0, min(1.0, ratio))), bar_rect.h)
+        pygame.draw.rect(self.screen, (255, 215, 0), filled, border_radius=8)
+
+        txt = render_text(self.font, label, (255, 255, 255))
+        self.screen.blit(txt, (bar_rect.x, bar_rect.y - 24))
+        return bar_rect
@@ -0,0 +1,96 @@
+"""
+Дисковый кеш уменьшенных спрайтов.
+
+Запуск декодировал все PNG карт и поля и сглаженно масштабировал их —
+большая часть времени старта. load_scaled() сохраняет результат
+масштабирования как несжатые пиксели в assets/.sprite_cache под ключом
+(sha1 исходного файла, размер, альфа). Следующие запуски читают готовые
+пиксели без декодирования PNG и smoothscale. Поменялась картинка — поменялся
+хеш, старая запись просто больше не используется.
+
+Чтение и масштабирование (load_pixels) не трогают дисплей, поэтому их можно
+выполнять в фоновых потоках (ui/asset_loader.py); приведение к формату
+экрана и put() — только в главном потоке.
+"""
+import hashlib
+import os
+import shutil
+import threading
+from typing import Dict, Tuple
+
+import pygame
+
+DEFAULT_CACHE_DIR = "assets/.sprite_cache"
+
+
+class SpriteCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self._hashes: Dict[str, str] = {}  # Хеш исходника считаем один раз за запуск
+        self._surfaces: Dict[tuple, pygame.Surface] = {}  # Уже готовые поверхности (из фоновой загрузки)
+        self.hits = 0
+        self.misses = 0
+
+    def _source_hash(self, path: str) -> str:
+        digest = self._hashes.get(path)
+        if digest is None:
+            with open(path, 'rb') as f:
+                digest = self._hashes[path] = hashlib.sha1(f.read()).hexdigest()
+        return digest
+
+    def _entry_path(self, path: str, size: Tuple[int, int], alpha: bool) -> str:
+        mode = "rgba" if alpha else "rgb"
+        return os.path.join(self.cache_dir, f"{self._source_hash(path)}_{size[0]}x{size[1]}_{mode}.raw")
+
+    def load_scaled(self, path: str, size: Tuple[int, int], alpha: bool = True) -> pygame.Surface:
+        """
+        Картинка path, сглаженно уменьшенная до size и приведённая к формату
+        экрана (нужен уже созданный display).
+        """
+        key = (path, int(size[0]), int(size[1]), alpha)
+        surf = self._surfaces.get(key)
+        if surf is None:
+            surf = self.load_pixels(path, size, alpha)
+            surf = surf.convert_alpha() if alpha else surf.convert()
+        return surf
+
+    def put(self, path: str, size: Tuple[int, int], alpha: bool, surf: pygame.Surface):
+        """Запомнить уже приведённую к формату экрана поверхность — load_scaled() отдаст её сразу"""
+        self._surfaces[(path, int(size[0]), int(size[1]), alpha)] = surf
+
+    def load_pixels(self, path: str, size: Tuple[int, int], alpha: bool = True) -> pygame.Surface:
+        """Уменьшенная картинка без привязки к формату экрана; дисплей не нужен"""
+        size = (int(size[0]), int(size[1]))
+        fmt = "RGBA" if alpha else "RGB"
+        entry = self._entry_path(path, size, alpha) if self.enabled else None
+
+        if entry and os.path.exists(entry):
+            with open(entry, 'rb') as f:
+                data = f.read()
+            if len(data) == size[0] * size[1] * len(fmt):
+                self.hits += 1
+                return pygame.image.frombuffer(data, size, fmt)
+
+        self.misses += 1
+        raw = pygame.image.load(path)
+        # smoothscale работает только с 24/32 бит; палитровые PNG приводим копированием
+        depth_surf = pygame.Surface(raw.get_size(), pygame.SRCALPHA if alpha else 0, 32)
+        depth_surf.blit(raw, (0, 0))
+        surf = pygame.transform.smoothscale(depth_surf, size)
+        if entry:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{entry}.{threading.get_ident()}.tmp"  # Потоки не пишут в один временный файл
+            with open(tmp_path, 'wb') as f:
+                f.write(pygame.image.tobytes(surf, fmt))
+            os.replace(tmp_path, entry)  # Недописанный файл не попадёт под ключ
+        return surf
+
+    def clear(self):
+        """Удалить кеш с диска"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._hashes.clear()
+        self._surfaces.clear()
+
+
+sprite_cache = SpriteCache()
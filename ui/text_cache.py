@@ -0,0 +1,60 @@
+"""
+Кеш отрисованного текста.
+
+Подписи в интерфейсе почти не меняются между кадрами («Ход: N», имена,
+названия карт, кнопки), а font.render() каждый раз заново растеризует
+глифы. render_text() отдаёт готовую поверхность по ключу
+(текст, шрифт, цвет, сглаживание) и вытесняет давно не использованные, когда
+кеш переполнен. Поверхности общие — рисовать поверх них нельзя.
+"""
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+
+class TextCache:
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, ...],
+               antialias: bool = True) -> pygame.Surface:
+        key = (text, font, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._surfaces),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, ...], antialias: bool = True) -> pygame.Surface:
+    """Кешированный font.render(text, antialias, color)"""
+    return text_cache.render(font, text, color, antialias)
@@ -1,26 +1,141 @@
+"""
+Координаты клеток и слотов правил на поле.
+
+coords.json хранит центры в пикселях исходной картинки поля (4800x4800).
+ViewConfig при загрузке и при каждом rescale() переводит их в экранные
+целые координаты: таблицу по id клетки и список слотов Та-дам, так что
+get_screen_coords() — это одно обращение к списку.
+
+Рядом с coords.json может лежать coords.bin — те же данные в компактном
+двоичном виде (python -m ui.view_config ui/coords.json). Он читается вместо
+JSON, если не старше его.
+"""
 import json
+import os
+import struct
+import sys
+from typing import Dict, List, Tuple
+
+HIT_GRID_CELL = 80  # Сторона ячейки сетки для поиска клетки под мышкой, px экрана
+
+_BIN_MAGIC = b"CRC1"
+_BIN_HEADER = struct.Struct("<4sHH")  # Метка, число клеток (max id + 1), число слотов
+_BIN_POINT = struct.Struct("<ii")  # x, y; у отсутствующей клетки (-1, -1)
+
+
+def binary_path(coords_path: str) -> str:
+    return os.path.splitext(coords_path)[0] + ".bin"
+
+
+def load_coords(coords_path: str) -> Dict[str, List[int]]:
+    """Координаты из coords.bin, если он свежий, иначе из coords.json"""
+    bin_path = binary_path(coords_path)
+    if os.path.exists(bin_path) and os.path.getmtime(bin_path) >= os.path.getmtime(coords_path):
+        with open(bin_path, 'rb') as f:
+            return _decode_binary(f.read())
+    with open(coords_path, 'r') as f:
+        return json.load(f)
+
+
+def save_binary(raw_coords: Dict[str, List[int]], bin_path: str):
+    cell_ids = [int(key) for key in raw_coords if key.isdigit()]
+    cell_count = max(cell_ids) + 1 if cell_ids else 0
+    slot_count = sum(1 for key in raw_coords if key.startswith("slot_"))
+
+    chunks = [_BIN_HEADER.pack(_BIN_MAGIC, cell_count, slot_count)]
+    for cid in range(cell_count):
+        chunks.append(_BIN_POINT.pack(*raw_coords.get(str(cid), (-1, -1))))
+    for i in range(slot_count):
+        chunks.append(_BIN_POINT.pack(*raw_coords[f"slot_{i}"]))
+    with open(bin_path, 'wb') as f:
+        f.write(b"".join(chunks))
+
+
+def _decode_binary(data: bytes) -> Dict[str, List[int]]:
+    magic, cell_count, slot_count = _BIN_HEADER.unpack_from(data)
+    if magic != _BIN_MAGIC:
+        raise ValueError("Не файл координат")
+    points = list(_BIN_POINT.iter_unpack(data[_BIN_HEADER.size:]))
+    raw = {str(cid): list(points[cid]) for cid in range(cell_count) if points[cid] != (-1, -1)}
+    for i in range(slot_count):
+        raw[f"slot_{i}"] = list(points[cell_count + i])
+    return raw
 
 
 class ViewConfig:
     def __init__(self, coords_path: str, target_size: int, original_size: int = 4800):
-        with open(coords_path, 'r') as f:
-            data = json.load(f)
-            self.raw_coords = data
+        self.raw_coords = load_coords(coords_path)
+        self.original_size = original_size
+        self.rescale(target_size)
 
-        self.scale = target_size / original_size
+    def rescale(self, target_size: int):
+        """Пересчитать масштаб, таблицу координат и индекс клеток под новый размер поля"""
+        self.scale = target_size / self.original_size
         self.target_size = target_size
+        self._build_tables()
+        self._build_hit_grid()
+
+    def _build_tables(self):
+        cell_ids = [int(key) for key in self.raw_coords if key.isdigit()]
+        self._cell_xy: List[Tuple[int, int]] = [(0, 0)] * (max(cell_ids) + 1 if cell_ids else 0)
+        for cid in cell_ids:
+            x, y = self.raw_coords[str(cid)]
+            self._cell_xy[cid] = (int(x * self.scale), int(y * self.scale))
+
+        self._slot_xy: List[Tuple[int, int]] = []
+        while f"slot_{len(self._slot_xy)}" in self.raw_coords:
+            x, y = self.raw_coords[f"slot_{len(self._slot_xy)}"]
+            self._slot_xy.append((int(x * self.scale), int(y * self.scale)))
+
+    def _build_hit_grid(self):
+        """
+        Равномерная сетка: ячейка (gx, gy) -> клетки, чей центр в неё попал.
+        Слоты правил (slot_*) — не клетки, в индекс не попадают.
+        """
+        self._hit_grid: Dict[Tuple[int, int], List[Tuple[int, float, float]]] = {}
+        for key, (x, y) in self.raw_coords.items():
+            if not key.isdigit():
+                continue
+            sx, sy = x * self.scale, y * self.scale
+            cell = (int(sx // HIT_GRID_CELL), int(sy // HIT_GRID_CELL))
+            self._hit_grid.setdefault(cell, []).append((int(key), sx, sy))
 
     def get_screen_coords(self, cell_id: int) -> tuple:
+        if type(cell_id) is int and 0 <= cell_id < len(self._cell_xy):
+            return self._cell_xy[cell_id]
+        # Редкий путь: строковые ключи ('12', 'slot_0') и неизвестные id
         key = str(cell_id)
-        if key not in self.raw_coords:return 0, 0
-        x, y = self.raw_coords[key]
-        return int(x * self.scale), int(y * self.scale)
+        if key.startswith("slot_"):
+            i = int(key[5:])
+            return self._slot_xy[i] if i < len(self._slot_xy) else (0, 0)
+        if key.isdigit() and int(key) < len(self._cell_xy):
+            return self._cell_xy[int(key)]
+        return 0, 0
+
+    def get_slot_coords(self, slot_idx: int) -> tuple:
+        """Центр слота правила Та-дам на экране"""
+        return self._slot_xy[slot_idx] if slot_idx < len(self._slot_xy) else (0, 0)
 
     def get_cell_under_mouse(self, mouse_pos: tuple, radius: int = 40) -> int:
-        """Возвращает ID клетки под мышкой для эффекта Hover"""
+        """Возвращает ID ближайшей клетки в радиусе radius от мышки (для Hover) или -1"""
         mx, my = mouse_pos
-        for cid, (x, y) in self.raw_coords.items():
-            sx, sy = x * self.scale, y * self.scale
-            if ((mx - sx) ** 2 + (my - sy) ** 2) ** 0.5 < radius:
-                return cid
-        return -1
+        reach = int(radius // HIT_GRID_CELL) + 1
+        gx, gy = int(mx // HIT_GRID_CELL), int(my // HIT_GRID_CELL)
+        best_id, best_d2 = -1, radius * radius
+        for cx in range(gx - reach, gx + reach + 1):
+            for cy in range(gy - reach, gy + reach + 1):
+                for cid, sx, sy in self._hit_grid.get((cx, cy), ()):
+                    d2 = (mx - sx) ** 2 + (my - sy) ** 2
+                    # При равном расстоянии — меньший id, чтобы ответ не зависел от обхода сетки
+                    if d2 < best_d2 or (d2 == best_d2 and best_id != -1 and cid < best_id):
+                        best_id, best_d2 = cid, d2
+        return best_id
+
+
+if __name__ == "__main__":
+    # python -m ui.view_config ui/coords.json -> ui/coords.bin
+    source = sys.argv[1] if len(sys.argv) > 1 else "ui/coords.json"
+    with open(source, 'r') as src:
+        coords = json.load(src)
+    save_binary(coords, binary_path(source))
+    print(f"{binary_path(source)}: {len(coords)} точек")